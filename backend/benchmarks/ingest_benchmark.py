@@ -0,0 +1,120 @@
+"""
+Offline ingest and search load test with the local hashing embedding provider.
+
+Generates synthetic offers, ingests them through DataManager.add_offers (embedding,
+validation, batched insert) and runs similarity searches against the grown table,
+so throughput can be measured and profiled at realistic corpus sizes without
+network access or API costs. The synthetic offers are removed afterwards unless
+--keep is given.
+
+Usage (from backend/, with the DB_* settings of a database whose embedding column
+matches EMBEDDING_DIMENSIONS):
+    python benchmarks/ingest_benchmark.py --offers 5000
+    python benchmarks/ingest_benchmark.py --offers 20000 --batch 500 --queries 200 --keep
+    python -m cProfile -s cumtime benchmarks/ingest_benchmark.py --offers 2000
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from datetime import date, timedelta
+
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+os.environ["EMBEDDING_PROVIDER"] = os.environ.get("BENCHMARK_EMBEDDING_PROVIDER", "hashing")
+
+import numpy as np  # noqa: E402
+
+from intern_bot.data_manager import DataManager  # noqa: E402
+
+SOURCE = "Benchmark"
+COMPANIES = ["Nokia", "Sii Polska", "PWR", "Acme", "Globex", "Initech"]
+LOCATIONS = ["Kraków", "Wrocław", "Warszawa", "Gdańsk", "Poznań", "Remote"]
+ROLES = ["Software Engineer", "Data Analyst", "QA Engineer", "DevOps", "Embedded Developer", "ML Engineer"]
+SKILLS = [
+    "Python", "Java", "C++", "SQL", "Docker", "Kubernetes", "React", "TypeScript", "Linux", "Git",
+    "PyTorch", "Spark", "Verilog", "SAP", "Flutter", "AWS", "Azure", "Go", "Rust", "Excel",
+]
+
+
+def synthetic_offers(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    run = f"{seed}-{int(time.time())}"
+    offers = []
+    for i in range(count):
+        role, skills = rng.choice(ROLES), rng.sample(SKILLS, 4)
+        posted = date.today() - timedelta(days=rng.randint(0, 30))
+        offers.append({
+            "link": f"https://benchmark.local/{run}/{i}",
+            "title": f"{role} intern ({skills[0]})",
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "contract_type": rng.choice(["internship", "apprenticeship"]),
+            "date_posted": posted,
+            "date_closing": posted + timedelta(days=rng.randint(30, 90)),
+            "source": SOURCE,
+            "description": (
+                f"We are looking for a {role.lower()} intern. You will work with {', '.join(skills)} "
+                f"in a team of {rng.randint(3, 12)} people. Nice to have: {rng.choice(SKILLS)}. " * rng.randint(2, 6)
+            ),
+        })
+    return offers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200, help="offers per add_offers call")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic offers in the table")
+    args = parser.parse_args()
+
+    DataManager.ensure_schema()
+    offers = synthetic_offers(args.offers, args.seed)
+    links = [offer["link"] for offer in offers]
+
+    start = time.perf_counter()
+    DataManager.embeddings.embed_documents([offer["description"] for offer in offers[:args.batch]])
+    embed_seconds = time.perf_counter() - start
+
+    try:
+        inserted, failed = 0, 0
+        start = time.perf_counter()
+        for i in range(0, len(offers), args.batch):
+            result = DataManager.add_offers(offers[i:i + args.batch])
+            inserted += result["inserted"]
+            failed += len(result["failed"])
+        ingest_seconds = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        queries = [
+            f"{rng.choice(ROLES)} internship with {' and '.join(rng.sample(SKILLS, 2))}" for _ in range(args.queries)
+        ]
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            DataManager.similarity_search_cosine(query, k=args.k)
+            timings.append(time.perf_counter() - start)
+        timings_ms = np.array(timings) * 1000
+
+        print(json.dumps({
+            "embedding_model": DataManager.embeddings.model,
+            "offers": len(offers),
+            "inserted": inserted,
+            "failed": failed,
+            "embed_docs_per_second": round(min(args.batch, len(offers)) / max(embed_seconds, 1e-9), 1),
+            "ingest_offers_per_second": round(inserted / max(ingest_seconds, 1e-9), 1),
+            "search_p50_ms": round(float(np.percentile(timings_ms, 50)), 3),
+            "search_p95_ms": round(float(np.percentile(timings_ms, 95)), 3),
+            "search_queries_per_second": round(len(timings) / max(sum(timings), 1e-9), 1),
+        }, indent=2))
+    finally:
+        if not args.keep:
+            DataManager.remove_offers(links)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Similarity search latency: Postgres (pgvector) versus the in-process memory index.
+
+Query vectors are stored offer embeddings with a little noise added, so no
+embedding API calls are made. Both backends get the same queries and filters;
+the report has per-query latency percentiles for each backend and how often the
+memory index returned the same top-k as Postgres (exact search on both sides
+unless a pgvector index is built, in which case this is the ANN recall).
+
+Usage (from backend/, with the DB_* settings of a populated database):
+    python benchmarks/retrieval_benchmark.py
+    python benchmarks/retrieval_benchmark.py --queries 200 --k 10 --company "Sii Polska"
+"""
+import argparse
+import json
+import tempfile
+import time
+
+from pathlib import Path
+
+import numpy as np
+
+from intern_bot.data_manager import DataManager
+from intern_bot.data_manager.memory_index import MemoryIndex
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    values = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def _query_vectors(count: int, noise: float, seed: int) -> list[list[float]]:
+    with DataManager._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT setseed(%s)", (np.random.default_rng(seed).uniform(-1, 1),))
+            cur.execute(
+                f"SELECT embedding::real[] FROM {DataManager.settings.OFFERS_TABLE_NAME} "
+                f"WHERE embedding IS NOT NULL ORDER BY random() LIMIT %s",
+                (count,)
+            )
+            stored = np.array([row[0] for row in cur.fetchall()], dtype=np.float32)
+    if not len(stored):
+        raise SystemExit("No embedded offers in the database")
+    rng = np.random.default_rng(seed)
+    stored = stored[rng.integers(0, len(stored), count)]
+    return (stored + rng.normal(0, noise, stored.shape).astype(np.float32)).tolist()
+
+
+def _postgres_search(cur, embedding: list[float], k: int, include_filters: dict | None) -> list[int]:
+    sql, params = DataManager._similarity_search_sql(embedding, k, 0, include_filters, None)
+    if search_settings := DataManager.vector_index.search_settings(k):
+        cur.execute(*search_settings)
+    cur.execute(sql, params)
+    return [row[0] for row in cur.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--noise", type=float, default=0.01, help="stddev of the noise added to stored embeddings")
+    parser.add_argument("--company", nargs="*", help="include filter on company, applied to both backends")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    DataManager.vector_index.load_state()
+    include_filters = {"company": args.company} if args.company else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = MemoryIndex(
+            DataManager.settings.OFFERS_TABLE_NAME, DataManager._get_connection, str(Path(directory) / "index")
+        )
+        start = time.perf_counter()
+        loaded = index.refresh()
+        build_seconds = time.perf_counter() - start
+        filters = DataManager._normalize_filters(include_filters)
+
+        vectors = _query_vectors(args.queries, args.noise, args.seed)
+        postgres_times, memory_times, overlaps = [], [], []
+        with DataManager._get_connection() as conn:
+            with conn.cursor() as cur:
+                for vector in vectors:
+                    start = time.perf_counter()
+                    expected = _postgres_search(cur, vector, args.k, include_filters)
+                    postgres_times.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    found = [row["id"] for row in index.search(vector, args.k, 0, filters, None)]
+                    memory_times.append(time.perf_counter() - start)
+
+                    overlaps.append(len(set(found) & set(expected)) / max(len(expected), 1))
+
+        start = time.perf_counter()
+        reloaded = MemoryIndex(index.table_name, index.connection_factory, str(index.snapshot_path))
+        reloaded.load()
+        load_seconds = time.perf_counter() - start
+
+    report = {
+        "rows": loaded["rows"],
+        "queries": len(vectors),
+        "k": args.k,
+        "filters": include_filters,
+        "vector_index": (DataManager.vector_index.stats()["state"] or {}).get("index_type", "none"),
+        "postgres": _percentiles(postgres_times),
+        "memory": _percentiles(memory_times),
+        "memory_build_seconds": round(build_seconds, 3),
+        "memory_snapshot_load_seconds": round(load_seconds, 4),
+        "top_k_agreement": round(float(np.mean(overlaps)), 4),
+    }
+    report["speedup_p50"] = round(report["postgres"]["p50_ms"] / max(report["memory"]["p50_ms"], 1e-6), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Offline scraper benchmark and regression suite.
+
+Replays recorded (or synthetic) PWR, Sii and Nokia responses from a local stand-in
+server and measures DataScraper.scrape_offers and DataScraper.scrape_offers_details:
+pages per second, per-offer parse time for each HTML parser backend and peak memory.
+Results are compared against a stored baseline; extracted offers are checked for
+parser equivalence and against the baseline output digest.
+
+Usage (from backend/):
+    python benchmarks/scraper_benchmark.py                      # run and compare with baseline
+    python benchmarks/scraper_benchmark.py --update-baseline    # store current results as baseline
+    python benchmarks/scraper_benchmark.py --latency 0.05 --error-rate 0.02
+    python benchmarks/scraper_benchmark.py --record fixtures/   # capture live responses (needs network)
+    python benchmarks/scraper_benchmark.py --fixtures fixtures/ # replay a recorded capture
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+from pathlib import Path
+
+# Scrapers only need settings for their own limits; DB and OpenAI values are never used here.
+for name, value in {
+    "OPENAI_API_KEY": "unused", "DB_HOST": "unused", "DB_PORT": "0", "DB_NAME": "unused",
+    "DB_USER": "unused", "DB_PASSWORD": "unused", "SERVER_IP": "127.0.0.1", "FRONTEND_PORT": "0",
+}.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import httpx  # noqa: E402
+
+from scraper_fixtures import (  # noqa: E402
+    RecordingTransport,
+    ReplayTransport,
+    StandInServer,
+    describe,
+    fixture_key,
+    load_fixtures,
+    save_fixtures,
+    synthetic_fixtures,
+)
+
+from intern_bot.data_scraper import DataScraper, ScraperRuntime  # noqa: E402
+from intern_bot.data_scraper.parsers import PARSER_BACKENDS, compare_parsers, resolve_parser, settings  # noqa: E402
+
+SOURCES = ["PWR", "Sii", "Nokia"]
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Higher is better for throughput metrics, lower is better for the rest
+HIGHER_IS_BETTER = {"listing_pages_per_second", "details_pages_per_second"}
+
+
+def _detail_request_url(source: str, link: str) -> str:
+    scraper = DataScraper._get_scraper(source)
+    if source == "Nokia":
+        return scraper.DETAILS_API.format(id=scraper._extract_job_id(link))
+    return link
+
+
+def _output_digest(offers: list[dict]) -> str:
+    canonical = json.dumps(sorted(offers, key=lambda offer: offer["link"]), sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark_source(source: str, server: StandInServer, fixtures: dict, parsers: list[str], rounds: int) -> dict:
+    scraper = DataScraper._get_scraper(source)
+
+    server.reset_counters()
+    links, listing_seconds, listing_peak = _measure(DataScraper.scrape_offers, source)
+    listing_requests = server.served
+
+    server.reset_counters()
+    offers, details_seconds, details_peak = _measure(DataScraper.scrape_offers_details, source, links)
+    details_requests = server.served
+
+    parse_ms = {}
+    parser_mismatches = []
+    bodies = [
+        (link, fixtures[fixture_key(httpx.URL(_detail_request_url(source, link)))].body)
+        for link in links
+        if fixture_key(httpx.URL(_detail_request_url(source, link))) in fixtures
+    ]
+    # Best of several rounds, so scheduler noise doesn't show up as a regression. The parsers
+    # take turns within each round (in alternating order), so machine drift affects them alike
+    timings = {parser: [] for parser in parsers}
+    for round_number in range(rounds):
+        for parser in (parsers if round_number % 2 == 0 else parsers[::-1]):
+            start = time.perf_counter()
+            for link, body in bodies:
+                scraper.parse_offer_details(body, link, parser)
+            timings[parser].append(time.perf_counter() - start)
+    for parser in parsers:
+        parse_ms[parser] = min(timings[parser]) * 1000 / max(len(bodies), 1)
+    if len(parsers) > 1:
+        for link, body in bodies:
+            differences = compare_parsers(scraper.parse_offer_details, body, link, parsers=tuple(parsers))
+            if differences:
+                parser_mismatches.append({"link": link, "fields": differences})
+
+    return {
+        "links": len(links),
+        "offers": len(offers),
+        "listing_requests": listing_requests,
+        "details_requests": details_requests,
+        "listing_seconds": listing_seconds,
+        "details_seconds": details_seconds,
+        "listing_pages_per_second": listing_requests / listing_seconds if listing_seconds else 0.0,
+        "details_pages_per_second": details_requests / details_seconds if details_seconds else 0.0,
+        "parse_ms_per_offer": parse_ms,
+        "listing_peak_memory_kb": listing_peak / 1024,
+        "details_peak_memory_kb": details_peak / 1024,
+        "output_digest": _output_digest(offers),
+        "parser_mismatches": parser_mismatches,
+        "missing_fixtures": len(server.missing),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human readable regressions of `results` against `baseline`."""
+    regressions = []
+    for source, metrics in results.items():
+        reference = baseline.get(source)
+        if not reference:
+            continue
+        if reference.get("output_digest") and reference["output_digest"] != metrics["output_digest"]:
+            regressions.append(f"{source}: extracted offers differ from baseline output")
+        flat = {**metrics, **{f"parse_ms_per_offer[{p}]": v for p, v in metrics["parse_ms_per_offer"].items()}}
+        flat_reference = {
+            **reference, **{f"parse_ms_per_offer[{p}]": v for p, v in reference.get("parse_ms_per_offer", {}).items()}
+        }
+        for metric in (
+            "listing_pages_per_second", "details_pages_per_second",
+            "listing_peak_memory_kb", "details_peak_memory_kb",
+            *[key for key in flat if key.startswith("parse_ms_per_offer[")],
+        ):
+            old, new = flat_reference.get(metric), flat.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(f"{source}: {metric} {old:.2f} -> {new:.2f} ({worse:+.0%} worse)")
+    return regressions
+
+
+def record(directory: Path):
+    fixtures = {}
+    ScraperRuntime.configure(transport=RecordingTransport(fixtures))
+    try:
+        for source in SOURCES:
+            links = DataScraper.scrape_offers(source)
+            DataScraper.scrape_offers_details(source, links)
+    finally:
+        ScraperRuntime.shutdown()
+    save_fixtures(fixtures, directory)
+    print(f"Recorded {describe(fixtures)} into {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, help="directory with recorded fixtures (default: synthetic)")
+    parser.add_argument("--record", type=Path, help="record live responses into this directory and exit")
+    parser.add_argument("--sources", nargs="+", default=SOURCES, choices=SOURCES)
+    parser.add_argument("--latency", type=float, default=0.0, help="injected response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- jitter added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate", type=float, default=1000.0, help="per-host request rate limit for the run")
+    parser.add_argument("--concurrency", type=int, default=settings.SCRAPER_CONCURRENCY_PER_HOST)
+    parser.add_argument("--parsers", nargs="+", default=[p for p in PARSER_BACKENDS if resolve_parser(p) == p])
+    parser.add_argument("--rounds", type=int, default=20, help="parse timing rounds per parser (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown of timing metrics")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # Per-request logs of httpx and the scrapers would dominate the report
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.record:
+        record(args.record)
+        return 0
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(
+        nokia_page_size=settings.NOKIA_PAGE_SIZE, seed=args.seed
+    )
+    print(f"Fixtures: {describe(fixtures)}")
+
+    results = {}
+    with StandInServer(fixtures, args.latency, args.jitter, args.error_rate, args.seed) as server:
+        limits = httpx.Limits(
+            max_connections=settings.SCRAPER_POOL_SIZE, max_keepalive_connections=settings.SCRAPER_POOL_SIZE
+        )
+        ScraperRuntime.configure(
+            rate_per_host=args.rate,
+            burst_per_host=max(1, int(args.rate)),
+            concurrency_per_host=args.concurrency,
+            transport=ReplayTransport(server.url, limits),
+        )
+        try:
+            for source in args.sources:
+                try:
+                    results[source] = benchmark_source(source, server, fixtures, args.parsers, args.rounds)
+                except Exception as e:
+                    print(f"{source}: scrape failed: {e}")
+                    results[source] = {"error": str(e)}
+        finally:
+            ScraperRuntime.shutdown()
+
+    failures = []
+    for source, metrics in results.items():
+        if "error" in metrics:
+            failures.append(f"{source}: {metrics['error']}")
+            continue
+        parse = ", ".join(f"{p} {ms:.2f} ms" for p, ms in metrics["parse_ms_per_offer"].items())
+        print(
+            f"{source:6} links={metrics['links']:4} offers={metrics['offers']:4} | "
+            f"listing {metrics['listing_pages_per_second']:7.1f} pages/s | "
+            f"details {metrics['details_pages_per_second']:7.1f} pages/s | parse/offer {parse} | "
+            f"peak mem {metrics['details_peak_memory_kb']:.0f} KiB"
+        )
+        failures.extend(
+            f"{source}: parsers disagree on {m['link']}: {m['fields']}" for m in metrics["parser_mismatches"]
+        )
+
+    measured = {source: metrics for source, metrics in results.items() if "error" not in metrics}
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(measured, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline.exists():
+        if args.latency or args.error_rate or args.fixtures:
+            print("Skipping baseline comparison: run conditions differ from the stored baseline")
+        else:
+            failures.extend(compare_with_baseline(measured, json.loads(args.baseline.read_text()), args.tolerance))
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Recorded responses for the scraper benchmark and a local stand-in HTTP server that replays them.
+
+Fixtures are keyed by "<host><path>?<query>" (URL-decoded). They either come from a
+directory written by `record` (live capture of the PWR, Sii and Nokia sites) or are
+generated deterministically by `synthetic_fixtures`, which mirrors the markup and JSON
+the scrapers parse.
+"""
+import json
+import random
+import threading
+import time
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote_plus, urlsplit
+
+import httpx
+
+from intern_bot.data_scraper.scrapers import NokiaScraper, PWRScraper, SiiScraper
+
+
+@dataclass
+class Fixture:
+    status: int
+    content_type: str
+    body: str
+
+
+def fixture_key(url: httpx.URL | str) -> str:
+    parts = urlsplit(str(url))
+    key = parts.netloc + unquote_plus(parts.path)
+    if parts.query:
+        key += "?" + unquote_plus(parts.query)
+    return key
+
+
+def save_fixtures(fixtures: dict[str, Fixture], directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    index = {}
+    for number, (key, fixture) in enumerate(sorted(fixtures.items())):
+        name = f"{number:05d}.body"
+        (directory / name).write_text(fixture.body, encoding="utf-8")
+        index[key] = {"file": name, "status": fixture.status, "content_type": fixture.content_type}
+    (directory / "index.json").write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_fixtures(directory: Path) -> dict[str, Fixture]:
+    index = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+    return {
+        key: Fixture(entry["status"], entry["content_type"], (directory / entry["file"]).read_text(encoding="utf-8"))
+        for key, entry in index.items()
+    }
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to the real network and keep every response as a fixture."""
+
+    def __init__(self, fixtures: dict[str, Fixture]):
+        self.fixtures = fixtures
+        self.transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()
+        content_type = response.headers.get("content-type", "text/html")
+        self.fixtures[fixture_key(request.url)] = Fixture(
+            response.status_code, content_type, body.decode(response.encoding or "utf-8", errors="replace")
+        )
+        return httpx.Response(response.status_code, headers={"content-type": content_type}, content=body)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Send every request to the stand-in server over real local HTTP, keeping host and path in the URL."""
+
+    def __init__(self, server_url: str, limits: httpx.Limits | None = None):
+        self.server_url = server_url.rstrip("/")
+        self.transport = httpx.AsyncHTTPTransport(limits=limits or httpx.Limits())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = httpx.URL(f"{self.server_url}/{request.url.host}{request.url.raw_path.decode('ascii')}")
+        replayed = httpx.Request(
+            request.method, target, headers=request.headers, extensions=request.extensions
+        )
+        replayed.headers["host"] = target.netloc.decode("ascii")
+        return await self.transport.handle_async_request(replayed)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class StandInServer:
+    """
+    Threaded local HTTP server replaying fixtures, with injected latency
+    (`latency` +/- `jitter` seconds) and a fraction of 503 responses (`error_rate`).
+    """
+
+    def __init__(
+        self,
+        fixtures: dict[str, Fixture],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.served = 0
+        self.errors = 0
+        self.missing: list[str] = []
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                key = fixture_key("http://" + self.path.lstrip("/"))
+                with server.lock:
+                    delay = max(0.0, server.latency + server.random.uniform(-server.jitter, server.jitter))
+                    fail = server.random.random() < server.error_rate
+                    fixture = server.fixtures.get(key)
+                    server.served += 1
+                    if fail:
+                        server.errors += 1
+                    elif fixture is None:
+                        server.missing.append(key)
+                time.sleep(delay)
+
+                if fail:
+                    fixture = Fixture(503, "text/plain", "Injected error")
+                elif fixture is None:
+                    fixture = Fixture(404, "text/plain", "No fixture recorded")
+
+                body = fixture.body.encode("utf-8")
+                self.send_response(fixture.status)
+                self.send_header("Content-Type", fixture.content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def reset_counters(self):
+        with self.lock:
+            self.served = 0
+            self.errors = 0
+            self.missing = []
+
+    def __enter__(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Synthetic fixtures
+
+WORDS = (
+    "projekt zespół rozwój aplikacji testy automatyzacja dane analiza system klient "
+    "praktyka staż student wsparcie dokumentacja chmura sieć bezpieczeństwo jakość "
+    "Python Java SQL Linux Docker Kubernetes React Flutter SAP Verilog C++ Git"
+).split()
+CITIES = ["Wrocław", "Warszawa", "Kraków", "Poznań", "Gdańsk"]
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "".join(f"<p>{_sentence(rng)} <b>{rng.choice(WORDS)}</b> {_sentence(rng)}</p>" for _ in range(count))
+
+
+def _json_fixture(payload: dict) -> Fixture:
+    return Fixture(200, "application/json; charset=utf-8", json.dumps(payload, ensure_ascii=False))
+
+
+def _html_fixture(body: str) -> Fixture:
+    return Fixture(
+        200, "text/html; charset=utf-8",
+        f"<!DOCTYPE html><html><head><title>Oferta</title></head><body>{body}</body></html>",
+    )
+
+
+def _pwr_fixtures(rng: random.Random, offers_per_page: int, paragraphs: int) -> dict[str, Fixture]:
+    fixtures = {}
+    for page in PWRScraper.LISTING_PAGES:
+        articles = []
+        for position in range(offers_per_page):
+            link = f"https://biurokarier.pwr.edu.pl/oferty-pracy/oferta-{page}-{position}/"
+            articles.append(
+                f'<article class="noo_job"><h3 class="loop-item-title">'
+                f'<a href="{link}">Oferta {page}-{position}</a></h3>'
+                f'<div class="excerpt">{_sentence(rng)}</div></article>'
+            )
+            fixtures[fixture_key(link)] = _html_fixture(
+                f'<h1 class="entry-title">Praktykant {rng.choice(WORDS)} {page}-{position}</h1>'
+                f'<span class="job-company">Firma {rng.randint(1, 40)} Sp. z o.o.</span>'
+                f'<span class="job-location"><em>{rng.choice(CITIES)}</em></span>'
+                f'<span class="job-type"><span>Umowa zlecenie</span></span>'
+                f'<span class="job-date__posted">{rng.randint(1, 28)} lipca 2025</span>'
+                f'<span class="job-date__closing">- {rng.randint(1, 28)} sierpnia 2025</span>'
+                f'<div class="job-desc">{_paragraphs(rng, paragraphs)}<ul>'
+                + "".join(f"<li>{_sentence(rng, 6)}</li>" for _ in range(5))
+                + '</ul></div><div class="job-custom-fields"><ul>'
+                '<li class="job-cf"><strong>Wymiar pracy:</strong><span>pół etatu</span></li>'
+                '<li class="job-cf"><strong>Branża:</strong><span>IT</span></li></ul></div>'
+                '<div class="entry-tags">' + "".join(f"<a>{rng.choice(WORDS)}</a>" for _ in range(4)) + "</div>"
+            )
+        fixtures[fixture_key(f"{PWRScraper.BASE_URL}/page/{page}/")] = _html_fixture("".join(articles))
+    return fixtures
+
+
+def _sii_fixtures(rng: random.Random, offers: int, paragraphs: int) -> dict[str, Fixture]:
+    fixtures = {}
+    listing = []
+    for number in range(offers):
+        offer_id = 1000 + number
+        title = f"Junior {rng.choice(WORDS)} Developer {number}"
+        listing.append({"offerId": offer_id, "title": title})
+        link_title = "-".join(title.lower().split())
+        location = json.dumps([{"locations": [{"name": rng.choice(CITIES)}]}], ensure_ascii=False)
+        fixtures[fixture_key(SiiScraper.JOB_DETAIL_BASE_URL.format(id=offer_id, title=link_title))] = _html_fixture(
+            f'<input id="offer_name" value="{title}">'
+            f"<div class=\"nsw-m-filter-dropdown\" x-data='{{ locations: {location} }}'></div>"
+            f'<div class="nsw-o-job-add-content__description">{_paragraphs(rng, paragraphs)}</div>'
+            "<h2>Twoje zadania</h2><ul>" + "".join(f"<li>{_sentence(rng, 8)}</li>" for _ in range(6)) + "</ul>"
+            "<h2>Wymagania</h2><ul>" + "".join(f"<li>{_sentence(rng, 8)}</li>" for _ in range(6)) + "</ul>"
+            f'<p class="nsw-o-job-add-content__job-id">Job ID: {offer_id}</p>'
+        )
+    fixtures[fixture_key(SiiScraper.BASE_URL.format(offset=0, limit=50))] = _json_fixture({"offers": listing})
+    return fixtures
+
+
+def _nokia_fixtures(rng: random.Random, offers: int, page_size: int, paragraphs: int) -> dict[str, Fixture]:
+    fixtures = {}
+    requisitions = []
+    for number in range(offers):
+        job_id = str(30000 + number)
+        kind = rng.choice(["Working Student", "Summer Trainee", "Engineer"])
+        requisitions.append(
+            {"Id": job_id, "Title": f"{kind} - {rng.choice(WORDS)} (Wroclaw)", "PrimaryLocation": "Poland"}
+        )
+        detail_url = NokiaScraper.DETAILS_API.format(id=job_id)
+        fixtures[fixture_key(httpx.URL(detail_url))] = _json_fixture({"items": [{
+            "Title": requisitions[-1]["Title"],
+            "PrimaryLocation": "Poland",
+            "ExternalPostedStartDate": "2025-06-20T00:00:00+00:00",
+            "ExternalPostedEndDate": None,
+            "JobSchedule": "Part time",
+            "ExternalDescriptionStr": _paragraphs(rng, paragraphs),
+            "ExternalQualificationsStr": "<ul>" + "".join(f"<li>{_sentence(rng, 8)}</li>" for _ in range(5)) + "</ul>",
+            "ExternalResponsibilitiesStr": (
+                "<ul>" + "".join(f"<li>{_sentence(rng, 8)}</li>" for _ in range(5)) + "</ul>"
+            ),
+            "OrganizationDescriptionStr": _paragraphs(rng, 3),
+            "requisitionFlexFields": [{"Prompt": "Study level", "Value": "Bachelor"}],
+        }]})
+
+    for offset in range(0, max(offers, 1), page_size):
+        page = requisitions[offset:offset + page_size]
+        url = httpx.URL(NokiaScraper.BASE_URL, params=NokiaScraper._listing_params(page_size, offset))
+        fixtures[fixture_key(url)] = _json_fixture({"items": [{"TotalJobsCount": offers, "requisitionList": page}]})
+    return fixtures
+
+
+def synthetic_fixtures(
+    pwr_offers_per_page: int = 10,
+    sii_offers: int = 50,
+    nokia_offers: int = 120,
+    nokia_page_size: int = 25,
+    paragraphs: int = 12,
+    seed: int = 0,
+) -> dict[str, Fixture]:
+    rng = random.Random(seed)
+    return {
+        **_pwr_fixtures(rng, pwr_offers_per_page, paragraphs),
+        **_sii_fixtures(rng, sii_offers, paragraphs),
+        **_nokia_fixtures(rng, nokia_offers, nokia_page_size, paragraphs),
+    }
+
+
+def describe(fixtures: dict[str, Fixture]) -> dict[str, int]:
+    return {"responses": len(fixtures), "bytes": sum(len(fixture.body) for fixture in fixtures.values())}
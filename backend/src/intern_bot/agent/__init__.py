@@ -1,4 +1,6 @@
-from intern_bot.agent.agent import agent
+from intern_bot.agent.agent import NO_STREAM_TAG, agent
+from intern_bot.agent.checkpointer import AgentCheckpointer
+from intern_bot.agent.response_cache import response_cache
 
 
-__all__ = ['agent']
\ No newline at end of file
+__all__ = ['agent', 'NO_STREAM_TAG', 'AgentCheckpointer', 'response_cache']
\ No newline at end of file
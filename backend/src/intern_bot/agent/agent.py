@@ -1,15 +1,22 @@
-from typing import Annotated
+import json
+import asyncio
+import logging
+from decimal import Decimal
+from datetime import date, datetime
+from typing import Annotated, Literal
 
 from pydantic import BaseModel
 from langchain_core.tools import tool
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import ToolMessage, HumanMessage, SystemMessage
 
-from langgraph.checkpoint.memory import InMemorySaver
-
-from intern_bot.data_manager import DataManager
+from intern_bot.agent.checkpointer import AgentCheckpointer
+from intern_bot.agent.history import build_prompt, make_token_counter
+from intern_bot.agent.response_cache import response_cache
+from intern_bot.data_manager import AsyncDataManager
 from intern_bot.settings import Settings
 
 settings = Settings()
@@ -21,11 +28,27 @@ llm = ChatOpenAI(
     max_tokens=15000,
 )
 
+count_tokens = make_token_counter(llm)
+
+def to_json_safe(value):
+    """Dates and numerics returned by psycopg as JSON friendly values, so tool results stay parseable."""
+    if isinstance(value, dict):
+        return {k: to_json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_json_safe(v) for v in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
 @tool
 async def retrieve_offers(internship_info: str, 
                           include_companies: list[str] | None = None,
                           exclude_companies: list[str] | None = None,
-                          limit: int = 5, offset: int = 0):
+                          limit: int = 5, cursor: str | None = None,
+                          search_mode: Literal["semantic", "hybrid"] = "semantic",
+                          keywords: list[str] | None = None):
     """
     Retrieve internship and apprenticeship offers based on semantic similarity.
 
@@ -58,20 +81,33 @@ async def retrieve_offers(internship_info: str,
       they want to see (e.g., “show me 10 offers”).  
       Otherwise, do not include it in the call — the default value of 5 will be used automatically.
 
-    - offset: Optional. Used to skip a given number of top-ranked results (default = 0).  
+    - cursor: Optional. The `next_cursor` returned by a previous call.  
       Use this parameter **when the user asks for other or new offers** after already 
       receiving some (e.g., “show me different ones” or “what else do you have?”).  
-      In such cases, pass an offset equal to the number of previously shown offers 
-      (e.g., offset = 5 if the previous call returned 5 offers).
+      In such cases, repeat the previous call with exactly the same other arguments
+      and pass its `next_cursor`; the offers that follow the ones already shown are returned.
+      If `next_cursor` was null, there are no more matching offers.
+
+    - search_mode: Optional. "semantic" (default) ranks offers only by meaning.
+      Use "hybrid" **when the user names specific technologies, tools, languages
+      or other exact terms** (e.g., “Flutter”, “SAP”, “Verilog”): offers that
+      literally mention them in the title or description are ranked higher,
+      and the remaining offers follow by meaning, so paging covers every offer.
+
+    - keywords: Optional, only used with search_mode = "hybrid". The exact terms
+      to match (e.g., ["Flutter"]). If omitted, words of `internship_info` are used.
 
     Returns:
-    - Ranked list of internship or apprenticeship offers from the vector database
-      that are most semantically similar to the input description, optionally
-      filtered by company inclusion or exclusion.  
+    - An object with `offers`, the ranked list of internship or apprenticeship offers
+      from the vector database that are most semantically similar to the input
+      description, optionally filtered by company inclusion or exclusion, and
+      `next_cursor`, used to get the following offers.  
       The returned offer links can later be used with the `get_offer_details` tool
       to retrieve detailed information about each offer.
     """
-    print('Querying with description:', internship_info, 'Include companies:', include_companies, 'Exclude companies:', exclude_companies, 'Limit:', limit, 'Offset:', offset)
+    print('Querying with description:', internship_info, 'Include companies:', include_companies,
+          'Exclude companies:', exclude_companies, 'Limit:', limit, 'Cursor:', cursor,
+          'Mode:', search_mode, 'Keywords:', keywords)
 
     if include_companies:
         include_filters = {'company': include_companies}
@@ -82,9 +118,13 @@ async def retrieve_offers(internship_info: str,
     else:
         exclude_filters = None
 
-    results = DataManager.similarity_search_cosine(query=internship_info, k=limit, offset=offset, include_filters=include_filters, exclude_filters=exclude_filters)
-    print('Found results:', results)
-    return results
+    page = await AsyncDataManager.search_offers(
+        query=internship_info, k=limit, cursor=cursor,
+        include_filters=include_filters, exclude_filters=exclude_filters,
+        mode=search_mode, keywords=keywords if search_mode == "hybrid" else None,
+    )
+    print('Found results:', page)
+    return to_json_safe(page)
 
 @tool
 async def get_offer_details(offer_link: str):
@@ -110,15 +150,58 @@ async def get_offer_details(offer_link: str):
     - All available metadata and structured information about the specified offer, 
       including description, requirements, location, company, and other relevant fields.
     """
-    offer = DataManager.get_offer(offer_link)
-    return offer
+    offer = await AsyncDataManager.get_offer(offer_link)
+    return to_json_safe(offer)
 
-tools = [retrieve_offers]
+tools = [retrieve_offers, get_offer_details]
 
 tools_map = {tool.name: tool for tool in tools}
 
 llm_w_tools = llm.bind_tools(tools)
 
+# Tag of LLM calls whose answer isn't the final one; /agent/stream doesn't forward their tokens
+NO_STREAM_TAG = "no_stream"
+
+async def ainvoke_with_history(model, messages: list, config, stream: bool = True):
+    """Invoke `model` on the token-budgeted view of `messages` and log the prompt size."""
+    prompt = build_prompt(messages, count_tokens)
+    tags = [*(config.get("tags") or []), *([] if stream else [NO_STREAM_TAG])]
+    response = await model.ainvoke(prompt, config={**config, "tags": tags})
+    usage = getattr(response, "usage_metadata", None) or {}
+    logging.info(
+        f"LLM call: {len(prompt)}/{len(messages)} messages, ~{count_tokens(prompt)} prompt tokens estimated, "
+        f"{usage.get('input_tokens', 'n/a')} reported"
+    )
+    return response
+
+def is_empty_result(content) -> bool:
+    """True for tool results without any offers (an empty list or a page with no offers)."""
+    if not content or content == "[]":
+        return True
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(result, dict) and "offers" in result and not result["offers"]
+
+async def run_tool_call(tool_call: dict, config, semaphore: asyncio.Semaphore) -> tuple[ToolMessage, bool]:
+    """Run one tool call; errors become a ToolMessage explaining the failure."""
+    async with semaphore:
+        tool = tools_map.get(tool_call["name"])
+        try:
+            tool_message = await tool.ainvoke(tool_call, config={**config})
+            succeeded = True
+        except Exception as e:
+            tool_message = ToolMessage(
+                content=f"Couldn't use tool: {tool_call['name']}, because of {e}. Explain the error to the user",
+                tool_call_id=tool_call.get("id"),
+            )
+            succeeded = False
+
+    if not tool_message.content:
+        tool_message.content = ""
+    return tool_message, succeeded
+
 class GraphInputState(BaseModel):
     query: str
 
@@ -130,8 +213,9 @@ async def chatbot(state: GraphState, config):
 
     messages = state.messages
     query = state.query
+    first_turn = len(messages) == 0
 
-    if len(messages) == 0:
+    if first_turn:
         messages.append(SystemMessage(content="""
 You are a helpful assistant whose goal is to find the best internship or apprenticeship offers for the user.
 
@@ -164,34 +248,49 @@ Instructions:
 """)
 )
     messages.append(HumanMessage(query))
-
-
+    turn_start = len(messages)
+
+    cache_key = None
+    if first_turn and settings.RESPONSE_CACHE_ENABLED:
+        try:
+            query_embedding = await AsyncDataManager.query_embeddings_cache.aget(
+                query, AsyncDataManager.embeddings.aembed_query
+            )
+            cached, generation = response_cache.lookup(query_embedding)
+            cache_key = (query_embedding, generation)
+        except Exception as e:
+            logging.warning(f"Response cache lookup failed: {e}")
+            cached = None
+        if cached:
+            await adispatch_custom_event("cached_response", {"content": cached[-1].content}, config=config)
+            return {"messages": messages + cached}
+
+    cacheable = True
     for i in range(1, MAX_ITERATIONS+1):
         if i == MAX_ITERATIONS:
-            response = await llm.ainvoke(messages, config={**config})
+            response = await ainvoke_with_history(llm, messages, config, stream=False)
             messages.append(response)
 
-        response = await llm_w_tools.ainvoke(messages, config={**config})
+        response = await ainvoke_with_history(llm_w_tools, messages, config)
         messages.append(response)
 
         if tool_calls:=response.tool_calls:
-            for tool_call in tool_calls:
-                tool = tools_map.get(tool_call["name"]) 
-                try:
-                    tool_message = await tool.ainvoke(tool_call, config={**config})
-                except Exception as e:
-                    tool_message = ToolMessage(
-                        content=f"Couldn't use tool: {tool_call['name']}, because of {e}. Explain the error to the user",
-                        tool_call_id=tool_call.get("id"),
-                    )
-
-                if not tool_message.content:
-                    tool_message.content = ""
+            # Tool calls of one response run concurrently; gather keeps their order
+            semaphore = asyncio.Semaphore(settings.AGENT_MAX_PARALLEL_TOOL_CALLS)
+            results = await asyncio.gather(*(run_tool_call(tool_call, config, semaphore) for tool_call in tool_calls))
+            for tool_message, succeeded in results:
+                if not succeeded or is_empty_result(tool_message.content):
+                    # Empty results may come from a failed search, don't reuse the answer
+                    cacheable = False
                 messages.append(tool_message)
         else:
             break
     print('MESSAGES', messages)
 
+    if cache_key and cacheable and messages[-1].content and not getattr(messages[-1], "tool_calls", None):
+        query_embedding, generation = cache_key
+        response_cache.store(query, query_embedding, messages[turn_start:], generation)
+
     return {"messages": messages}
 
 
@@ -205,8 +304,8 @@ graph_builder.add_node("chatbot", chatbot)
 graph_builder.add_edge("__start__", "chatbot")
 graph_builder.add_edge("chatbot", "__end__")
 
-checkpointer = InMemorySaver()
-agent = graph_builder.compile(checkpointer=checkpointer)
+# Bounded in-memory conversations until the configured backend is opened on startup
+agent = graph_builder.compile(checkpointer=AgentCheckpointer.saver)
 
 
 if __name__ == "__main__":
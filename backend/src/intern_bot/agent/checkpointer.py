@@ -0,0 +1,207 @@
+import logging
+import os
+import resource
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+from intern_bot.settings import Settings
+
+settings = Settings()
+
+CHECKPOINTER_BACKENDS = ("memory", "sqlite", "postgres")
+
+
+def process_memory() -> dict[str, int]:
+    """Resident and peak memory of the current worker process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        rss = peak
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    InMemorySaver that doesn't grow without bound: at most `max_threads`
+    conversations are kept, threads idle for longer than `idle_ttl` seconds are
+    dropped and the least recently used thread is evicted when the cap is hit.
+    Unless `keep_history` is set only the latest checkpoint of a thread is stored,
+    so a long conversation holds one copy of its messages instead of one per turn.
+    """
+
+    def __init__(self, max_threads: int, idle_ttl: float, keep_history: bool = False, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        self.keep_history = keep_history
+        self.evictions = 0
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _touch(self, config: RunnableConfig):
+        thread_id = config["configurable"].get("thread_id")
+        if thread_id is None:
+            return
+        with self._lock:
+            self._last_used[thread_id] = time.monotonic()
+            self._last_used.move_to_end(thread_id)
+            self._evict(keep=thread_id)
+
+    def _evict(self, keep: str | None):
+        now = time.monotonic()
+        while self._last_used:
+            thread_id, last_used = next(iter(self._last_used.items()))
+            expired = self.idle_ttl > 0 and now - last_used > self.idle_ttl
+            over_cap = self.max_threads > 0 and len(self._last_used) > self.max_threads
+            if thread_id == keep or not (expired or over_cap):
+                break
+            del self._last_used[thread_id]
+            super().delete_thread(thread_id)
+            self.evictions += 1
+            logging.info(f"Evicted conversation {thread_id} ({'idle' if expired else 'thread limit'})")
+
+    def _prune_history(self, config: RunnableConfig, checkpoint: dict[str, Any]):
+        """Drop older checkpoints, their pending writes and superseded channel values of the thread."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        for checkpoint_id in [cid for cid in checkpoints if cid != checkpoint["id"]]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        versions = checkpoint["channel_versions"]
+        for key in [
+            key for key in self.blobs
+            if key[0] == thread_id and key[1] == checkpoint_ns and key[2] in versions and versions[key[2]] != key[3]
+        ]:
+            del self.blobs[key]
+
+    def get_tuple(self, config: RunnableConfig):
+        self._touch(config)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        self._touch(config)
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            if not self.keep_history:
+                self._prune_history(config, checkpoint)
+        return result
+
+    def put_writes(self, config, writes, task_id, task_path: str = ""):
+        self._touch(config)
+        return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            self._last_used.pop(thread_id, None)
+            super().delete_thread(thread_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._evict(keep=None)
+            stored = sum(
+                len(checkpoint[1]) + len(metadata[1])
+                for namespaces in self.storage.values()
+                for checkpoints in namespaces.values()
+                for checkpoint, metadata, _ in checkpoints.values()
+            )
+            stored += sum(len(blob[1]) for blob in self.blobs.values())
+            stored += sum(len(write[2][1]) for writes in self.writes.values() for write in writes.values())
+            return {
+                "threads": len(self._last_used),
+                "max_threads": self.max_threads,
+                "idle_ttl": self.idle_ttl,
+                "evictions": self.evictions,
+                "stored_bytes": stored,
+            }
+
+
+class AgentCheckpointer:
+    """
+    Conversation checkpointer of the agent. `memory` keeps conversations in a
+    BoundedMemorySaver of the worker; `sqlite` (a local file) and `postgres`
+    (the offers database) persist them across restarts, and with postgres
+    they are shared by all workers.
+    """
+    memory = BoundedMemorySaver(
+        max_threads=settings.CHECKPOINTER_MAX_THREADS,
+        idle_ttl=settings.CHECKPOINTER_IDLE_TTL,
+    )
+    saver: BaseCheckpointSaver = memory
+    _stack: AsyncExitStack | None = None
+
+    @classmethod
+    async def open(cls) -> BaseCheckpointSaver:
+        """Open the configured backend and return its saver."""
+        backend = settings.CHECKPOINTER_BACKEND
+        if backend not in CHECKPOINTER_BACKENDS:
+            raise ValueError(f"Unknown checkpointer backend: {backend}")
+        if backend == "memory" or cls._stack is not None:
+            return cls.saver
+
+        stack = AsyncExitStack()
+        try:
+            if backend == "sqlite":
+                # Requires the `sqlite` extra (langgraph-checkpoint-sqlite)
+                from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+                saver = await stack.enter_async_context(
+                    AsyncSqliteSaver.from_conn_string(settings.CHECKPOINTER_SQLITE_PATH)
+                )
+            else:
+                # Requires the `postgres` extra (langgraph-checkpoint-postgres)
+                from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+                from psycopg.rows import dict_row
+                from psycopg_pool import AsyncConnectionPool
+
+                pool = AsyncConnectionPool(
+                    kwargs={
+                        "host": settings.DB_HOST,
+                        "port": settings.DB_PORT,
+                        "dbname": settings.DB_NAME,
+                        "user": settings.DB_USER,
+                        "password": settings.DB_PASSWORD.get_secret_value(),
+                        "autocommit": True,
+                        "prepare_threshold": 0,
+                        "row_factory": dict_row,
+                    },
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    open=False,
+                )
+                await pool.open()
+                stack.push_async_callback(pool.close)
+                saver = AsyncPostgresSaver(conn=pool)
+            await saver.setup()
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        cls._stack, cls.saver = stack, saver
+        logging.info(f"Agent conversations are stored in {backend}")
+        return saver
+
+    @classmethod
+    async def close(cls):
+        if cls._stack is not None:
+            stack, cls._stack = cls._stack, None
+            cls.saver = cls.memory
+            await stack.aclose()
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        stats = {"backend": settings.CHECKPOINTER_BACKEND, "process": process_memory()}
+        if cls.saver is cls.memory:
+            stats["memory"] = cls.memory.stats()
+        return stats
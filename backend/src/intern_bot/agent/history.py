@@ -0,0 +1,110 @@
+import json
+import logging
+
+from typing import Callable
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from intern_bot.settings import Settings
+
+settings = Settings()
+
+# Offer fields kept when an old retrieve_offers result is compacted
+STUB_FIELDS = ("link", "title", "company")
+MAX_STUB_CHARS = 300
+
+
+def approximate_tokens(messages: list[BaseMessage]) -> int:
+    """Rough count (~4 characters per token) used when tiktoken encodings can't be loaded."""
+    return sum(
+        4 + len(str(message.content)) // 4 + len(str(getattr(message, "tool_calls", ""))) // 4 for message in messages
+    )
+
+
+def make_token_counter(llm) -> Callable[[list[BaseMessage]], int]:
+    """Count prompt tokens with the model's tokenizer, falling back to an approximation."""
+    state = {"exact": True}
+
+    def count(messages: list[BaseMessage]) -> int:
+        if state["exact"]:
+            try:
+                return llm.get_num_tokens_from_messages(messages)
+            except Exception as e:
+                state["exact"] = False
+                logging.warning(f"Exact token counting unavailable, using an approximation: {e}")
+        return approximate_tokens(messages)
+
+    return count
+
+
+def split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Group messages into turns, each starting at a HumanMessage."""
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def compact_tool_message(message: ToolMessage) -> ToolMessage:
+    """Replace a tool result with link/title stubs of the offers it returned."""
+    try:
+        result = json.loads(message.content)
+    except (TypeError, ValueError):
+        result = None
+
+    if isinstance(result, dict) and isinstance(result.get("offers"), list):
+        # A retrieve_offers page: keep the cursor so "show me more" still works from an old turn
+        offers = [{k: item[k] for k in STUB_FIELDS if k in item} for item in result["offers"] if isinstance(item, dict)]
+        content = json.dumps({"offers": offers, "next_cursor": result.get("next_cursor")}, ensure_ascii=False)
+    elif isinstance(result, list) and all(isinstance(item, dict) for item in result):
+        content = json.dumps([{k: item[k] for k in STUB_FIELDS if k in item} for item in result], ensure_ascii=False)
+    elif isinstance(result, dict):
+        content = json.dumps({k: result[k] for k in STUB_FIELDS if k in result}, ensure_ascii=False)
+    else:
+        content = str(message.content)
+        if len(content) > MAX_STUB_CHARS:
+            content = content[:MAX_STUB_CHARS] + "…"
+    return message.model_copy(update={"content": content})
+
+
+def build_prompt(
+    messages: list[BaseMessage],
+    count_tokens: Callable[[list[BaseMessage]], int],
+    max_tokens: int | None = None,
+    full_tool_turns: int | None = None,
+) -> list[BaseMessage]:
+    """
+    Messages sent to the LLM for the current turn. The system prompt stays pinned
+    and the current turn is sent in full. Tool results of turns older than the
+    last `full_tool_turns` are compacted to offer stubs, and the oldest turns are
+    dropped while the prompt exceeds `max_tokens`. The graph state keeps the full history.
+    """
+    max_tokens = settings.HISTORY_MAX_TOKENS if max_tokens is None else max_tokens
+    full_tool_turns = settings.HISTORY_FULL_TOOL_TURNS if full_tool_turns is None else full_tool_turns
+
+    pinned = [message for message in messages[:1] if isinstance(message, SystemMessage)]
+    turns = split_turns(messages[len(pinned):])
+    if not turns:
+        return pinned
+
+    *previous, current = turns
+    compact_before = max(len(previous) - full_tool_turns, 0)
+    previous = [
+        [compact_tool_message(m) if isinstance(m, ToolMessage) else m for m in turn] if i < compact_before else turn
+        for i, turn in enumerate(previous)
+    ]
+
+    turn_tokens = [count_tokens(turn) for turn in previous]
+    total = count_tokens(pinned + current) + sum(turn_tokens)
+    dropped = 0
+    while previous and total > max_tokens:
+        previous.pop(0)
+        total -= turn_tokens.pop(0)
+        dropped += 1
+
+    prompt = pinned + [m for turn in previous for m in turn] + current
+    if dropped:
+        prompt.insert(len(pinned), SystemMessage(content=f"{dropped} earlier conversation turn(s) were omitted."))
+    return prompt
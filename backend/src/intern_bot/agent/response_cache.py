@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+
+from typing import Any
+
+import numpy as np
+
+from langchain_core.messages import BaseMessage
+
+from intern_bot.settings import Settings
+
+settings = Settings()
+
+
+class ResponseCache:
+    """
+    In-process cache of first-turn agent answers, looked up by cosine similarity
+    of the query embedding. A query is answered from the cache when a stored
+    query is at least `threshold` similar. The whole cache is invalidated when the
+    offers change, and answers computed while an invalidation happened are not stored.
+    """
+
+    def __init__(self, threshold: float, max_size: int, ttl: float):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._embeddings = np.empty((0, 0), dtype=np.float32)
+        self._entries: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _drop_expired(self):
+        now = time.monotonic()
+        keep = [i for i, entry in enumerate(self._entries) if entry["expires_at"] > now]
+        if len(keep) != len(self._entries):
+            self._entries = [self._entries[i] for i in keep]
+            self._embeddings = self._embeddings[keep]
+
+    def lookup(self, embedding: list[float]) -> tuple[list[BaseMessage] | None, int]:
+        """Return the cached turn messages of the most similar query (or None) and the current generation."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._drop_expired()
+            if self._entries and self._embeddings.shape[1] == vector.shape[0]:
+                similarities = self._embeddings @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry = self._entries[best]
+                    entry["hits"] += 1
+                    self.hits += 1
+                    logging.info(
+                        f"Response cache hit ({similarities[best]:.3f}) for a query similar to '{entry['query']}'"
+                    )
+                    return [message.model_copy() for message in entry["messages"]], self.generation
+            self.misses += 1
+            return None, self.generation
+
+    def store(self, query: str, embedding: list[float], messages: list[BaseMessage], generation: int):
+        vector = self._normalize(embedding)
+        with self._lock:
+            if generation != self.generation:
+                return
+            if self._entries and self._embeddings.shape[1] != vector.shape[0]:
+                self._entries, self._embeddings = [], np.empty((0, 0), dtype=np.float32)
+            self._drop_expired()
+            if len(self._entries) >= self.max_size:
+                # Evict the least used entry
+                victim = min(range(len(self._entries)), key=lambda i: self._entries[i]["hits"])
+                del self._entries[victim]
+                self._embeddings = np.delete(self._embeddings, victim, axis=0)
+            self._entries.append({
+                "query": query,
+                "messages": [message.model_copy() for message in messages],
+                "expires_at": time.monotonic() + self.ttl,
+                "hits": 0,
+            })
+            self._embeddings = vector[None, :] if not len(self._embeddings) else np.vstack([self._embeddings, vector])
+
+    def invalidate(self):
+        with self._lock:
+            self._entries, self._embeddings = [], np.empty((0, 0), dtype=np.float32)
+            self.generation += 1
+            self.invalidations += 1
+        logging.info("Response cache invalidated")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": settings.RESPONSE_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(
+    threshold=settings.RESPONSE_CACHE_THRESHOLD,
+    max_size=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
@@ -2,8 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from intern_bot.agent import AgentCheckpointer, agent
 from intern_bot.api.utils.routes import router
 from intern_bot.api.utils.scheduler import start_scheduler, stop_scheduler
+from intern_bot.data_manager import AsyncDataManager, DataManager
+from intern_bot.data_scraper import ParsePool, ScraperRuntime
 from intern_bot.settings.settings import Settings
 
 # Initialize settings
@@ -12,10 +15,20 @@ settings = Settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    DataManager.ensure_schema()
+    DataManager.refresh_memory_index()
+    await AsyncDataManager.open_pool()
+    agent.checkpointer = await AgentCheckpointer.open()
     start_scheduler()
     yield
     # Shutdown
     stop_scheduler()
+    ScraperRuntime.shutdown()
+    ParsePool.shutdown()
+    await AgentCheckpointer.close()
+    agent.checkpointer = AgentCheckpointer.saver
+    await AsyncDataManager.close_pool()
+    DataManager.close_pool()
 
 app = FastAPI(lifespan=lifespan)
 
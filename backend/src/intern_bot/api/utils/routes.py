@@ -1,17 +1,17 @@
 import json
-import asyncio
+import time
+import logging
 from datetime import date, datetime
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import HumanMessage
 
-from intern_bot.data_manager import DataManager
-from intern_bot.agent import agent
+from intern_bot.data_manager import AsyncDataManager, DataManager
+from intern_bot.agent import NO_STREAM_TAG, AgentCheckpointer, agent, response_cache
 from intern_bot.api.utils.models import AgentInput
 from intern_bot.api.utils.scheduler import scheduler
-from intern_bot.api.utils.scheduler import run_daily_scraping
+from intern_bot.api.utils.scheduler import scrape_jobs, source_schedule
 
 
 def serialize(obj):
@@ -25,35 +25,102 @@ router = APIRouter()
 
 @router.post('/scrape/data')
 async def scrape_data():
-    """Test endpoint to manually trigger the scraping job"""
+    """
+    Trigger the scraping job in the background. Returns 202 with the job id, or
+    409 with the id of the job that is already running.
+    """
     try:
-        run_daily_scraping()
-        return JSONResponse(content={"message": "Test scraping completed successfully"})
+        job, created = scrape_jobs.submit(trigger="manual")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not created:
+        return JSONResponse(status_code=409, content={"message": "A scraping job is already running", "job_id": job.id})
+    return JSONResponse(status_code=202, content={"message": "Scraping job started", "job_id": job.id})
+
+@router.get('/scrape/jobs')
+async def scrape_jobs_list():
+    """Recent scraping jobs, newest first"""
+    return JSONResponse(content={"message": [job.to_dict() for job in scrape_jobs.list()]})
+
+@router.get('/scrape/jobs/{job_id}')
+async def scrape_job_status(job_id: str):
+    """Status, per-source progress and step timings of a scraping job"""
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scraping job: {job_id}")
+    return JSONResponse(content={"message": job.to_dict()})
 
 @router.get('/data/info')
 async def data_info():
     """Get the current status of the data"""
     try:
-        data_info = DataManager.get_data_info()
+        data_info = await AsyncDataManager.get_data_info()
         return JSONResponse(content={"message": data_info})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get('/data/cache_stats')
+async def cache_stats():
+    """Get hit/miss counters of the embedding and response caches"""
+    stats = {**DataManager.get_cache_stats(), "response_cache": response_cache.stats()}
+    return JSONResponse(content={"message": stats})
+
+@router.get('/data/vector_index')
+async def vector_index_status():
+    """Get the configured and the currently built vector index, and the in-process index"""
+    return JSONResponse(content={"message": {
+        **DataManager.vector_index.stats(),
+        "retrieval_backend": DataManager.settings.RETRIEVAL_BACKEND,
+        "memory_index": DataManager.memory_index.stats(),
+    }})
+
+@router.get('/data/vector_index/report')
+def vector_index_report(queries: int = 20, k: int = 10):
+    """Recall@k and latency of the approximate vector search for several probes / ef_search values"""
+    try:
+        return JSONResponse(content={"message": DataManager.vector_index.report(queries=queries, k=k)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get('/data/current_offers')
-async def current_offers():
-    """Get the current offers"""
+async def current_offers(columns: str | None = None):
+    """
+    Stream the current offers as NDJSON, one offer per line.
+    `columns` is an optional comma separated projection; embeddings are excluded by default.
+    The first row is fetched before the response starts, so setup errors return 500;
+    an error later on aborts the stream instead of completing it.
+    """
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
     try:
-        current_offers = DataManager.get_current_offers()
-        serialized = [
-            {k: serialize(v) for k, v in offer.items()}
-            for offer in current_offers
-        ]
-        return JSONResponse(content={"message": serialized})
+        DataManager._projection(selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    offers = AsyncDataManager.iter_current_offers(selected)
+    try:
+        first = await anext(offers)
+    except StopAsyncIteration:
+        first = None
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    def to_line(offer: dict) -> str:
+        return json.dumps({k: serialize(v) for k, v in offer.items()}) + "\n"
+
+    async def offers_generator():
+        try:
+            if first is not None:
+                yield to_line(first)
+                async for offer in offers:
+                    yield to_line(offer)
+        except Exception as e:
+            logging.error(f"Streaming current offers failed: {e}")
+            raise
+        finally:
+            await offers.aclose()
+
+    return StreamingResponse(offers_generator(), media_type="application/x-ndjson")
+
 
 @router.get('/scheduler/status')
 async def get_scheduler_status():
@@ -68,14 +135,23 @@ async def get_scheduler_status():
                 "trigger": str(job.trigger)
             })
         
+        active = scrape_jobs.active
         return JSONResponse(content={
             "scheduler_running": scheduler.running,
-            "jobs": jobs
+            "jobs": jobs,
+            "active_scrape_job": active.id if active else None,
+            "sources": source_schedule.status()
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get('/agent/checkpointer/status')
+async def checkpointer_status():
+    """Get the conversation checkpointer backend and memory use of this worker"""
+    return JSONResponse(content={"message": AgentCheckpointer.stats()})
+
+
 @router.post('/agent/invoke')
 async def aagent_invoke(payload: AgentInput):
     query = payload.query
@@ -91,26 +167,57 @@ async def aagent_invoke(payload: AgentInput):
     
 @router.post('/agent/stream')
 async def aagent_stream(payload: AgentInput):
+    """
+    Stream the agent run as server-sent events:
+    `token` for every content chunk of the answering LLM calls, `tool_start` / `tool_end` around tool calls,
+    `done` with the final answer and timings, and `error` if the run fails.
+    """
     query = payload.query
-    config = payload.config
+    config = payload.config.dict()
 
-    first_message = HumanMessage(query)
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, default=serialize)}\n\n"
 
     async def event_generator():
+        start = time.perf_counter()
+        first_token_at = None
+        cached = False
         try:
-            async for state_update in agent.astream({"messages": [first_message]}, config=config):
-                messages = state_update.get("messages", [])
-                if messages:
-                    last_message = messages[-1]
-                    data = json.dumps({"content": last_message.content})
-                    yield f"data: {data}\n\n"
-                await asyncio.sleep(0)
+            async for event in agent.astream_events({"query": query}, config=config, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    if NO_STREAM_TAG in event.get("tags", []):
+                        # The last iteration answers once more with tools bound; only that answer is streamed
+                        continue
+                    content = event["data"]["chunk"].content
+                    if content:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter() - start
+                        yield sse("token", {"content": content})
+                elif kind == "on_custom_event" and event["name"] == "cached_response":
+                    cached = True
+                    first_token_at = time.perf_counter() - start
+                    yield sse("token", {"content": event["data"]["content"]})
+                elif kind == "on_tool_start":
+                    yield sse("tool_start", {"name": event["name"], "input": event["data"].get("input")})
+                elif kind == "on_tool_end":
+                    yield sse("tool_end", {"name": event["name"]})
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    messages = (event["data"].get("output") or {}).get("messages", [])
+                    total = time.perf_counter() - start
+                    logging.info(f"Agent stream finished in {total:.2f}s, time to first token: {first_token_at}")
+                    yield sse("done", {
+                        # Final answer, also for clients that got no tokens (e.g. the answer wasn't streamed)
+                        "content": messages[-1].content if messages else None,
+                        "cached": cached,
+                        "time_to_first_token": first_token_at,
+                        "total_time": total,
+                    })
         except Exception as e:
-            error_data = json.dumps({"error": str(e)})
-            yield f"data: {error_data}\n\n"
-
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
-
-
-
+            yield sse("error", {"error": str(e)})
 
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,51 +1,118 @@
+import random
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from intern_bot.agent import response_cache
+from intern_bot.api.utils.scrape_jobs import ScrapeJob, ScrapeJobManager
+from intern_bot.api.utils.source_schedule import AdaptiveSchedule
 from intern_bot.data_scraper import DataScraper
 from intern_bot.data_manager import DataManager
+from intern_bot.settings import Settings
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-def process_source(source: str):
-    """Process a single source: scrape offers, update database"""
+settings = Settings()
+
+SOURCES = DataScraper.sources()
+
+source_schedule = AdaptiveSchedule(
+    sources=SOURCES,
+    intervals=settings.SCRAPE_INTERVALS,
+    default_interval=settings.SCRAPE_DEFAULT_INTERVAL,
+    target_changes=settings.SCRAPE_TARGET_CHANGES,
+    smoothing=settings.SCRAPE_RATE_SMOOTHING,
+    jitter=settings.SCRAPE_JITTER,
+    state_path=settings.SCRAPE_SCHEDULE_STATE_PATH,
+)
+
+def process_source(source: str, refresh: bool = True, job: ScrapeJob | None = None):
+    """
+    Process a single source: scrape offers, update database.
+    With `refresh` a bounded sample of offers that are still listed is re-scraped
+    and only the ones whose content fingerprint changed are updated.
+    Progress counters and step timings are reported on `job`.
+    """
+    job = job or ScrapeJob("direct", [source])
+    job.update(source, status="running")
     try:
-        current_offers = DataManager.get_current_offers_links(source)
-
-        new_offers = DataScraper.scrape_offers(source)
+        with job.timed(source, "list"):
+            current_offers = DataManager.get_current_offers_links(source)
+            new_offers = DataScraper.scrape_offers(source)
         print(f"SCRAPED {source}:", new_offers)
+        job.update(source, listed=len(new_offers))
 
         to_add, to_remove = DataManager.diff_offers(current_offers, new_offers)
         print(f"TO ADD {source}:", to_add)
-        to_add = to_add[:30] if source == 'PWR' else to_add[:10]
-
-        DataManager.remove_offers(to_remove)
-
-        detailed_offers = DataScraper.scrape_offers_details(source, to_add)
-        DataManager.add_offers(detailed_offers)
-        print(f"ADDED {source}:", detailed_offers)
-
-        return {"source": source, "status": "success", "added": len(detailed_offers)}
+        diffed = len(to_add) + len(to_remove)
+        to_add = to_add[:settings.MAX_NEW_OFFERS.get(source, 10)]
+        job.update(source, diffed=diffed)
+
+        with job.timed(source, "remove"):
+            removed = DataManager.remove_offers(to_remove)
+            still_listed = sorted(set(current_offers) & set(new_offers))
+            DataManager.touch_offers(still_listed)
+        job.update(source, removed=removed)
+
+        refreshed = {"updated": 0, "unchanged": 0, "failed": []}
+        fetched = 0
+        if refresh and still_listed:
+            sample = random.sample(still_listed, min(settings.OFFER_REFRESH_SAMPLE_SIZE, len(still_listed)))
+            with job.timed(source, "refresh"):
+                refreshed_offers = DataScraper.scrape_offers_details(source, sample)
+                refreshed = DataManager.refresh_offers(refreshed_offers)
+            fetched += len(refreshed_offers)
+            print(f"REFRESHED {source}:", refreshed["updated"], "updated,", refreshed["unchanged"], "unchanged")
+            job.update(source, fetched=fetched, updated=refreshed["updated"])
+
+        with job.timed(source, "fetch"):
+            detailed_offers = DataScraper.scrape_offers_details(source, to_add)
+        fetched += len(detailed_offers)
+        job.update(source, fetched=fetched)
+
+        with job.timed(source, "store"):
+            ingest = DataManager.add_offers(detailed_offers)
+        print(f"ADDED {source}:", ingest["inserted"])
+        for failure in ingest["failed"] + refreshed["failed"]:
+            logger.warning(f"Failed to store {source} offer {failure['link']}: {failure['error']}")
+
+        failed = len(ingest["failed"]) + len(refreshed["failed"])
+        job.update(
+            source, status="success", embedded=ingest["embedded"] + refreshed["updated"],
+            inserted=ingest["inserted"], failed=failed,
+        )
+        return {
+            "source": source,
+            "status": "success",
+            "added": ingest["inserted"],
+            "removed": removed,
+            "updated": refreshed["updated"],
+            "changes": diffed + refreshed["updated"],
+            "failed": failed
+        }
     except Exception as e:
         print(f"Error processing {source}: {e}")
+        job.update(source, status="error", error=str(e))
         return {"source": source, "status": "error", "error": str(e)}
 
-def run_daily_scraping():
-    """Run the daily scraping job"""
+def run_daily_scraping(job: ScrapeJob | None = None) -> dict:
+    """
+    Run the scraping job for `job.sources` (all sources without a job). The
+    changes found for each source feed its adaptive schedule, whatever triggered the run.
+    """
+    job = job or ScrapeJob("direct", SOURCES)
     try:
         logger.info("Starting daily scraping job...")
 
-        DataManager.create_vector_index()
-
-        sources = ['Nokia', 'PWR', 'Sii']
+        sources = list(job.sources)
         results = []
 
         with ThreadPoolExecutor(max_workers=3) as executor:
             future_to_source = {
-                executor.submit(process_source, source): source 
+                executor.submit(process_source, source, True, job): source 
                 for source in sources
             }
 
@@ -57,14 +124,48 @@ def run_daily_scraping():
                     logger.info(f"Completed processing {source}: {result}")
                 except Exception as e:
                     logger.error(f"Error processing {source}: {e}")
-                    results.append({"source": source, "status": "error", "error": str(e)})
+                    result = {"source": source, "status": "error", "error": str(e)}
+                    results.append(result)
+                source_schedule.record(source, result.get("changes") if result["status"] == "success" else None)
+
+        expired = DataManager.expire_offers()
+        logger.info(f"Expired offers removed: {expired}")
+
+        # Cached agent answers may point at removed offers or miss new ones
+        changed = expired or any(
+            result.get("added") or result.get("removed") or result.get("updated") for result in results
+        )
+        if changed:
+            response_cache.invalidate()
+
+        index = DataManager.maintain_vector_index()
+        logger.info(f"Vector index: {index}")
+
+        memory_index = DataManager.refresh_memory_index()
+        if memory_index is not None:
+            logger.info(f"Memory index: {memory_index}")
+
+        evicted = DataManager.evict_embedding_cache()
+        logger.info(f"Embedding cache entries evicted: {evicted}")
 
-        outdated = DataManager.get_outdated_offers()
-        DataManager.remove_offers(outdated)
-        
         logger.info(f"Daily scraping completed. Results: {results}")
+        return {
+            "expired": expired, "vector_index": index, "memory_index": memory_index, "embedding_cache_evicted": evicted
+        }
     except Exception as e:
         logger.error(f"Error in daily scraping job: {e}")
+        raise
+
+scrape_jobs = ScrapeJobManager(run_daily_scraping, sources=lambda: SOURCES)
+
+def submit_due_sources():
+    """Periodic check: queue a scrape job for the sources whose next run is due"""
+    due = source_schedule.due()
+    if not due:
+        return
+    job, created = scrape_jobs.submit(trigger="schedule", sources=due)
+    if not created:
+        logger.info(f"Postponing scraping of {', '.join(due)}, job {job.id} is still running")
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -75,14 +176,14 @@ def start_scheduler():
     """Start the scheduler with daily scraping job"""
     try:
         scheduler.add_job(
-            run_daily_scraping,
-            trigger=CronTrigger(hour=2, minute=0),
-            id='daily_scraping',
-            name='Daily Data Scraping',
+            submit_due_sources,
+            trigger=IntervalTrigger(seconds=settings.SCRAPE_CHECK_INTERVAL),
+            id='adaptive_scraping',
+            name='Adaptive Per-Source Scraping',
             replace_existing=True
         )
         scheduler.start()
-        logger.info("Scheduler started successfully. Daily scraping scheduled for 2:00 AM")
+        logger.info(f"Scheduler started successfully. Due sources are checked every {settings.SCRAPE_CHECK_INTERVAL}s")
     except Exception as e:
         logger.error(f"Error starting scheduler: {e}")
 
@@ -90,6 +191,7 @@ def stop_scheduler():
     """Stop the scheduler"""
     try:
         scheduler.shutdown()
+        scrape_jobs.shutdown()
         logger.info("Scheduler stopped")
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+import uuid
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+# Per-source progress counters, in pipeline order
+PROGRESS_COUNTERS = ("listed", "diffed", "fetched", "embedded", "inserted", "removed", "updated", "failed")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ScrapeJob:
+    """State of one scrape run, updated from the worker threads and read by the API."""
+
+    def __init__(self, trigger: str, sources: list[str]):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.status = "queued"
+        self.created_at = _now()
+        self.started_at: str | None = None
+        self.finished_at: str | None = None
+        self.duration_seconds: float | None = None
+        self.error: str | None = None
+        self.result: dict[str, Any] = {}
+        self.sources: dict[str, dict[str, Any]] = {
+            source: {"status": "pending", **dict.fromkeys(PROGRESS_COUNTERS, 0), "timings": {}} for source in sources
+        }
+        self._lock = threading.Lock()
+
+    def update(self, source: str, **values: Any):
+        with self._lock:
+            self.sources.setdefault(source, {"status": "pending", "timings": {}}).update(values)
+
+    @contextmanager
+    def timed(self, source: str, step: str):
+        """Record the duration of a pipeline step of `source` in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.sources[source]["timings"][step] = round(time.perf_counter() - start, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "trigger": self.trigger,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "duration_seconds": self.duration_seconds,
+                "error": self.error,
+                "sources": {source: {**progress, "timings": dict(progress["timings"])}
+                            for source, progress in self.sources.items()},
+                "result": dict(self.result),
+            }
+
+
+class ScrapeJobManager:
+    """
+    Runs scrape jobs on a dedicated background thread, so triggering a scrape
+    never blocks the event loop. At most one job runs at a time: submitting
+    while a job is queued or running returns that job instead of starting
+    another. The last `history` jobs are kept for the status endpoints.
+    """
+
+    def __init__(
+        self, runner: Callable[[ScrapeJob], dict[str, Any]], sources: Callable[[], list[str]], history: int = 20
+    ):
+        self.runner = runner
+        self.sources = sources
+        self.history = history
+
+        self._jobs: OrderedDict[str, ScrapeJob] = OrderedDict()
+        self._active: ScrapeJob | None = None
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(self, trigger: str = "manual", sources: list[str] | None = None) -> tuple[ScrapeJob, bool]:
+        """Queue a scrape of `sources` (all by default). Returns the job and whether it was newly created."""
+        with self._lock:
+            if self._active is not None:
+                return self._active, False
+            job = ScrapeJob(trigger, sources or self.sources())
+            self._active = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-job")
+            self._executor.submit(self._run, job)
+        logging.info(f"Scrape job {job.id} ({trigger}) queued for {', '.join(job.sources)}")
+        return job, True
+
+    def _run(self, job: ScrapeJob):
+        start = time.perf_counter()
+        job.status, job.started_at = "running", _now()
+        try:
+            job.result = self.runner(job) or {}
+            job.status = "succeeded"
+        except Exception as e:
+            logging.error(f"Scrape job {job.id} failed: {e}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = _now()
+            job.duration_seconds = round(time.perf_counter() - start, 3)
+            with self._lock:
+                self._active = None
+            logging.info(f"Scrape job {job.id} {job.status} in {job.duration_seconds}s")
+
+    def get(self, job_id: str) -> ScrapeJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[ScrapeJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    @property
+    def active(self) -> ScrapeJob | None:
+        return self._active
+
+    def shutdown(self):
+        """Stop accepting jobs; a running job is abandoned rather than awaited."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+class AdaptiveSchedule:
+    """
+    Per-source scrape schedule that follows each source's observed change rate.
+    After every run the offers added, removed or updated since the previous run
+    give a rate (changes per second), smoothed with an exponential moving
+    average. The next run is planned `target_changes / rate` seconds later,
+    clamped to the source's (min, max) interval and spread by +/- `jitter`.
+    A run without changes doubles the interval; a failed run is retried after
+    the minimum interval. State is persisted to a JSON file so restarts keep
+    the learned intervals.
+    """
+
+    def __init__(
+        self,
+        sources: list[str],
+        intervals: dict[str, tuple[int, int]],
+        default_interval: tuple[int, int],
+        target_changes: float,
+        smoothing: float,
+        jitter: float,
+        state_path: str,
+    ):
+        self.intervals = intervals
+        self.default_interval = default_interval
+        self.target_changes = target_changes
+        self.smoothing = smoothing
+        self.jitter = jitter
+        self.state_path = Path(state_path)
+
+        self._lock = threading.Lock()
+        self._state: dict[str, dict[str, Any]] = self._load()
+        now = time.time()
+        for source in sources:
+            if source not in self._state:
+                # New sources are scraped soon, spread over a fraction of their minimum interval
+                min_interval, max_interval = self.bounds(source)
+                self._state[source] = {
+                    "interval": float(min(max(86400, min_interval), max_interval)),
+                    "next_run_at": now + random.uniform(0, self.jitter * min_interval),
+                    "last_run_at": None,
+                    "last_changes": None,
+                    "change_rate": None,
+                    "runs": 0,
+                    "failures": 0,
+                }
+        self._state = {source: self._state[source] for source in sources}
+
+    def bounds(self, source: str) -> tuple[int, int]:
+        min_interval, max_interval = self.intervals.get(source, self.default_interval)
+        return min_interval, max(min_interval, max_interval)
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"Ignoring scrape schedule state {self.state_path}: {e}")
+            return {}
+
+    def _save(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logging.warning(f"Couldn't save scrape schedule state: {e}")
+
+    def _spread(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def due(self, now: float | None = None) -> list[str]:
+        now = time.time() if now is None else now
+        with self._lock:
+            return [source for source, state in self._state.items() if state["next_run_at"] <= now]
+
+    def record(self, source: str, changes: int | None, finished_at: float | None = None) -> dict[str, Any]:
+        """Plan the next run of `source` after a run with `changes` changes (None when the run failed)."""
+        now = time.time() if finished_at is None else finished_at
+        min_interval, max_interval = self.bounds(source)
+        with self._lock:
+            state = self._state.get(source)
+            if state is None:
+                return {}
+
+            if changes is None:
+                state["failures"] += 1
+                state["next_run_at"] = now + self._spread(min_interval)
+            else:
+                if state["last_run_at"] is not None:
+                    rate = changes / max(now - state["last_run_at"], 1.0)
+                    previous = state["change_rate"]
+                    state["change_rate"] = rate if previous is None else (
+                        self.smoothing * rate + (1 - self.smoothing) * previous
+                    )
+                if not changes and not state["change_rate"]:
+                    interval = state["interval"] * 2
+                elif state["change_rate"]:
+                    interval = self.target_changes / state["change_rate"]
+                else:
+                    interval = state["interval"]
+                state["interval"] = float(min(max(interval, min_interval), max_interval))
+                state["last_run_at"] = now
+                state["last_changes"] = changes
+                state["runs"] += 1
+                state["next_run_at"] = now + self._spread(state["interval"])
+
+            self._save()
+            return dict(state)
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                source: {
+                    "interval_seconds": round(state["interval"]),
+                    "min_interval_seconds": self.bounds(source)[0],
+                    "max_interval_seconds": self.bounds(source)[1],
+                    "next_run_at": _isoformat(state["next_run_at"]),
+                    "last_run_at": _isoformat(state["last_run_at"]),
+                    "last_changes": state["last_changes"],
+                    "changes_per_hour": (
+                        round(state["change_rate"] * 3600, 3) if state["change_rate"] is not None else None
+                    ),
+                    "runs": state["runs"],
+                    "failures": state["failures"],
+                }
+                for source, state in self._state.items()
+            }
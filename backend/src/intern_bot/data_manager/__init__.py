@@ -1,3 +1,4 @@
 from intern_bot.data_manager.data_manager import DataManager
+from intern_bot.data_manager.async_data_manager import AsyncDataManager
 
-__all__ = ['DataManager']
\ No newline at end of file
+__all__ = ['DataManager', 'AsyncDataManager']
\ No newline at end of file
@@ -0,0 +1,367 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import psycopg
+
+from psycopg_pool import AsyncConnectionPool
+
+from intern_bot.data_manager.data_manager import DataManager
+from intern_bot.data_manager.search_cursor import decode_cursor
+
+
+class AsyncDataManager:
+    """
+    Asyncio counterpart of DataManager with the same read and ingest methods,
+    backed by psycopg 3 and async embeddings. It shares settings, SQL and
+    embedding caches with DataManager so both can be used side by side.
+    Scheduled maintenance (refresh, expiry, indexing) stays on DataManager.
+    """
+    settings = DataManager.settings
+    embeddings = DataManager.embeddings
+    query_embeddings_cache = DataManager.query_embeddings_cache
+
+    _pool: AsyncConnectionPool | None = None
+    _pool_lock = asyncio.Lock()
+
+    @staticmethod
+    async def open_pool() -> AsyncConnectionPool:
+        """Create and open the shared async connection pool if it isn't open yet."""
+        async with AsyncDataManager._pool_lock:
+            if AsyncDataManager._pool is None:
+                pool = AsyncConnectionPool(
+                    kwargs={
+                        "host": AsyncDataManager.settings.DB_HOST,
+                        "port": AsyncDataManager.settings.DB_PORT,
+                        "dbname": AsyncDataManager.settings.DB_NAME,
+                        "user": AsyncDataManager.settings.DB_USER,
+                        "password": AsyncDataManager.settings.DB_PASSWORD.get_secret_value(),
+                    },
+                    min_size=AsyncDataManager.settings.DB_POOL_MIN_SIZE,
+                    max_size=AsyncDataManager.settings.DB_POOL_MAX_SIZE,
+                    timeout=AsyncDataManager.settings.DB_POOL_TIMEOUT,
+                    check=(
+                        AsyncConnectionPool.check_connection if AsyncDataManager.settings.DB_POOL_HEALTH_CHECK else None
+                    ),
+                    open=False,
+                )
+                await pool.open()
+                AsyncDataManager._pool = pool
+        return AsyncDataManager._pool
+
+    @staticmethod
+    async def close_pool():
+        async with AsyncDataManager._pool_lock:
+            if AsyncDataManager._pool is not None:
+                await AsyncDataManager._pool.close()
+                AsyncDataManager._pool = None
+
+    @staticmethod
+    @asynccontextmanager
+    async def _get_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+        """Borrow a connection; the transaction is committed on exit or rolled back on error."""
+        pool = AsyncDataManager._pool or await AsyncDataManager.open_pool()
+        async with pool.connection() as conn:
+            yield conn
+
+    @staticmethod
+    async def get_current_offers(columns: list[str] | None = None) -> list[dict[str, str]]:
+        try:
+            return [offer async for offer in AsyncDataManager.iter_current_offers(columns)]
+        except Exception as e:
+            print(f"Error fetching all offers: {e}")
+            return []
+
+    @staticmethod
+    async def iter_current_offers(
+        columns: list[str] | None = None,
+        batch_size: int | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield offers one by one through a server-side cursor, fetching `batch_size`
+        rows per round trip, so memory use doesn't depend on the table size.
+        """
+        projection = DataManager._projection(columns)
+        async with AsyncDataManager._get_connection() as conn:
+            async with conn.cursor(name="current_offers") as cur:
+                cur.itersize = batch_size or AsyncDataManager.settings.CURRENT_OFFERS_BATCH_SIZE
+                await cur.execute(f"SELECT {projection} FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME} ORDER BY id")
+                column_names = None
+                async for row in cur:
+                    if column_names is None:
+                        column_names = [desc[0] for desc in cur.description]
+                    yield dict(zip(column_names, row, strict=True))
+
+    @staticmethod
+    async def get_offer(link: str) -> dict[str, str] | None:
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(f"""
+                        SELECT id, source, link, title, company, location, contract_type,
+                               date_posted, date_closing, description
+                        FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME}
+                        WHERE link = %s
+                    """, (link,))
+                    row = await cur.fetchone()
+                    if row:
+                        columns = [desc[0] for desc in cur.description]
+                        return dict(zip(columns, row, strict=True))
+                    return None
+        except Exception as e:
+            print(f"Error fetching offer {link} : {e}")
+            return None
+
+    @staticmethod
+    async def _embed_descriptions(descriptions: list[str]) -> list[list[float] | Exception]:
+        results: list[list[float] | Exception] = []
+        batch_size = max(1, AsyncDataManager.settings.EMBEDDING_BATCH_SIZE)
+        for start in range(0, len(descriptions), batch_size):
+            chunk = descriptions[start:start + batch_size]
+            try:
+                results.extend(await AsyncDataManager.embeddings.aembed_documents(chunk))
+            except Exception as e:
+                print(f"Error embedding batch of {len(chunk)} descriptions, retrying one by one: {e}")
+                for description in chunk:
+                    try:
+                        results.append(await AsyncDataManager.embeddings.aembed_query(description))
+                    except Exception as item_error:
+                        results.append(item_error)
+        return results
+
+    @staticmethod
+    async def _insert_rows(rows: list[tuple]) -> tuple[list[str], list[dict[str, str]]]:
+        row_sql = "(" + ", ".join(["%s"] * 10) + ", %s::vector)"
+        try:
+            query = DataManager._insert_offers_sql(", ".join([row_sql] * len(rows)))
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(query, [value for row in rows for value in row])
+                    return [row[0] for row in await cur.fetchall()], []
+        except psycopg.Error as e:
+            print(f"Bulk insert of {len(rows)} offers failed, falling back to per-row inserts: {e}")
+
+        query = DataManager._insert_offers_sql(row_sql)
+        inserted_links, failed = [], []
+        async with AsyncDataManager._get_connection() as conn:
+            for row in rows:
+                try:
+                    async with conn.transaction():
+                        async with conn.cursor() as cur:
+                            await cur.execute(query, row)
+                            inserted_links.extend(r[0] for r in await cur.fetchall())
+                except psycopg.Error as e:
+                    failed.append({"link": row[0], "error": str(e)})
+        return inserted_links, failed
+
+    @staticmethod
+    async def add_offer(offer: dict[str, str]):
+        result = await AsyncDataManager.add_offers([offer])
+        for failure in result["failed"]:
+            print(f"Error adding offer {failure['link']}: {failure['error']}")
+
+    @staticmethod
+    async def add_offers(offers: list[dict[str, str]]) -> dict[str, Any]:
+        valid_offers, failed = DataManager._validate_offers(offers)
+        embeddings = await AsyncDataManager._embed_descriptions(
+            [offer.get("description") or "" for offer in valid_offers]
+        )
+        rows, embedding_failures = DataManager._build_rows(valid_offers, embeddings)
+        failed.extend(embedding_failures)
+
+        inserted: list[str] = []
+        if rows:
+            try:
+                inserted, insert_failures = await AsyncDataManager._insert_rows(rows)
+                failed.extend(insert_failures)
+            except Exception as e:
+                print(f"Error inserting offers: {e}")
+                failed.extend({"link": row[0], "error": str(e)} for row in rows)
+
+        return DataManager._ingest_result(rows, inserted, failed)
+
+    @staticmethod
+    async def remove_offer(offer_link: str) -> int:
+        return await AsyncDataManager.remove_offers([offer_link])
+
+    @staticmethod
+    async def remove_offers(offers_links: list[str]) -> int:
+        """Async version of DataManager.remove_offers."""
+        if not offers_links:
+            return 0
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                cur = await conn.execute(
+                    f"DELETE FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME} WHERE link = ANY(%s)",
+                    (list(offers_links),)
+                )
+                return cur.rowcount
+        except Exception as e:
+            print(f"Error removing offers: {e}")
+            return 0
+
+    @staticmethod
+    async def expire_offers() -> int:
+        """Async version of DataManager.expire_offers."""
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                cur = await conn.execute(
+                    f"DELETE FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME} WHERE date_closing < CURRENT_DATE"
+                )
+                return cur.rowcount
+        except Exception as e:
+            print(f"Error expiring offers: {e}")
+            return 0
+
+    @staticmethod
+    async def get_current_offers_links(source: str | None = None) -> list[str]:
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    if source is not None:
+                        await cur.execute(
+                            f"SELECT link FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME} WHERE source = %s",
+                            (source,)
+                        )
+                    else:
+                        await cur.execute(f"SELECT link FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME}")
+                    rows = await cur.fetchall()
+                    return [row[0] for row in rows]
+        except Exception as e:
+            print(f"Error fetching current offers: {e}")
+            return []
+
+    @staticmethod
+    def diff_offers(current_offers: list[str], new_offers: list[str]) -> tuple[list[str], list[str]]:
+        return DataManager.diff_offers(current_offers, new_offers)
+
+    @staticmethod
+    async def get_outdated_offers() -> list[str]:
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(f"""
+                        SELECT link
+                        FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME}
+                        WHERE date_closing < CURRENT_DATE
+                    """)
+                    return [row[0] for row in await cur.fetchall()]
+        except Exception as e:
+            print(f"Error fetching outdated offers: {e}")
+            return []
+
+    @staticmethod
+    async def get_data_info() -> dict[str, Any]:
+        """Get the current status of the data"""
+        try:
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(f"SELECT COUNT(*) FROM {AsyncDataManager.settings.OFFERS_TABLE_NAME}")
+                    rows = await cur.fetchone()
+                    return f'{rows[0]} offers in vector database'
+        except Exception as e:
+            print(f"Error fetching data info: {e}")
+            return {"message": "Error fetching data info"}
+
+    @staticmethod
+    async def similarity_search_cosine(
+        query: str,
+        k: int = 5,
+        offset: int = 0,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        after: dict[str, Any] | None = None
+    ) -> list[dict]:
+        """Async version of DataManager.similarity_search_cosine."""
+        try:
+            query_embedding = await AsyncDataManager.query_embeddings_cache.aget(
+                query, AsyncDataManager.embeddings.aembed_query
+            )
+            if DataManager._use_memory_index():
+                return DataManager._memory_search(query_embedding, k, offset, include_filters, exclude_filters, after)
+            sql, params = DataManager._similarity_search_sql(
+                query_embedding, k, offset, include_filters, exclude_filters, after
+            )
+            neighbours = k + offset + (after["shown"] if after else 0)
+
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    if search_settings := DataManager.vector_index.search_settings(neighbours):
+                        await cur.execute(*search_settings)
+                    await cur.execute(sql, params)
+                    rows = await cur.fetchall()
+                    columns = [desc[0] for desc in cur.description]
+                    return [dict(zip(columns, row, strict=True)) for row in rows]
+        except Exception as e:
+            print(f"Error during similarity search: {e}")
+            return []
+
+    @staticmethod
+    async def hybrid_search(
+        query: str,
+        keywords: list[str] | None = None,
+        k: int = 5,
+        offset: int = 0,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        after: dict[str, Any] | None = None
+    ) -> list[dict]:
+        """Async version of DataManager.hybrid_search."""
+        try:
+            query_embedding = await AsyncDataManager.query_embeddings_cache.aget(
+                query, AsyncDataManager.embeddings.aembed_query
+            )
+            lexical_query = " ".join(keywords) if keywords else query
+            tail_after = after if after and after.get("phase") == "tail" else None
+            candidates = DataManager._hybrid_candidates(k, offset)
+
+            async with AsyncDataManager._get_connection() as conn:
+                async with conn.cursor() as cur:
+                    # Depth-independent settings for the fused pool, see DataManager.hybrid_search
+                    if search_settings := DataManager.vector_index.search_settings(candidates):
+                        await cur.execute(*search_settings)
+                    rows = []
+                    if tail_after is None:
+                        await cur.execute(*DataManager._hybrid_search_sql(
+                            query_embedding, lexical_query, k, offset, include_filters, exclude_filters, after
+                        ))
+                        columns = [desc[0] for desc in cur.description]
+                        rows = [dict(zip(columns, row, strict=True)) for row in await cur.fetchall()]
+                    if len(rows) < k:
+                        await cur.execute(*DataManager._hybrid_fused_ids_sql(
+                            query_embedding, lexical_query, k, offset, include_filters, exclude_filters
+                        ))
+                        fused_ids = [row[0] for row in await cur.fetchall()]
+                        neighbours = DataManager._hybrid_tail_neighbours(k, offset, after, fused_ids)
+                        if search_settings := DataManager.vector_index.search_settings(neighbours):
+                            await cur.execute(*search_settings)
+                        await cur.execute(*DataManager._hybrid_tail_sql(
+                            query_embedding, fused_ids, k - len(rows), offset,
+                            include_filters, exclude_filters, tail_after
+                        ))
+                        columns = [desc[0] for desc in cur.description]
+                        rows += [dict(zip(columns, row, strict=True)) for row in await cur.fetchall()]
+                    return rows
+        except Exception as e:
+            print(f"Error during hybrid search: {e}")
+            return []
+
+    @staticmethod
+    async def search_offers(
+        query: str,
+        k: int = 5,
+        cursor: str | None = None,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        mode: str = "semantic",
+        keywords: list[str] | None = None
+    ) -> dict[str, Any]:
+        """Async version of DataManager.search_offers."""
+        key = DataManager._search_cursor_key(query, mode, keywords, include_filters, exclude_filters)
+        after = decode_cursor(cursor, key) if cursor else None
+        if mode == "hybrid":
+            rows = await AsyncDataManager.hybrid_search(query, keywords, k, 0, include_filters, exclude_filters, after)
+        else:
+            rows = await AsyncDataManager.similarity_search_cosine(query, k, 0, include_filters, exclude_filters, after)
+        return DataManager._search_page(rows, key, mode, k, after)
@@ -1,62 +1,278 @@
-from typing import Any
-from datetime import date
+import hashlib
+import threading
+from typing import Any, Iterator
+from datetime import date, datetime
+from contextlib import contextmanager
 
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import execute_values
-from langchain_openai import OpenAIEmbeddings
 
 from intern_bot.settings import Settings
+from intern_bot.data_manager.embedding_cache import CachedEmbeddings, QueryEmbeddingCache, normalize_text
+from intern_bot.data_manager.embedding_providers import create_embeddings
+from intern_bot.data_manager.vector_index import VectorIndex
+from intern_bot.data_manager.memory_index import MemoryIndex
+from intern_bot.data_manager.search_cursor import cursor_key, decode_cursor, encode_cursor
 
 
 class DataManager:
     settings = Settings()
-    embeddings = OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY.get_secret_value())
+    _base_embeddings, embedding_model = create_embeddings(
+        settings.EMBEDDING_PROVIDER,
+        settings.EMBEDDING_MODEL,
+        settings.EMBEDDING_DIMENSIONS,
+        api_key=settings.OPENAI_API_KEY.get_secret_value(),
+    )
+    embeddings = CachedEmbeddings(
+        _base_embeddings,
+        model=embedding_model,
+        connection_factory=lambda: DataManager._get_connection(),
+        table_name=settings.EMBEDDING_CACHE_TABLE_NAME,
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        touch_interval=settings.EMBEDDING_CACHE_TOUCH_INTERVAL,
+        # Local embeddings are cheaper to recompute than to look up
+        enabled=settings.EMBEDDING_CACHE_ENABLED and settings.EMBEDDING_PROVIDER != "hashing",
+    )
+    query_embeddings_cache = QueryEmbeddingCache(
+        model=embedding_model,
+        max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+    )
+
+    vector_index = VectorIndex(
+        table_name=settings.OFFERS_TABLE_NAME,
+        connection_factory=lambda: DataManager._get_connection(),
+        index_type=settings.VECTOR_INDEX_TYPE,
+        min_rows=settings.VECTOR_INDEX_MIN_ROWS,
+        rebuild_drift=settings.VECTOR_INDEX_REBUILD_DRIFT,
+        hnsw_m=settings.HNSW_M,
+        hnsw_ef_construction=settings.HNSW_EF_CONSTRUCTION,
+        hnsw_ef_search=settings.HNSW_EF_SEARCH,
+        probes_neighbours=settings.VECTOR_INDEX_PROBES_NEIGHBOURS,
+    )
+    memory_index = MemoryIndex(
+        table_name=settings.OFFERS_TABLE_NAME,
+        connection_factory=lambda: DataManager._get_connection(),
+        snapshot_path=settings.MEMORY_INDEX_PATH,
+    )
+
+    OFFER_COLUMNS = (
+        "id", "source", "link", "title", "company", "location", "contract_type",
+        "date_posted", "date_closing", "description", "fingerprint", "last_seen_at", "embedding"
+    )
+    FINGERPRINT_FIELDS = (
+        "title", "company", "location", "contract_type", "date_posted", "date_closing", "description"
+    )
+    DEFAULT_OFFER_COLUMNS = tuple(column for column in OFFER_COLUMNS if column != "embedding")
+
+    _pool: ThreadedConnectionPool | None = None
+    _pool_lock = threading.Lock()
+    _pool_slots = threading.BoundedSemaphore(settings.DB_POOL_MAX_SIZE)
 
     @staticmethod
-    def _get_connection():
-        return psycopg2.connect(
-            host=DataManager.settings.DB_HOST,
-            port=DataManager.settings.DB_PORT,
-            dbname=DataManager.settings.DB_NAME,
-            user=DataManager.settings.DB_USER,
-            password=DataManager.settings.DB_PASSWORD.get_secret_value()
-        )
-    
+    def _get_pool() -> ThreadedConnectionPool:
+        """Lazily create the shared connection pool."""
+        if DataManager._pool is None or DataManager._pool.closed:
+            with DataManager._pool_lock:
+                if DataManager._pool is None or DataManager._pool.closed:
+                    DataManager._pool = ThreadedConnectionPool(
+                        DataManager.settings.DB_POOL_MIN_SIZE,
+                        DataManager.settings.DB_POOL_MAX_SIZE,
+                        host=DataManager.settings.DB_HOST,
+                        port=DataManager.settings.DB_PORT,
+                        dbname=DataManager.settings.DB_NAME,
+                        user=DataManager.settings.DB_USER,
+                        password=DataManager.settings.DB_PASSWORD.get_secret_value()
+                    )
+        return DataManager._pool
+
     @staticmethod
-    def create_vector_index():
+    def _is_healthy(conn) -> bool:
+        if conn.closed:
+            return False
+        if not DataManager.settings.DB_POOL_HEALTH_CHECK:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    @contextmanager
+    def _get_connection() -> Iterator[Any]:
+        """
+        Borrow a connection from the pool for the duration of the block.
+        The transaction is committed on success, rolled back on error and
+        the connection is always returned to the pool.
         """
-        Creates an IVF index on the embedding column using cosine similarity.
-        This should be run once after the table and embeddings are populated.
+        if not DataManager._pool_slots.acquire(timeout=DataManager.settings.DB_POOL_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free database connection")
+        try:
+            pool = DataManager._get_pool()
+            conn = pool.getconn()
+            if not DataManager._is_healthy(conn):
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            DataManager._pool_slots.release()
+
+    @staticmethod
+    def close_pool():
+        """Close all pooled connections. Called on application shutdown."""
+        with DataManager._pool_lock:
+            if DataManager._pool is not None and not DataManager._pool.closed:
+                DataManager._pool.closeall()
+            DataManager._pool = None
+
+    @staticmethod
+    def ensure_schema():
+        """
+        Create side tables used by the data layer if they don't exist yet.
+        Errors are raised, so the application doesn't start on a schema it can't use
+        (e.g. an embedding column of another size than EMBEDDING_DIMENSIONS).
         """
         try:
             with DataManager._get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(f"""
-                        CREATE INDEX IF NOT EXISTS offers_embedding_ivfflat_idx
-                        ON {DataManager.settings.OFFERS_TABLE_NAME}
-                        USING ivfflat (embedding vector_cosine_ops)
-                        WITH (lists = 100);
+                        ALTER TABLE {DataManager.settings.OFFERS_TABLE_NAME}
+                        ADD COLUMN IF NOT EXISTS fingerprint TEXT,
+                        ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ NOT NULL DEFAULT now()
                     """)
-                    cur.execute(f"ANALYZE {DataManager.settings.OFFERS_TABLE_NAME};")
-                    conn.commit()
-            print("Vector index created successfully.")
+                    DataManager._ensure_embedding_dimensions(cur)
+                    DataManager._create_search_column(cur)
+                    DataManager._create_maintenance_indexes(cur)
+                    DataManager.embeddings.create_table(cur)
+                    DataManager.vector_index.create_table(cur)
+            DataManager.vector_index.load_state()
         except Exception as e:
-            print(f"Error creating vector index: {e}")
+            print(f"Error ensuring database schema: {e}")
+            raise
+
+    @staticmethod
+    def _ensure_embedding_dimensions(cur):
+        """
+        Match the embedding column to EMBEDDING_DIMENSIONS. The column is only
+        retyped while no offer is embedded; otherwise the offers have to be re-embedded first.
+        """
+        table = DataManager.settings.OFFERS_TABLE_NAME
+        dimensions = DataManager.settings.EMBEDDING_DIMENSIONS
+        cur.execute(f"""
+            SELECT format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = '{table}'::regclass AND attname = 'embedding' AND NOT attisdropped
+        """)
+        row = cur.fetchone()
+        if row is None or row[0] == f"vector({dimensions})":
+            return
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE embedding IS NOT NULL)")
+        if cur.fetchone()[0]:
+            raise ValueError(
+                f"{table}.embedding is {row[0]} but EMBEDDING_DIMENSIONS is {dimensions}; "
+                f"re-embed the stored offers or keep the previous embedding settings"
+            )
+        cur.execute(f"DROP INDEX IF EXISTS {DataManager.vector_index.index_name}")
+        cur.execute(f"ALTER TABLE {table} ALTER COLUMN embedding TYPE vector({dimensions})")
+        print(f"Changed {table}.embedding from {row[0]} to vector({dimensions})")
+
+    @staticmethod
+    def _create_search_column(cur):
+        """Full-text search vector over title (weight A) and description (weight B), kept up to date by Postgres."""
+        config = DataManager.settings.SEARCH_TEXT_CONFIG
+        cur.execute(f"""
+            ALTER TABLE {DataManager.settings.OFFERS_TABLE_NAME}
+            ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('{config}'::regconfig, coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('{config}'::regconfig, coalesce(description, '')), 'B')
+            ) STORED
+        """)
+        cur.execute(f"""
+            CREATE INDEX IF NOT EXISTS offers_search_tsv_idx
+            ON {DataManager.settings.OFFERS_TABLE_NAME} USING GIN (search_tsv)
+        """)
+
+    @staticmethod
+    def _create_maintenance_indexes(cur):
+        """B-tree indexes used by expiry (date_closing) and per-source diffs (source)."""
+        table = DataManager.settings.OFFERS_TABLE_NAME
+        cur.execute(f"CREATE INDEX IF NOT EXISTS offers_date_closing_idx ON {table} (date_closing)")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS offers_source_idx ON {table} (source)")
+
+    @staticmethod
+    def get_cache_stats() -> dict[str, Any]:
+        return {
+            "embedding_cache": DataManager.embeddings.stats(),
+            "query_embedding_cache": DataManager.query_embeddings_cache.stats(),
+        }
+
+    @staticmethod
+    def create_vector_index():
+        """Rebuild the vector index now, with the type and parameters derived from config and table size."""
+        return DataManager.vector_index.maintain(force=True)
+
+    @staticmethod
+    def evict_embedding_cache() -> int:
+        """Trim the persistent embedding cache to EMBEDDING_CACHE_MAX_ENTRIES, least recently used first."""
+        if not DataManager.embeddings.enabled:
+            return 0
+        try:
+            return DataManager.embeddings.evict()
+        except Exception as e:
+            print(f"Error evicting embedding cache: {e}")
+            return 0
 
-    
     @staticmethod
-    def get_current_offers() -> list[dict[str, str]]:
+    def maintain_vector_index() -> dict[str, Any]:
+        """Rebuild the vector index only if the data drifted or the config changed since the last build."""
+        return DataManager.vector_index.maintain()
+
+    @staticmethod
+    def refresh_memory_index() -> dict[str, Any] | None:
+        """Sync the in-process index with the offers table when it is the configured retrieval backend."""
+        if DataManager.settings.RETRIEVAL_BACKEND != "memory":
+            return None
+        try:
+            return DataManager.memory_index.refresh()
+        except Exception as e:
+            print(f"Error refreshing memory index: {e}")
+            return None
+
+    @staticmethod
+    def _projection(columns: list[str] | None = None) -> str:
+        """Validate requested columns against OFFER_COLUMNS. Embeddings are left out by default."""
+        columns = list(columns) if columns else list(DataManager.DEFAULT_OFFER_COLUMNS)
+        unknown = [column for column in columns if column not in DataManager.OFFER_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown offer columns: {', '.join(unknown)}")
+        return ", ".join(columns)
+
+    @staticmethod
+    def get_current_offers(columns: list[str] | None = None) -> list[dict[str, str]]:
         try:
+            projection = DataManager._projection(columns)
             with DataManager._get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(f"SELECT id, source, link, title, company, location, contract_type, date_posted, date_closing, description, embedding FROM {DataManager.settings.OFFERS_TABLE_NAME}")
+                    cur.execute(f"SELECT {projection} FROM {DataManager.settings.OFFERS_TABLE_NAME} ORDER BY id")
                     rows = cur.fetchall()
                     columns = [desc[0] for desc in cur.description]
                     return [dict(zip(columns, row)) for row in rows]
         except Exception as e:
             print(f"Error fetching all offers: {e}")
             return []
-        
+
     @staticmethod
     def get_offer(link: str) -> dict[str, str] | None:
         try:
@@ -66,7 +282,7 @@ class DataManager:
                         SELECT id, source, link, title, company, location, contract_type, date_posted, date_closing, description
                         FROM {DataManager.settings.OFFERS_TABLE_NAME}
                         WHERE link = %s
-                    """, (link))
+                    """, (link,))
                     row = cur.fetchone()
                     if row:
                         columns = [desc[0] for desc in cur.description]
@@ -77,67 +293,275 @@ class DataManager:
             return None
 
     @staticmethod
-    def add_offer(offer: dict[str, str]):
+    def _offer_row(offer: dict[str, str], embedding: list[float]) -> tuple:
+        return (
+            offer.get("link"),
+            offer.get("title"),
+            offer.get("company"),
+            offer.get("location"),
+            offer.get("contract_type"),
+            offer.get("date_posted"),
+            offer.get("date_closing"),
+            offer.get("source"),
+            offer.get("description") or "",
+            DataManager.offer_fingerprint(offer),
+            embedding
+        )
+
+    @staticmethod
+    def offer_fingerprint(offer: dict[str, Any]) -> str:
+        """Hash of the offer fields that matter to users, used to detect upstream changes."""
+        parts = []
+        for field in DataManager.FINGERPRINT_FIELDS:
+            value = offer.get(field)
+            if isinstance(value, datetime):
+                value = value.date()
+            if isinstance(value, date):
+                value = value.isoformat()
+            parts.append(normalize_text(str(value)) if value is not None else "")
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _validate_offers(offers: list[dict[str, str]]) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        valid_offers, failed = [], []
+        for offer in offers:
+            if not offer or not offer.get("link") or not offer.get("title"):
+                failed.append({"link": (offer or {}).get("link"), "error": "Missing link or title"})
+            else:
+                valid_offers.append(offer)
+        return valid_offers, failed
+
+    @staticmethod
+    def _build_rows(
+        offers: list[dict[str, str]],
+        embeddings: list[list[float] | Exception]
+    ) -> tuple[list[tuple], list[dict[str, str]]]:
+        rows, failed = [], []
+        for offer, embedding in zip(offers, embeddings):
+            if isinstance(embedding, Exception):
+                failed.append({"link": offer["link"], "error": f"Embedding failed: {embedding}"})
+            else:
+                rows.append(DataManager._offer_row(offer, embedding))
+        return rows, failed
+
+    @staticmethod
+    def _ingest_result(rows: list[tuple], inserted: list[str], failed: list[dict[str, str]]) -> dict[str, Any]:
+        failed_links = {failure["link"] for failure in failed}
+        inserted_links = set(inserted)
+        skipped = [row[0] for row in rows if row[0] not in inserted_links and row[0] not in failed_links]
+        return {"inserted": len(inserted), "embedded": len(rows), "skipped": skipped, "failed": failed}
+
+    @staticmethod
+    def _embed_descriptions(descriptions: list[str]) -> list[list[float] | Exception]:
+        """
+        Embed descriptions in chunks of EMBEDDING_BATCH_SIZE. If a whole chunk fails,
+        its items are retried one by one so a single bad text doesn't fail the others.
+        """
+        results: list[list[float] | Exception] = []
+        batch_size = max(1, DataManager.settings.EMBEDDING_BATCH_SIZE)
+        for start in range(0, len(descriptions), batch_size):
+            chunk = descriptions[start:start + batch_size]
+            try:
+                results.extend(DataManager.embeddings.embed_documents(chunk))
+            except Exception as e:
+                print(f"Error embedding batch of {len(chunk)} descriptions, retrying one by one: {e}")
+                for description in chunk:
+                    try:
+                        results.append(DataManager.embeddings.embed_query(description))
+                    except Exception as item_error:
+                        results.append(item_error)
+        return results
+
+    @staticmethod
+    def _insert_offers_sql(values_sql: str) -> str:
+        return f"""
+            INSERT INTO {DataManager.settings.OFFERS_TABLE_NAME} (
+                link, title, company, location,
+                contract_type, date_posted, date_closing,
+                source, description, fingerprint, embedding
+            )
+            VALUES {values_sql}
+            ON CONFLICT (link) DO NOTHING
+            RETURNING link
+        """
+
+    @staticmethod
+    def _insert_rows(rows: list[tuple]) -> tuple[list[str], list[dict[str, str]]]:
+        """
+        Insert all rows in a single transaction with one multi-row INSERT.
+        When the bulk statement fails, rows are inserted one by one inside
+        savepoints so only the offending rows are rejected.
+        """
+        query = DataManager._insert_offers_sql("%s")
         try:
-            description = offer.get("description", "")
-            embedding = DataManager.embeddings.embed_query(description)
+            with DataManager._get_connection() as conn:
+                with conn.cursor() as cur:
+                    inserted = execute_values(cur, query, rows, page_size=len(rows), fetch=True)
+                    return [row[0] for row in inserted], []
+        except psycopg2.Error as e:
+            print(f"Bulk insert of {len(rows)} offers failed, falling back to per-row inserts: {e}")
 
-            conn = DataManager._get_connection()
+        inserted_links, failed = [], []
+        with DataManager._get_connection() as conn:
+            with conn.cursor() as cur:
+                for row in rows:
+                    cur.execute("SAVEPOINT offer_row")
+                    try:
+                        inserted = execute_values(cur, query, [row], fetch=True)
+                        cur.execute("RELEASE SAVEPOINT offer_row")
+                        inserted_links.extend(r[0] for r in inserted)
+                    except psycopg2.Error as e:
+                        cur.execute("ROLLBACK TO SAVEPOINT offer_row")
+                        failed.append({"link": row[0], "error": str(e)})
+        return inserted_links, failed
 
-            cur = conn.cursor()
+    @staticmethod
+    def add_offer(offer: dict[str, str]):
+        result = DataManager.add_offers([offer])
+        for failure in result["failed"]:
+            print(f"Error adding offer {failure['link']}: {failure['error']}")
 
-            query = f"""
-                INSERT INTO {DataManager.settings.OFFERS_TABLE_NAME} (
-                    link, title, company, location,
-                    contract_type, date_posted, date_closing,
-                    source, description, embedding
-                )
-                VALUES %s
-            """
-
-            values = [(
-                offer.get("link"),
-                offer.get("title"),
-                offer.get("company"),
-                offer.get("location"),
-                offer.get("contract_type"),
-                offer.get("date_posted"),
-                offer.get("date_closing"),
-                offer.get("source"),
-                description,
-                embedding
-            )]
-
-            execute_values(cur, query, values)
-            conn.commit()
-            cur.close()
-            conn.close()
-        except Exception as e:
-            print(f"Error adding offer {offer['link']}: {e}")
+    @staticmethod
+    def add_offers(offers: list[dict[str, str]]) -> dict[str, Any]:
+        """
+        Embed and insert offers in batches.
+
+        Returns:
+            Słownik z liczbą dodanych ofert, linkami pominiętymi (już w bazie)
+            oraz listą błędów per oferta ({"link": ..., "error": ...}).
+        """
+        valid_offers, failed = DataManager._validate_offers(offers)
+        embeddings = DataManager._embed_descriptions([offer.get("description") or "" for offer in valid_offers])
+        rows, embedding_failures = DataManager._build_rows(valid_offers, embeddings)
+        failed.extend(embedding_failures)
+
+        inserted: list[str] = []
+        if rows:
+            try:
+                inserted, insert_failures = DataManager._insert_rows(rows)
+                failed.extend(insert_failures)
+            except Exception as e:
+                print(f"Error inserting offers: {e}")
+                failed.extend({"link": row[0], "error": str(e)} for row in rows)
+
+        return DataManager._ingest_result(rows, inserted, failed)
 
     @staticmethod
-    def add_offers(offers: list[dict[str, str]]):
-        for offer in offers:
-            DataManager.add_offer(offer)
+    def remove_offer(offer_link: str) -> int:
+        return DataManager.remove_offers([offer_link])
 
+    @staticmethod
+    def remove_offers(offers_links: list[str]) -> int:
+        """Delete offers by link in one statement. Returns the number of deleted rows."""
+        if not offers_links:
+            return 0
+        try:
+            with DataManager._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"DELETE FROM {DataManager.settings.OFFERS_TABLE_NAME} WHERE link = ANY(%s)",
+                        (list(offers_links),)
+                    )
+                    return cur.rowcount
+        except Exception as e:
+            print(f"Error removing offers: {e}")
+            return 0
 
     @staticmethod
-    def remove_offer(offer_link: str):
+    def expire_offers() -> int:
+        """Delete offers whose closing date has passed, without fetching them. Returns the number of deleted rows."""
         try:
             with DataManager._get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
-                        f"DELETE FROM {DataManager.settings.OFFERS_TABLE_NAME} WHERE link = %s",
-                        (offer_link)
+                        f"DELETE FROM {DataManager.settings.OFFERS_TABLE_NAME} WHERE date_closing < CURRENT_DATE"
                     )
-                    conn.commit()
+                    return cur.rowcount
         except Exception as e:
-            print(f"Error removing offer {offer_link}: {e}")
+            print(f"Error expiring offers: {e}")
+            return 0
 
     @staticmethod
-    def remove_offers(offers_links: list[int]):
-        for link in offers_links:
-            DataManager.remove_offer(link)
+    def touch_offers(offers_links: list[str]) -> int:
+        """Mark offers as seen upstream without rewriting them."""
+        if not offers_links:
+            return 0
+        try:
+            with DataManager._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"UPDATE {DataManager.settings.OFFERS_TABLE_NAME} SET last_seen_at = now() "
+                        "WHERE link = ANY(%s)",
+                        (list(offers_links),)
+                    )
+                    return cur.rowcount
+        except Exception as e:
+            print(f"Error touching offers: {e}")
+            return 0
+
+    @staticmethod
+    def get_offers_fingerprints(offers_links: list[str]) -> dict[str, str | None]:
+        with DataManager._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT link, fingerprint FROM {DataManager.settings.OFFERS_TABLE_NAME} WHERE link = ANY(%s)",
+                    (list(offers_links),)
+                )
+                return dict(cur.fetchall())
+
+    @staticmethod
+    def refresh_offers(offers: list[dict[str, str]]) -> dict[str, Any]:
+        """
+        Compare freshly scraped details of stored offers with their fingerprints.
+        Changed offers are re-embedded and updated in place, unchanged ones only
+        get their last_seen_at touched.
+        """
+        valid_offers, failed = DataManager._validate_offers(offers)
+        if not valid_offers:
+            return {"updated": 0, "unchanged": 0, "failed": failed}
+
+        try:
+            stored = DataManager.get_offers_fingerprints([offer["link"] for offer in valid_offers])
+        except Exception as e:
+            print(f"Error fetching offer fingerprints: {e}")
+            failed.extend({"link": offer["link"], "error": str(e)} for offer in valid_offers)
+            return {"updated": 0, "unchanged": 0, "failed": failed}
+
+        changed, unchanged = [], []
+        for offer in valid_offers:
+            if offer["link"] not in stored:
+                continue
+            if stored[offer["link"]] == DataManager.offer_fingerprint(offer):
+                unchanged.append(offer["link"])
+            else:
+                changed.append(offer)
+
+        embeddings = DataManager._embed_descriptions([offer.get("description") or "" for offer in changed])
+        rows, embedding_failures = DataManager._build_rows(changed, embeddings)
+        failed.extend(embedding_failures)
+
+        updated = 0
+        if rows:
+            try:
+                with DataManager._get_connection() as conn:
+                    with conn.cursor() as cur:
+                        # One statement per offer so rows removed in the meantime aren't counted as updated
+                        for row in rows:
+                            cur.execute(f"""
+                                UPDATE {DataManager.settings.OFFERS_TABLE_NAME}
+                                SET title = %s, company = %s, location = %s, contract_type = %s,
+                                    date_posted = %s, date_closing = %s, source = %s, description = %s,
+                                    fingerprint = %s, embedding = %s::vector, last_seen_at = now()
+                                WHERE link = %s
+                            """, (*row[1:], row[0]))
+                            updated += cur.rowcount
+            except Exception as e:
+                print(f"Error updating changed offers: {e}")
+                failed.extend({"link": row[0], "error": str(e)} for row in rows)
+                updated = 0
+
+        DataManager.touch_offers(unchanged)
+        return {"updated": updated, "unchanged": len(unchanged), "failed": failed}
 
     @staticmethod
     def get_current_offers_links(source: str | None = None) -> list[str]:
@@ -174,22 +598,22 @@ class DataManager:
 
     
     @staticmethod
-    def get_outdated_offers() -> list[dict[str, str]]:
-        """Zwraca oferty, których data zamknięcia już minęła (date_closing < dzisiaj)."""
+    def get_outdated_offers() -> list[str]:
+        """Zwraca linki ofert, których data zamknięcia już minęła (date_closing < dzisiaj)."""
         try:
             with DataManager._get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(f"""
                         SELECT link
                         FROM {DataManager.settings.OFFERS_TABLE_NAME}
-                        WHERE date_closing IS NOT NULL AND date_closing < %s
-                    """, (date.today(),))
-                    rows = cur.fetchall()
-                    return rows
+                        WHERE date_closing < CURRENT_DATE
+                    """)
+                    return [row[0] for row in cur.fetchall()]
         except Exception as e:
             print(f"Error fetching outdated offers: {e}")
             return []
 
+    @staticmethod
     def get_data_info() -> dict[str, Any]:
         """Get the current status of the data"""
         try:
@@ -202,13 +626,248 @@ class DataManager:
             print(f"Error fetching data info: {e}")
             return {"message": "Error fetching data info"}
         
+    @staticmethod
+    def _filter_clauses(
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None
+    ) -> tuple[list[str], list]:
+        where_clauses = []
+        params = []
+        for filters, operator in ((include_filters, "IN"), (exclude_filters, "NOT IN")):
+            for key, values in DataManager._normalize_filters(filters).items():
+                placeholders = ",".join(["%s"] * len(values))
+                where_clauses.append(f"{key} {operator} ({placeholders})")
+                params.extend(values)
+        return where_clauses, params
+
+    @staticmethod
+    def _normalize_filters(filters: dict[str, list] | None) -> dict[str, list]:
+        """Supported, non-empty filters with their values as stored in the table."""
+        normalized = {}
+        for key in ["company", "location", "contract_type", "source"]:
+            if filters and key in filters and filters[key] and len(filters[key]) > 0:
+                values = filters[key]
+                # Sii ofers have Sii Polska as company name
+                if key == "company":
+                    values = ["Sii Polska" if "sii" in val.lower() else val for val in values]
+                normalized[key] = values
+        return normalized
+
+    @staticmethod
+    def _use_memory_index() -> bool:
+        return DataManager.settings.RETRIEVAL_BACKEND == "memory" and DataManager.memory_index.ready
+
+    @staticmethod
+    def _memory_search(
+        query_embedding: list[float],
+        k: int,
+        offset: int,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None,
+        after: dict[str, Any] | None
+    ) -> list[dict]:
+        return DataManager.memory_index.search(
+            query_embedding, k, offset,
+            DataManager._normalize_filters(include_filters), DataManager._normalize_filters(exclude_filters),
+            after,
+        )
+
+    @staticmethod
+    def _similarity_search_sql(
+        query_embedding: list[float],
+        k: int,
+        offset: int,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None,
+        after: dict[str, Any] | None = None
+    ) -> tuple[str, list]:
+        """
+        Build the cosine similarity query shared by the sync and async data managers.
+        With `after` (a decoded cursor) only offers ranked after (distance, id) of
+        the cursor are returned, so deeper pages don't re-sort and skip earlier rows.
+        """
+        where_clauses, filter_params = DataManager._filter_clauses(include_filters, exclude_filters)
+        if after:
+            where_clauses.append("(embedding <=> %s::vector, id) > (%s::float8, %s)")
+            filter_params += [query_embedding, after["value"], after["id"]]
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+
+        sql = f"""
+            SELECT id, link, title, company, location, contract_type, date_posted, date_closing, source, description,
+                   embedding <=> %s::vector AS distance
+            FROM {DataManager.settings.OFFERS_TABLE_NAME}
+            {where_sql}
+            ORDER BY distance, id
+            LIMIT %s OFFSET %s
+        """
+        return sql, [query_embedding, *filter_params, k, offset]
+
+    @staticmethod
+    def _hybrid_candidates(k: int, offset: int) -> int:
+        """Length of the vector and the full-text ranking fused by hybrid search."""
+        return max(DataManager.settings.HYBRID_CANDIDATES, k + offset)
+
+    @staticmethod
+    def _hybrid_fusion_sql(
+        query_embedding: list[float],
+        lexical_query: str,
+        candidates: int,
+        filter_sql: str,
+        filter_params: list
+    ) -> tuple[str, list]:
+        """
+        The `fused` CTE of hybrid search: the top `candidates` of the vector
+        ranking and of the full-text ranking (any of the query terms, scored with
+        ts_rank_cd), fused with reciprocal rank fusion:
+        score = sum of 1 / (HYBRID_RRF_K + rank). The vector ranking is ordered by
+        (distance, id), which the ANN index can't serve, so the pool is exact and
+        the same on every page of a search.
+        """
+        table = DataManager.settings.OFFERS_TABLE_NAME
+        config = DataManager.settings.SEARCH_TEXT_CONFIG
+        rrf_k = DataManager.settings.HYBRID_RRF_K
+        sql = f"""
+            WITH vector_ranking AS (
+                SELECT id, row_number() OVER (ORDER BY embedding <=> %s::vector, id) AS rank
+                FROM {table}
+                WHERE TRUE{filter_sql}
+                ORDER BY embedding <=> %s::vector, id
+                LIMIT %s
+            ),
+            search_query AS (
+                SELECT replace(plainto_tsquery('{config}'::regconfig, %s)::text, '&', '|')::tsquery AS terms
+            ),
+            lexical_ranking AS (
+                SELECT id, row_number() OVER (ORDER BY ts_rank_cd(search_tsv, search_query.terms) DESC, id) AS rank
+                FROM {table}, search_query
+                WHERE search_tsv @@ search_query.terms{filter_sql}
+                ORDER BY ts_rank_cd(search_tsv, search_query.terms) DESC, id
+                LIMIT %s
+            ),
+            fused AS (
+                SELECT coalesce(v.id, l.id) AS id,
+                       coalesce(1.0 / ({rrf_k} + v.rank), 0) + coalesce(1.0 / ({rrf_k} + l.rank), 0) AS score
+                FROM vector_ranking v
+                FULL OUTER JOIN lexical_ranking l ON v.id = l.id
+            )
+        """
+        params = [
+            query_embedding, *filter_params, query_embedding, candidates,
+            lexical_query, *filter_params, candidates,
+        ]
+        return sql, params
+
+    @staticmethod
+    def _hybrid_search_sql(
+        query_embedding: list[float],
+        lexical_query: str,
+        k: int,
+        offset: int,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None,
+        after: dict[str, Any] | None = None
+    ) -> tuple[str, list]:
+        """
+        Build the hybrid search query shared by the sync and async data managers:
+        the fused candidates ordered by score. With `after` (a decoded cursor) only
+        offers ranked after (score, id) of the cursor are returned.
+        """
+        where_clauses, filter_params = DataManager._filter_clauses(include_filters, exclude_filters)
+        filter_sql = "".join(f" AND {clause}" for clause in where_clauses)
+        fusion_sql, fusion_params = DataManager._hybrid_fusion_sql(
+            query_embedding, lexical_query, DataManager._hybrid_candidates(k, offset), filter_sql, filter_params
+        )
+        after_sql = "WHERE fused.score < %s::numeric OR (fused.score = %s::numeric AND o.id > %s)" if after else ""
+
+        sql = f"""
+            {fusion_sql}
+            SELECT o.id, o.link, o.title, o.company, o.location, o.contract_type, o.date_posted, o.date_closing,
+                   o.source, o.description, o.embedding <=> %s::vector AS distance, fused.score
+            FROM fused
+            JOIN {DataManager.settings.OFFERS_TABLE_NAME} o ON o.id = fused.id
+            {after_sql}
+            ORDER BY fused.score DESC, o.id
+            LIMIT %s OFFSET %s
+        """
+        params = [
+            *fusion_params,
+            query_embedding,
+            *([after["value"], after["value"], after["id"]] if after else []),
+            k, offset,
+        ]
+        return sql, params
+
+    @staticmethod
+    def _hybrid_fused_ids_sql(
+        query_embedding: list[float],
+        lexical_query: str,
+        k: int,
+        offset: int,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None
+    ) -> tuple[str, list]:
+        """Ids of the fused hybrid candidates, which the tail of a hybrid search skips."""
+        where_clauses, filter_params = DataManager._filter_clauses(include_filters, exclude_filters)
+        filter_sql = "".join(f" AND {clause}" for clause in where_clauses)
+        fusion_sql, fusion_params = DataManager._hybrid_fusion_sql(
+            query_embedding, lexical_query, DataManager._hybrid_candidates(k, offset), filter_sql, filter_params
+        )
+        return f"{fusion_sql} SELECT id FROM fused", fusion_params
+
+    @staticmethod
+    def _hybrid_tail_sql(
+        query_embedding: list[float],
+        fused_ids: list[int],
+        k: int,
+        offset: int,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None,
+        after: dict[str, Any] | None = None
+    ) -> tuple[str, list]:
+        """
+        The offers in neither hybrid candidate list (fused score 0), in vector
+        order. They follow the fused results, so paging a hybrid search continues
+        until every matching offer was shown. `fused_ids` come from
+        _hybrid_fused_ids_sql; `offset` counts from the first fused result;
+        `after` is a cursor of this phase, keyed on (distance, id).
+        """
+        where_clauses, filter_params = DataManager._filter_clauses(include_filters, exclude_filters)
+        filter_sql = "".join(f" AND {clause}" for clause in where_clauses)
+        after_sql = " AND (embedding <=> %s::vector, id) > (%s::float8, %s)" if after else ""
+
+        sql = f"""
+            SELECT id, link, title, company, location, contract_type, date_posted, date_closing, source, description,
+                   embedding <=> %s::vector AS distance, 0::numeric AS score
+            FROM {DataManager.settings.OFFERS_TABLE_NAME}
+            WHERE id <> ALL(%s::int[]){filter_sql}{after_sql}
+            ORDER BY distance, id
+            LIMIT %s OFFSET %s
+        """
+        params = [
+            query_embedding,
+            list(fused_ids),
+            *filter_params,
+            *([query_embedding, after["value"], after["id"]] if after else []),
+            k, max(offset - len(fused_ids), 0),
+        ]
+        return sql, params
+
+    @staticmethod
+    def _hybrid_tail_neighbours(k: int, offset: int, after: dict[str, Any] | None, fused_ids: list[int]) -> int:
+        """Nearest neighbours the tail scan may need from the index: the fused offers plus the tail read so far."""
+        return len(fused_ids) + k + offset + (after["shown"] if after else 0)
+
     @staticmethod
     def similarity_search_cosine(
         query: str,
         k: int = 5,
         offset: int = 0,
         include_filters: dict[str, list] | None = None,
-        exclude_filters: dict[str, list] | None = None
+        exclude_filters: dict[str, list] | None = None,
+        after: dict[str, Any] | None = None
     ) -> list[dict]:
         """
         Perform similarity search using cosine similarity on the embedding column,
@@ -218,6 +877,7 @@ class DataManager:
             query: tekst zapytania do osadzenia i wyszukania.
             k: liczba zwracanych wyników.
             offset: liczba wyników do pominięcia (dla paginacji).
+            after: zdekodowany kursor (zob. search_offers); zwraca wyniki po ostatnio pokazanej ofercie.
             include_filters: słownik filtrów zawierających wartości do uwzględnienia, np.
                 {
                     "company": ["Sii Polska", "Nokia"],
@@ -235,53 +895,129 @@ class DataManager:
             Lista słowników z wynikami i odległością.
         """
         try:
-            query_embedding = DataManager.embeddings.embed_query(query)
-            where_clauses = []
-            params = [query_embedding]
-
-            if include_filters:
-                for key in ["company", "location", "contract_type", "source"]:
-                    if key in include_filters and include_filters[key] and len(include_filters[key]) > 0:
-                        values = include_filters[key]
-                        # Sii ofers have Sii Polska as company name
-                        if key == "company":
-                            values = ["Sii Polska" if "sii" in val.lower() else val for val in values]
-                        
-                        placeholders = ",".join(["%s"] * len(values))
-                        where_clauses.append(f"{key} IN ({placeholders})")
-                        params.extend(values)
-            if exclude_filters:
-                for key in ["company", "location", "contract_type", "source"]:
-                    if key in exclude_filters and exclude_filters[key] and len(exclude_filters[key]) > 0:
-                        values = exclude_filters[key]
-                        # Sii ofers have Sii Polska as company name
-                        if key == "company":
-                            values = ["Sii Polska" if "sii" in val.lower() else val for val in values]
-                        
-                        placeholders = ",".join(["%s"] * len(values))
-                        where_clauses.append(f"{key} NOT IN ({placeholders})")
-                        params.extend(values)
-
-            where_sql = ""
-            if where_clauses:
-                where_sql = "WHERE " + " AND ".join(where_clauses)
-
-            sql = f"""
-                SELECT id, link, title, company, location, contract_type, date_posted, date_closing, source, description,
-                       embedding <=> %s::vector AS distance
-                FROM {DataManager.settings.OFFERS_TABLE_NAME}
-                {where_sql}
-                ORDER BY distance
-                LIMIT %s OFFSET %s
-            """
-            params.extend([k, offset])
+            query_embedding = DataManager.query_embeddings_cache.get(query, DataManager.embeddings.embed_query)
+            if DataManager._use_memory_index():
+                return DataManager._memory_search(query_embedding, k, offset, include_filters, exclude_filters, after)
+            sql, params = DataManager._similarity_search_sql(
+                query_embedding, k, offset, include_filters, exclude_filters, after
+            )
+            neighbours = k + offset + (after["shown"] if after else 0)
 
             with DataManager._get_connection() as conn:
                 with conn.cursor() as cur:
+                    if search_settings := DataManager.vector_index.search_settings(neighbours):
+                        cur.execute(*search_settings)
                     cur.execute(sql, params)
                     rows = cur.fetchall()
                     columns = [desc[0] for desc in cur.description]
                     return [dict(zip(columns, row)) for row in rows]
         except Exception as e:
             print(f"Error during similarity search: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def hybrid_search(
+        query: str,
+        keywords: list[str] | None = None,
+        k: int = 5,
+        offset: int = 0,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        after: dict[str, Any] | None = None
+    ) -> list[dict]:
+        """
+        Hybrid search: the embedding ranking of `query` fused with a full-text
+        ranking of `keywords` (or of `query` when no keywords are given) over
+        title and description. Offers outside both candidate lists follow in
+        vector order. Filters and paging work as in similarity_search_cosine.
+        Only the tail scan gets index settings sized for the page depth; the
+        fused pool is ranked under fixed ones, so its scores don't shift between pages.
+        """
+        try:
+            query_embedding = DataManager.query_embeddings_cache.get(query, DataManager.embeddings.embed_query)
+            lexical_query = " ".join(keywords) if keywords else query
+            tail_after = after if after and after.get("phase") == "tail" else None
+            candidates = DataManager._hybrid_candidates(k, offset)
+
+            with DataManager._get_connection() as conn:
+                with conn.cursor() as cur:
+                    # The fused pool is ranked with index settings that don't depend on the page depth,
+                    # so every page fuses the same candidates and the (score, id) cursor stays valid
+                    if search_settings := DataManager.vector_index.search_settings(candidates):
+                        cur.execute(*search_settings)
+                    rows = []
+                    if tail_after is None:
+                        cur.execute(*DataManager._hybrid_search_sql(
+                            query_embedding, lexical_query, k, offset, include_filters, exclude_filters, after
+                        ))
+                        columns = [desc[0] for desc in cur.description]
+                        rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+                    if len(rows) < k:
+                        cur.execute(*DataManager._hybrid_fused_ids_sql(
+                            query_embedding, lexical_query, k, offset, include_filters, exclude_filters
+                        ))
+                        fused_ids = [row[0] for row in cur.fetchall()]
+                        neighbours = DataManager._hybrid_tail_neighbours(k, offset, after, fused_ids)
+                        if search_settings := DataManager.vector_index.search_settings(neighbours):
+                            cur.execute(*search_settings)
+                        cur.execute(*DataManager._hybrid_tail_sql(
+                            query_embedding, fused_ids, k - len(rows), offset,
+                            include_filters, exclude_filters, tail_after
+                        ))
+                        columns = [desc[0] for desc in cur.description]
+                        rows += [dict(zip(columns, row)) for row in cur.fetchall()]
+                    return rows
+        except Exception as e:
+            print(f"Error during hybrid search: {e}")
+            return []
+
+    @staticmethod
+    def _search_cursor_key(
+        query: str,
+        mode: str,
+        keywords: list[str] | None,
+        include_filters: dict[str, list] | None,
+        exclude_filters: dict[str, list] | None
+    ) -> str:
+        return cursor_key(mode, normalize_text(query), keywords, include_filters, exclude_filters)
+
+    @staticmethod
+    def _search_page(rows: list[dict], key: str, mode: str, k: int, after: dict[str, Any] | None) -> dict[str, Any]:
+        """Wrap a result page with the cursor of its last offer (None when there are no more offers)."""
+        shown = (after["shown"] if after else 0) + len(rows)
+        next_cursor = None
+        if rows and len(rows) == k:
+            last = rows[-1]
+            if mode == "hybrid" and last["score"] > 0:
+                next_cursor = encode_cursor(key, last["score"], last["id"], shown)
+            elif mode == "hybrid":
+                next_cursor = encode_cursor(key, last["distance"], last["id"], shown, phase="tail")
+            else:
+                next_cursor = encode_cursor(key, last["distance"], last["id"], shown)
+        return {"offers": rows, "next_cursor": next_cursor}
+
+    @staticmethod
+    def search_offers(
+        query: str,
+        k: int = 5,
+        cursor: str | None = None,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        mode: str = "semantic",
+        keywords: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        One page of search results with keyset pagination: returns
+        {"offers": [...], "next_cursor": ...}. Passing `next_cursor` back returns
+        the offers ranked after the last one shown, so every page costs the same
+        as the first and no offer is repeated or skipped (semantic pages served by
+        an approximate index may skip rows, see VectorIndex.search_settings).
+        Raises ValueError for a cursor from a different search.
+        """
+        key = DataManager._search_cursor_key(query, mode, keywords, include_filters, exclude_filters)
+        after = decode_cursor(cursor, key) if cursor else None
+        if mode == "hybrid":
+            rows = DataManager.hybrid_search(query, keywords, k, 0, include_filters, exclude_filters, after)
+        else:
+            rows = DataManager.similarity_search_cosine(query, k, 0, include_filters, exclude_filters, after)
+        return DataManager._search_page(rows, key, mode, k, after)
@@ -0,0 +1,364 @@
+import asyncio
+import hashlib
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, ContextManager
+
+from langchain_core.embeddings import Embeddings
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only differences map to the same key."""
+    return " ".join((text or "").split())
+
+
+def content_hash(text: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper backed by a Postgres side table keyed by a hash of the
+    normalized text and the model name. Texts that were embedded before are
+    served from the table. `last_used_at` is refreshed at most once per
+    `touch_interval` seconds per row, so hits stay read-only; `evict()` drops
+    the least recently used rows in one batch once the table grows past
+    `max_entries` and is run by scheduled maintenance, not per call.
+    Storage errors never fail an embedding call, the wrapped model is used directly instead.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        connection_factory: Callable[[], ContextManager[Any]],
+        table_name: str = "embedding_cache",
+        max_entries: int = 50000,
+        enabled: bool = True,
+        touch_interval: int = 86400,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.connection_factory = connection_factory
+        self.table_name = table_name
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.touch_interval = touch_interval
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def create_table(self, cur):
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                content_hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                embedding REAL[] NOT NULL,
+                last_used_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        cur.execute(f"""
+            CREATE INDEX IF NOT EXISTS {self.table_name}_last_used_idx
+            ON {self.table_name} (last_used_at)
+        """)
+
+    def _lookup(self, keys: list[str]) -> dict[str, list[float]]:
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT content_hash, embedding FROM {self.table_name} WHERE content_hash = ANY(%s)",
+                    (keys,)
+                )
+                found = {row[0]: list(row[1]) for row in cur.fetchall()}
+                if found:
+                    cur.execute(f"""
+                        UPDATE {self.table_name} SET last_used_at = now()
+                        WHERE content_hash = ANY(%s) AND last_used_at < now() - make_interval(secs => %s)
+                    """, (list(found), self.touch_interval))
+                return found
+
+    def _store(self, entries: dict[str, list[float]]):
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                for key, embedding in entries.items():
+                    cur.execute(f"""
+                        INSERT INTO {self.table_name} (content_hash, model, embedding)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (content_hash) DO UPDATE SET last_used_at = now()
+                    """, (key, self.model, embedding))
+
+    def evict(self) -> int:
+        """Delete the least recently used rows beyond `max_entries` in one statement. Returns the number deleted."""
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT count(*) FROM {self.table_name}")
+                overflow = cur.fetchone()[0] - self.max_entries
+                if overflow <= 0:
+                    return 0
+                cur.execute(f"""
+                    DELETE FROM {self.table_name}
+                    WHERE content_hash IN (
+                        SELECT content_hash FROM {self.table_name}
+                        ORDER BY last_used_at
+                        LIMIT %s
+                    )
+                """, (overflow,))
+                evicted = cur.rowcount
+        with self._lock:
+            self.evicted += evicted
+        return evicted
+
+    def _count(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not self.enabled or not texts:
+            return self.embeddings.embed_documents(texts)
+
+        keys = [content_hash(text, self.model) for text in texts]
+        try:
+            cached = self._lookup(list(set(keys)))
+        except Exception as e:
+            print(f"Error reading embedding cache: {e}")
+            cached = {}
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self._count(hits=len(texts) - len(missing), misses=len(missing))
+
+        if missing:
+            fresh = dict(zip(missing, self.embeddings.embed_documents(list(missing.values())), strict=True))
+            try:
+                self._store(fresh)
+            except Exception as e:
+                print(f"Error writing embedding cache: {e}")
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        if not self.enabled:
+            return self.embeddings.embed_query(text)
+
+        key = content_hash(text, self.model)
+        try:
+            cached = self._lookup([key])
+        except Exception as e:
+            print(f"Error reading embedding cache: {e}")
+            cached = {}
+
+        if key in cached:
+            self._count(hits=1, misses=0)
+            return cached[key]
+
+        self._count(hits=0, misses=1)
+        embedding = self.embeddings.embed_query(text)
+        try:
+            self._store({key: embedding})
+        except Exception as e:
+            print(f"Error writing embedding cache: {e}")
+        return embedding
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not self.enabled or not texts:
+            return await self.embeddings.aembed_documents(texts)
+
+        keys = [content_hash(text, self.model) for text in texts]
+        try:
+            cached = await asyncio.to_thread(self._lookup, list(set(keys)))
+        except Exception as e:
+            print(f"Error reading embedding cache: {e}")
+            cached = {}
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self._count(hits=len(texts) - len(missing), misses=len(missing))
+
+        if missing:
+            fresh = dict(zip(missing, await self.embeddings.aembed_documents(list(missing.values())), strict=True))
+            try:
+                await asyncio.to_thread(self._store, fresh)
+            except Exception as e:
+                print(f"Error writing embedding cache: {e}")
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        if not self.enabled:
+            return await self.embeddings.aembed_query(text)
+
+        key = content_hash(text, self.model)
+        try:
+            cached = await asyncio.to_thread(self._lookup, [key])
+        except Exception as e:
+            print(f"Error reading embedding cache: {e}")
+            cached = {}
+
+        if key in cached:
+            self._count(hits=1, misses=0)
+            return cached[key]
+
+        self._count(hits=0, misses=1)
+        embedding = await self.embeddings.aembed_query(text)
+        try:
+            await asyncio.to_thread(self._store, {key: embedding})
+        except Exception as e:
+            print(f"Error writing embedding cache: {e}")
+        return embedding
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "model": self.model,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evicted": self.evicted,
+                "max_entries": self.max_entries,
+            }
+
+
+class QueryEmbeddingCache:
+    """
+    In-process LRU cache with TTL for query embeddings, keyed by model and
+    normalized query text. Concurrent lookups of the same uncached query are
+    coalesced so only one remote embedding call is in flight per key.
+    """
+
+    def __init__(self, model: str, max_size: int = 1024, ttl: float = 3600.0):
+        self.model = model
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._async_in_flight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.miss_seconds = 0.0
+
+    def _get_fresh(self, key: str) -> list[float] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, embedding = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _put(self, key: str, embedding: list[float], elapsed: float):
+        self._entries[key] = (time.monotonic() + self.ttl, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self.misses += 1
+        self.miss_seconds += elapsed
+
+    def get(self, query: str, embed: Callable[[str], list[float]]) -> list[float]:
+        key = content_hash(query, self.model)
+        with self._lock:
+            embedding = self._get_fresh(key)
+            if embedding is not None:
+                self.hits += 1
+                return embedding
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            embedding = embed(query)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._put(key, embedding, time.perf_counter() - start)
+            self._in_flight.pop(key, None)
+        future.set_result(embedding)
+        return embedding
+
+    async def aget(self, query: str, aembed: Callable[[str], Awaitable[list[float]]]) -> list[float]:
+        key = content_hash(query, self.model)
+        with self._lock:
+            embedding = self._get_fresh(key)
+            if embedding is not None:
+                self.hits += 1
+                return embedding
+            future = self._async_in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._async_in_flight[key] = asyncio.get_running_loop().create_future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return await asyncio.shield(future)
+
+        start = time.perf_counter()
+        try:
+            embedding = await aembed(query)
+        except BaseException as e:
+            with self._lock:
+                self._async_in_flight.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else was waiting for it
+                future.exception()
+            raise
+
+        with self._lock:
+            self._put(key, embedding, time.perf_counter() - start)
+            self._async_in_flight.pop(key, None)
+        future.set_result(embedding)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            avg_miss_seconds = self.miss_seconds / self.misses if self.misses else 0.0
+            return {
+                "model": self.model,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "avg_miss_seconds": avg_miss_seconds,
+                "saved_seconds": self.hits * avg_miss_seconds,
+                "saved_remote_calls": self.hits + self.coalesced,
+            }
@@ -0,0 +1,76 @@
+import hashlib
+import re
+
+import numpy as np
+
+from langchain_core.embeddings import Embeddings
+
+from intern_bot.data_manager.embedding_cache import normalize_text
+
+EMBEDDING_PROVIDERS = ("openai", "hashing")
+# OpenAI models whose output size can be chosen with the `dimensions` parameter
+OPENAI_SHORTENABLE_MODELS = ("text-embedding-3-small", "text-embedding-3-large")
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local, deterministic embeddings: word unigrams and bigrams of the
+    normalized text are hashed (blake2b, stable across processes) into
+    `dimensions` signed buckets, weighted by sublinear term frequency and
+    L2-normalized. Texts sharing words end up close in cosine distance.
+    It needs no network and no model download, for offline ingest and search load tests.
+    """
+
+    def __init__(self, dimensions: int = 1536):
+        if dimensions <= 0:
+            raise ValueError("Embedding dimensions must be positive")
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> dict[str, int]:
+        tokens = _TOKEN_PATTERN.findall(normalize_text(text).lower())
+        counts: dict[str, int] = {}
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]:
+            counts[feature] = counts.get(feature, 0) + 1
+        return counts
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign * (1.0 + np.log(count))
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+def create_embeddings(provider: str, model: str, dimensions: int, api_key: str | None = None) -> tuple[Embeddings, str]:
+    """
+    The configured embedding backend and the name its vectors are cached under.
+    The name changes with the model and dimensions, so cached vectors of another
+    configuration are never served.
+    """
+    if provider == "hashing":
+        return HashingEmbeddings(dimensions), f"hashing/{dimensions}"
+    if provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        if model in OPENAI_SHORTENABLE_MODELS:
+            return OpenAIEmbeddings(api_key=api_key, model=model, dimensions=dimensions), f"{model}/{dimensions}"
+        return OpenAIEmbeddings(api_key=api_key, model=model), model
+    raise ValueError(f"Unknown embedding provider: {provider} (expected one of {', '.join(EMBEDDING_PROVIDERS)})")
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import threading
+
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, ContextManager
+
+import numpy as np
+
+# Offer columns kept next to the embeddings, in the order similarity search returns them
+RESULT_COLUMNS = (
+    "id", "link", "title", "company", "location", "contract_type",
+    "date_posted", "date_closing", "source", "description",
+)
+FILTER_COLUMNS = ("company", "location", "contract_type", "source")
+DATE_COLUMNS = ("date_posted", "date_closing")
+
+
+class _Snapshot:
+    """Immutable view of the index: normalized embeddings, offer metadata and per-column filter codes."""
+
+    def __init__(self, matrix: np.ndarray, rows: list[dict[str, Any]], fingerprints: list[str]):
+        self.matrix = matrix
+        self.rows = rows
+        self.fingerprints = fingerprints
+        self.ids = np.array([row["id"] for row in rows], dtype=np.int64)
+        self.codes: dict[str, tuple[dict[Any, int], np.ndarray]] = {}
+        for column in FILTER_COLUMNS:
+            values = [row[column] for row in rows]
+            vocabulary = {value: code for code, value in enumerate(dict.fromkeys(v for v in values if v is not None))}
+            codes = np.array(
+                [vocabulary.get(value, -1) if value is not None else -1 for value in values], dtype=np.int32
+            )
+            self.codes[column] = (vocabulary, codes)
+
+    @classmethod
+    def empty(cls) -> "_Snapshot":
+        return cls(np.empty((0, 0), dtype=np.float32), [], [])
+
+    def mask(self, column: str, values: list, include: bool) -> np.ndarray:
+        """Rows matching `column IN values` (or `NOT IN`); NULLs match neither, as in SQL."""
+        vocabulary, codes = self.codes[column]
+        wanted = np.array([vocabulary[value] for value in values if value in vocabulary], dtype=np.int32)
+        matches = np.isin(codes, wanted)
+        return matches if include else ~matches & (codes >= 0)
+
+
+class MemoryIndex:
+    """
+    In-process read replica of the offer embeddings for similarity search.
+    Embeddings are kept L2-normalized in a contiguous float32 matrix that is
+    memory-mapped from a local snapshot (`<path>.npy` with `<path>.json` holding
+    the offer metadata), so restarts don't reload the table. `refresh` only
+    fetches offers that were added or whose fingerprint changed since the
+    snapshot and drops removed ones. Search is an exact cosine top-k with the
+    same include/exclude filter semantics and (distance, id) ordering as the
+    Postgres query.
+    """
+
+    def __init__(self, table_name: str, connection_factory: Callable[[], ContextManager[Any]], snapshot_path: str):
+        self.table_name = table_name
+        self.connection_factory = connection_factory
+        self.snapshot_path = Path(snapshot_path)
+
+        self._snapshot: _Snapshot | None = None
+        self._refresh_lock = threading.Lock()
+        self.refreshed_at: str | None = None
+        self.searches = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self.snapshot_path.with_suffix(".npy")
+
+    @property
+    def _metadata_path(self) -> Path:
+        return self.snapshot_path.with_suffix(".json")
+
+    def load(self) -> bool:
+        """Open the local snapshot, if there is a consistent one."""
+        try:
+            with open(self._metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+            matrix = np.load(self._matrix_path, mmap_mode="r")
+            if matrix.shape[0] != len(metadata["rows"]):
+                raise ValueError("snapshot matrix and metadata disagree")
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.warning(f"Ignoring memory index snapshot {self.snapshot_path}: {e}")
+            return False
+
+        rows = metadata["rows"]
+        for row in rows:
+            for column in DATE_COLUMNS:
+                if row[column]:
+                    row[column] = date.fromisoformat(row[column])
+        self._snapshot = _Snapshot(matrix, rows, metadata["fingerprints"])
+        self.refreshed_at = metadata.get("refreshed_at")
+        return True
+
+    def _save(self, matrix: np.ndarray, rows: list[dict[str, Any]], fingerprints: list[str], refreshed_at: str):
+        """Write the snapshot files atomically and memory-map the new matrix."""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        matrix_tmp = self._matrix_path.with_suffix(".npy.tmp")
+        metadata_tmp = self._metadata_path.with_suffix(".json.tmp")
+        with open(matrix_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        with open(metadata_tmp, "w", encoding="utf-8") as f:
+            json.dump({"refreshed_at": refreshed_at, "rows": rows, "fingerprints": fingerprints}, f, default=str)
+        os.replace(matrix_tmp, self._matrix_path)
+        os.replace(metadata_tmp, self._metadata_path)
+        return np.load(self._matrix_path, mmap_mode="r")
+
+    def refresh(self) -> dict[str, Any]:
+        """Bring the index up to date with the offers table, fetching only new and changed offers."""
+        with self._refresh_lock:
+            if self._snapshot is None:
+                self.load()
+            return self._refresh()
+
+    def _refresh(self) -> dict[str, Any]:
+        snapshot = self._snapshot or _Snapshot.empty()
+        known = dict(zip((row["id"] for row in snapshot.rows), snapshot.fingerprints, strict=True))
+
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT now()::text")
+                refreshed_at = cur.fetchone()[0]
+                cur.execute(
+                    f"SELECT id, coalesce(fingerprint, '') FROM {self.table_name} WHERE embedding IS NOT NULL"
+                )
+                current = dict(cur.fetchall())
+                changed_ids = [
+                    offer_id for offer_id, fingerprint in current.items() if known.get(offer_id) != fingerprint
+                ]
+                fetched = []
+                if changed_ids:
+                    cur.execute(
+                        f"SELECT {', '.join(RESULT_COLUMNS)}, coalesce(fingerprint, ''), embedding::real[] "
+                        f"FROM {self.table_name} WHERE id = ANY(%s) AND embedding IS NOT NULL",
+                        (changed_ids,)
+                    )
+                    fetched = cur.fetchall()
+
+        removed = len(known.keys() - current.keys())
+        if self._snapshot is not None and not fetched and not removed:
+            self.refreshed_at = refreshed_at
+            return {"added": 0, "updated": 0, "removed": 0, "rows": len(snapshot.rows)}
+
+        keep = [
+            position for position, row in enumerate(snapshot.rows)
+            if current.get(row["id"]) == snapshot.fingerprints[position]
+        ]
+        new_rows = [dict(zip(RESULT_COLUMNS, row[:len(RESULT_COLUMNS)], strict=True)) for row in fetched]
+        new_matrix = np.array([row[-1] for row in fetched], dtype=np.float32).reshape(len(fetched), -1)
+        if new_matrix.size:
+            norms = np.linalg.norm(new_matrix, axis=1, keepdims=True)
+            new_matrix /= np.where(norms == 0, 1, norms)
+
+        kept_matrix = np.asarray(snapshot.matrix[keep]) if keep else None
+        if kept_matrix is not None and new_matrix.size and kept_matrix.shape[1] != new_matrix.shape[1]:
+            # The embedding model changed: nothing stored is comparable any more, fetch everything again
+            logging.warning("Memory index dimension changed, rebuilding from scratch")
+            self._snapshot = _Snapshot.empty()
+            return self._refresh()
+        parts = [m for m in (kept_matrix, new_matrix if new_matrix.size else None) if m is not None]
+        matrix = np.vstack(parts) if parts else np.empty((0, 0), dtype=np.float32)
+        rows = [snapshot.rows[position] for position in keep] + new_rows
+        fingerprints = [snapshot.fingerprints[position] for position in keep] + [row[-2] for row in fetched]
+
+        # Keep rows ordered by id, so results don't depend on the refresh history
+        order = np.argsort([row["id"] for row in rows], kind="stable")
+        matrix = matrix[order] if len(rows) else matrix
+        rows = [rows[i] for i in order]
+        fingerprints = [fingerprints[i] for i in order]
+
+        mapped = self._save(matrix, rows, fingerprints, refreshed_at)
+        self._snapshot = _Snapshot(mapped, rows, fingerprints)
+        self.refreshed_at = refreshed_at
+
+        updated = sum(1 for row in new_rows if row["id"] in known)
+        return {"added": len(new_rows) - updated, "updated": updated, "removed": removed, "rows": len(rows)}
+
+    def search(
+        self,
+        query_embedding: list[float],
+        k: int,
+        offset: int = 0,
+        include_filters: dict[str, list] | None = None,
+        exclude_filters: dict[str, list] | None = None,
+        after: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Exact cosine top-k, returning rows shaped like DataManager.similarity_search_cosine."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Memory index is not loaded")
+        if not snapshot.rows or k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape[0] != snapshot.matrix.shape[1]:
+            raise ValueError(f"Query dimension {query.shape[0]} != index dimension {snapshot.matrix.shape[1]}")
+        norm = np.linalg.norm(query)
+        distances = 1.0 - (snapshot.matrix @ (query / norm if norm else query)).astype(np.float64)
+
+        mask = np.ones(len(snapshot.rows), dtype=bool)
+        for filters, include in ((include_filters, True), (exclude_filters, False)):
+            for column, values in (filters or {}).items():
+                mask &= snapshot.mask(column, values, include)
+        if after:
+            value = float(after["value"])
+            mask &= (distances > value) | ((distances == value) & (snapshot.ids > after["id"]))
+
+        candidates = np.flatnonzero(mask)
+        needed = offset + k
+        if len(candidates) > needed:
+            # Keep every row tied with the k-th distance, so the id tie-break matches the SQL order
+            kth = np.partition(distances[candidates], needed - 1)[needed - 1]
+            candidates = candidates[distances[candidates] <= kth]
+        ordered = candidates[np.lexsort((snapshot.ids[candidates], distances[candidates]))][offset:needed]
+
+        self.searches += 1
+        return [{**snapshot.rows[i], "distance": float(distances[i])} for i in ordered]
+
+    def stats(self) -> dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "rows": len(snapshot.rows) if snapshot else 0,
+            "dimensions": int(snapshot.matrix.shape[1]) if snapshot and snapshot.rows else 0,
+            "snapshot_path": str(self.snapshot_path),
+            "refreshed_at": self.refreshed_at,
+            "searches": self.searches,
+        }
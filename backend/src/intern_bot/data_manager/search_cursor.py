@@ -0,0 +1,37 @@
+import base64
+import hashlib
+import json
+
+from typing import Any
+
+
+def cursor_key(*parts: Any) -> str:
+    """Short hash of the search (mode, query, filters) a cursor belongs to."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(key: str, value: Any, offer_id: int, shown: int, phase: str | None = None) -> str:
+    """
+    Opaque cursor pointing after the last returned offer: its ranking value
+    (distance or fused score, kept as an exact string), its id as a tie-break,
+    how many offers were shown so far and, for hybrid search, the ranking phase it is in.
+    """
+    payload = {"k": key, "v": str(value), "id": offer_id, "n": shown}
+    if phase:
+        payload["p"] = phase
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position = {
+            "value": payload["v"], "id": int(payload["id"]), "shown": int(payload["n"]), "phase": payload.get("p")
+        }
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if payload.get("k") != key:
+        raise ValueError("The cursor belongs to a different search, start again without a cursor")
+    return position
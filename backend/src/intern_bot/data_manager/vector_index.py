@@ -0,0 +1,331 @@
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+from typing import Any, Callable, ContextManager
+
+VECTOR_INDEX_TYPES = ("ivfflat", "hnsw", "none")
+
+
+class VectorIndex:
+    """
+    Lifecycle of the ANN index on the embedding column. The index type comes
+    from config and its build parameters are derived from the row count
+    (IVFFlat `lists`, HNSW `m` / `ef_construction`); tables smaller than
+    `min_rows` are searched exactly without an index. The built index is
+    recorded in a state table and rebuilt concurrently once the rows inserted
+    and deleted since the build exceed `rebuild_drift` of the table, or the
+    desired parameters changed. Query-time `ivfflat.probes` / `hnsw.ef_search`
+    are derived from the recorded state and grow with the number of rows a
+    query needs (see search_settings), so deep cursor pages aren't cut short.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        connection_factory: Callable[[], ContextManager[Any]],
+        index_type: str = "ivfflat",
+        min_rows: int = 1000,
+        rebuild_drift: float = 0.3,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        hnsw_ef_search: int = 40,
+        state_table_name: str = "vector_index_state",
+        probes_neighbours: int = 10,
+    ):
+        if index_type not in VECTOR_INDEX_TYPES:
+            raise ValueError(f"Unknown vector index type: {index_type}")
+        self.table_name = table_name
+        self.connection_factory = connection_factory
+        self.index_type = index_type
+        self.min_rows = min_rows
+        self.rebuild_drift = rebuild_drift
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.state_table_name = state_table_name
+        self.probes_neighbours = probes_neighbours
+        self.index_name = f"{table_name}_embedding_idx"
+
+        self._state: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    def create_table(self, cur):
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.state_table_name} (
+                table_name TEXT PRIMARY KEY,
+                index_type TEXT NOT NULL,
+                params JSONB NOT NULL,
+                rows_at_build BIGINT NOT NULL,
+                changes_at_build BIGINT NOT NULL,
+                built_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+
+    def derive_params(self, rows: int) -> tuple[str, dict[str, int]]:
+        """Index type and parameters for a table of `rows` embeddings."""
+        if self.index_type == "none" or rows < self.min_rows:
+            return "none", {}
+        if self.index_type == "ivfflat":
+            # pgvector guidance: rows / 1000 lists up to 1M rows, sqrt(rows) above; probes ~ sqrt(lists)
+            lists = max(1, rows // 1000) if rows <= 1_000_000 else int(math.sqrt(rows))
+            return "ivfflat", {"lists": lists, "probes": max(1, round(math.sqrt(lists)))}
+        return "hnsw", {
+            "m": self.hnsw_m,
+            "ef_construction": self.hnsw_ef_construction,
+            "ef_search": self.hnsw_ef_search,
+        }
+
+    def _table_stats(self, cur) -> tuple[int, int]:
+        """Embedded row count and the cumulative inserted + deleted row counter of the table."""
+        cur.execute(f"SELECT count(*) FROM {self.table_name} WHERE embedding IS NOT NULL")
+        rows = cur.fetchone()[0]
+        cur.execute(
+            "SELECT coalesce(n_tup_ins + n_tup_del, 0) FROM pg_stat_user_tables WHERE relname = %s",
+            (self.table_name,)
+        )
+        changes = cur.fetchone()
+        return rows, changes[0] if changes else 0
+
+    def _embedding_indexes(self, cur) -> list[str]:
+        cur.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexdef ~* 'USING (ivfflat|hnsw)'",
+            (self.table_name,)
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    def _load_state(self, cur) -> dict[str, Any] | None:
+        cur.execute(
+            f"SELECT index_type, params, rows_at_build, changes_at_build, built_at "
+            f"FROM {self.state_table_name} WHERE table_name = %s",
+            (self.table_name,)
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        params = row[1] if isinstance(row[1], dict) else json.loads(row[1])
+        state = {
+            "index_type": row[0],
+            "params": params,
+            "rows_at_build": row[2],
+            "changes_at_build": row[3],
+            "built_at": row[4].isoformat() if row[4] else None,
+        }
+        with self._lock:
+            self._state = state
+        return state
+
+    def load_state(self) -> dict[str, Any] | None:
+        """Refresh the in-process copy of the recorded index state used at query time."""
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    return self._load_state(cur)
+        except Exception as e:
+            print(f"Error loading vector index state: {e}")
+            return None
+
+    def _rebuild_reason(self, state: dict | None, index_type: str, params: dict, rows: int, changes: int,
+                        indexes: list[str]) -> str | None:
+        if state is None:
+            return "no recorded index state"
+        if state["index_type"] != index_type:
+            return f"index type changed from {state['index_type']} to {index_type}"
+        if index_type == "none":
+            return "stale ANN index on a table searched exactly" if indexes else None
+        if self.index_name not in indexes:
+            return "index is missing"
+        if index_type == "ivfflat" and not 0.5 <= params["lists"] / state["params"].get("lists", 1) <= 2:
+            return f"lists should be {params['lists']} instead of {state['params'].get('lists')}"
+        if index_type == "hnsw" and any(state["params"].get(k) != params[k] for k in ("m", "ef_construction")):
+            return "HNSW build parameters changed"
+        churn = changes - state["changes_at_build"]
+        if churn < 0:
+            return "table statistics were reset"
+        # Statistics counters are flushed lazily, the row count difference is a lower bound
+        churn = max(churn, abs(rows - state["rows_at_build"]))
+        if churn > self.rebuild_drift * max(state["rows_at_build"], 1):
+            return f"{churn} rows inserted or deleted since the build of {state['rows_at_build']} rows"
+        return None
+
+    def maintain(self, force: bool = False) -> dict[str, Any]:
+        """Rebuild the index if it drifted from the data or the config; returns what was done and why."""
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    rows, changes = self._table_stats(cur)
+                    indexes = self._embedding_indexes(cur)
+                    state = self._load_state(cur)
+                conn.commit()
+
+                index_type, params = self.derive_params(rows)
+                reason = "forced" if force else self._rebuild_reason(state, index_type, params, rows, changes, indexes)
+                if reason is None:
+                    return {"action": "kept", "index_type": index_type, "rows": rows}
+
+                logging.info(f"Rebuilding vector index as {index_type} {params}: {reason}")
+                start = time.perf_counter()
+                self._build(conn, index_type, params, indexes)
+                self._save_state(conn, index_type, params, rows, changes)
+                elapsed = time.perf_counter() - start
+                logging.info(f"Vector index rebuilt in {elapsed:.1f}s")
+                return {
+                    "action": "rebuilt", "reason": reason, "index_type": index_type,
+                    "params": params, "rows": rows, "seconds": elapsed,
+                }
+        except Exception as e:
+            print(f"Error maintaining vector index: {e}")
+            return {"action": "failed", "error": str(e)}
+
+    def _build(self, conn, index_type: str, params: dict, indexes: list[str]):
+        """Build the new index next to the old one without blocking writes, then swap them."""
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                temporary_name = f"{self.index_name}_new"
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {temporary_name}")
+                if index_type != "none":
+                    if index_type == "ivfflat":
+                        options = f"lists = {params['lists']}"
+                    else:
+                        options = f"m = {params['m']}, ef_construction = {params['ef_construction']}"
+                    try:
+                        cur.execute(f"""
+                            CREATE INDEX CONCURRENTLY {temporary_name}
+                            ON {self.table_name}
+                            USING {index_type} (embedding vector_cosine_ops)
+                            WITH ({options})
+                        """)
+                    except Exception:
+                        # A failed concurrent build leaves an invalid index behind
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {temporary_name}")
+                        raise
+                for index in indexes:
+                    if index == temporary_name:
+                        continue
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+                if index_type != "none":
+                    cur.execute(f"ALTER INDEX {temporary_name} RENAME TO {self.index_name}")
+                cur.execute(f"ANALYZE {self.table_name}")
+        finally:
+            conn.autocommit = False
+
+    def _save_state(self, conn, index_type: str, params: dict, rows: int, changes: int):
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO {self.state_table_name}
+                    (table_name, index_type, params, rows_at_build, changes_at_build, built_at)
+                VALUES (%s, %s, %s, %s, %s, now())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    index_type = EXCLUDED.index_type,
+                    params = EXCLUDED.params,
+                    rows_at_build = EXCLUDED.rows_at_build,
+                    changes_at_build = EXCLUDED.changes_at_build,
+                    built_at = EXCLUDED.built_at
+            """, (self.table_name, index_type, json.dumps(params), rows, changes))
+            conn.commit()
+            self._load_state(cur)
+
+    def search_settings(self, neighbours: int) -> tuple[str, list] | None:
+        """
+        `SELECT set_config(...)` setting probes / ef_search for the current
+        transaction when `neighbours` nearest rows are needed, or None.
+        An IVFFlat scan only returns rows of the probed lists, so the recorded
+        probes (sized for `probes_neighbours` rows) are multiplied by
+        ceil(neighbours / probes_neighbours); once that reaches half of the
+        lists every list is probed, which makes deep pages an exact search.
+        HNSW's ef_search is raised to `neighbours`, up to pgvector's 1000.
+
+        Because the settings depend on the depth, the approximate ranking does
+        too: a deeper semantic page may reach rows an earlier, lower-probe page
+        missed. Those rank before its cursor, so the keyset predicate excludes
+        them and they are skipped. Rankings that must stay the same on every
+        page (the fused hybrid pool) use a neighbour count that doesn't depend
+        on the depth; see DataManager.hybrid_search.
+        """
+        with self._lock:
+            state = self._state
+        if state is None:
+            return None
+        if state["index_type"] == "ivfflat":
+            lists = state["params"]["lists"]
+            probes = state["params"]["probes"] * math.ceil(max(neighbours, 1) / self.probes_neighbours)
+            if probes * 2 >= lists:
+                probes = lists
+            return "SELECT set_config('ivfflat.probes', %s, true)", [str(probes)]
+        if state["index_type"] == "hnsw":
+            # ef_search bounds how many rows an HNSW scan can return
+            ef_search = min(max(state["params"].get("ef_search", self.hnsw_ef_search), neighbours), 1000)
+            return "SELECT set_config('hnsw.ef_search', %s, true)", [str(ef_search)]
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"configured_type": self.index_type, "min_rows": self.min_rows, "state": self._state}
+
+    def report(self, queries: int = 20, k: int = 10, seed: int = 0) -> dict[str, Any]:
+        """
+        Recall@k and latency of the approximate search for a range of probes /
+        ef_search values, against exact search, using stored embeddings as queries.
+        """
+        with self._lock:
+            state = self._state
+        index_type = state["index_type"] if state else "none"
+        if index_type == "ivfflat":
+            lists = state["params"]["lists"]
+            setting = "ivfflat.probes"
+            values = sorted(
+                {min(2 ** i, lists) for i in range(int(math.log2(lists)) + 2)} | {state["params"]["probes"]}
+            )
+        elif index_type == "hnsw":
+            setting = "hnsw.ef_search"
+            values = sorted({10, 20, 40, 80, 160, 320, state["params"].get("ef_search", self.hnsw_ef_search)})
+        else:
+            setting, values = None, []
+
+        search_sql = f"SELECT id FROM {self.table_name} ORDER BY embedding <=> %s::vector LIMIT %s"
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT setseed(%s)", (random.Random(seed).uniform(-1, 1),))
+                cur.execute(
+                    f"SELECT embedding::text FROM {self.table_name} WHERE embedding IS NOT NULL "
+                    f"ORDER BY random() LIMIT %s",
+                    (queries,)
+                )
+                vectors = [row[0] for row in cur.fetchall()]
+
+                def run(settings: list[tuple[str, str]]) -> tuple[list[list[int]], float]:
+                    results, elapsed = [], 0.0
+                    for name, value in settings:
+                        cur.execute("SELECT set_config(%s, %s, true)", (name, value))
+                    for vector in vectors:
+                        start = time.perf_counter()
+                        cur.execute(search_sql, (vector, k))
+                        results.append([row[0] for row in cur.fetchall()])
+                        elapsed += time.perf_counter() - start
+                    return results, elapsed * 1000 / max(len(vectors), 1)
+
+                exact, exact_ms = run([("enable_indexscan", "off"), ("enable_bitmapscan", "off")])
+                conn.rollback()
+
+                rows = []
+                for value in values:
+                    approximate, approximate_ms = run([("enable_indexscan", "on"), (setting, str(value))])
+                    conn.rollback()
+                    recall = sum(
+                        len(set(found) & set(expected)) / max(len(expected), 1)
+                        for found, expected in zip(approximate, exact, strict=True)
+                    ) / max(len(exact), 1)
+                    rows.append({setting: value, "recall": round(recall, 4), "avg_ms": round(approximate_ms, 3)})
+
+        return {
+            "index_type": index_type,
+            "params": state["params"] if state else {},
+            "queries": len(vectors),
+            "k": k,
+            "exact_avg_ms": round(exact_ms, 3),
+            "results": rows,
+        }
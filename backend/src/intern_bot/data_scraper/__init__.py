@@ -1 +1,5 @@
-from intern_bot.data_scraper.data_scraper import DataScraper
\ No newline at end of file
+from intern_bot.data_scraper.data_scraper import DataScraper
+from intern_bot.data_scraper.fetcher import Fetcher, ScraperRuntime
+from intern_bot.data_scraper.parsers import ParsePool
+
+__all__ = ['DataScraper', 'Fetcher', 'ScraperRuntime', 'ParsePool']
\ No newline at end of file
@@ -1,9 +1,9 @@
 import logging
+import asyncio
 from typing import Type, Literal
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from intern_bot.data_scraper.scrapers import BaseScraper,PWRScraper, NokiaScraper, SiiScraper
+from intern_bot.data_scraper.fetcher import Fetcher, run_sync
 
 # Setup logger
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -12,6 +12,11 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 class DataScraper:
     _scrappers: dict[str] = {'PWR': PWRScraper, 'Nokia': NokiaScraper, 'Sii': SiiScraper}
 
+    @classmethod
+    def sources(cls) -> list[str]:
+        """Names of the supported sources, as accepted by the scrape_* methods."""
+        return list(cls._scrappers)
+
     @classmethod
     def _get_scraper(cls, source: str) -> Type[BaseScraper]:
         if source not in cls._scrappers:
@@ -25,40 +30,44 @@ class DataScraper:
         scraper = cls._get_scraper(scraper_name)
         return scraper.scrape_offers()
     
+    @classmethod
+    async def ascrape_offers(
+        cls, fetcher: Fetcher, scraper_name: Literal['PWR', 'Nokia', 'Sii']
+    ) -> list[str]:
+        scraper = cls._get_scraper(scraper_name)
+        return await scraper.ascrape_offers(fetcher)
+
     @classmethod
     def scrape_offer_details(cls, scraper_name: Literal['PWR', 'Nokia', 'Sii'], offer: str
-                              ) -> dict[str, str]:
+                              ) -> dict[str, str] | None:
+        return run_sync(cls._get_scraper(scraper_name).__name__, cls.ascrape_offer_details, scraper_name, offer)
+
+    @classmethod
+    async def ascrape_offer_details(cls, fetcher: Fetcher, scraper_name: Literal['PWR', 'Nokia', 'Sii'], offer: str
+                                    ) -> dict[str, str] | None:
         scraper = cls._get_scraper(scraper_name)
         logging.info(f"Scraping details for: {offer}")
         try:
-            detailed_offer = scraper.scrape_offer_details(offer)
+            detailed_offer = await scraper.ascrape_offer_details(fetcher, offer)
             logging.info(f"Succesfully scraped offer details: {offer}")
+            return detailed_offer
         except Exception as e:
             logging.warning(f"Error fetching details for {scraper_name} job: {offer}: {e}")
-        return detailed_offer
-    
+            return None
+
     @classmethod
     def scrape_offers_details(cls, scraper_name: Literal['PWR', 'Nokia', 'Sii'], offers: list[str]
                               ) -> list[dict[str, str]]:
-        detailed_offers = []
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_offer = {
-                executor.submit(cls.scrape_offer_details, scraper_name, offer): offer 
-                for offer in offers
-            }
-            
-            for future in as_completed(future_to_offer):
-                offer = future_to_offer[future]
-                try:
-                    detailed_offer = future.result()
-                    if detailed_offer:
-                        detailed_offers.append(detailed_offer)
-                except Exception as e:
-                    logging.warning(f"Error processing offer {offer}: {e}")
-            
-        logging.info(f"Finished scraping {scraper_name}. Total offers with details: {len(detailed_offers)}")
-        return detailed_offers
-    
+        return run_sync(cls._get_scraper(scraper_name).__name__, cls.ascrape_offers_details, scraper_name, offers)
 
+    @classmethod
+    async def ascrape_offers_details(cls, fetcher: Fetcher, scraper_name: Literal['PWR', 'Nokia', 'Sii'],
+                                     offers: list[str]) -> list[dict[str, str]]:
+        """Fetch all details concurrently; the fetcher's per-host limits bound the request rate."""
+        results = await asyncio.gather(
+            *(cls.ascrape_offer_details(fetcher, scraper_name, offer) for offer in offers)
+        )
+        detailed_offers = [offer for offer in results if offer]
 
+        logging.info(f"Finished scraping {scraper_name}. Total offers with details: {len(detailed_offers)}")
+        return detailed_offers
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import threading
+import time
+
+from typing import Any, Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from intern_bot.settings import Settings
+
+settings = Settings()
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """Politeness budget for one host: a request rate and a cap on requests in flight."""
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+
+class Fetcher:
+    """
+    Async HTTP fetcher used by the scrapers. It keeps one pooled keep-alive
+    client, and every request goes through the limiter of its host, so listing
+    and detail pages can be fetched concurrently without exceeding the per-host
+    rate and concurrency limits. Connection reuse is counted through the httpx
+    trace extension.
+    """
+
+    def __init__(
+        self,
+        rate_per_host: float | None = None,
+        burst_per_host: int | None = None,
+        concurrency_per_host: int | None = None,
+        pool_size: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.rate_per_host = rate_per_host or settings.SCRAPER_RATE_PER_HOST
+        self.burst_per_host = burst_per_host or settings.SCRAPER_BURST_PER_HOST
+        self.concurrency_per_host = concurrency_per_host or settings.SCRAPER_CONCURRENCY_PER_HOST
+        self.pool_size = pool_size or settings.SCRAPER_POOL_SIZE
+        self.connect_timeout = connect_timeout or settings.SCRAPER_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or settings.SCRAPER_READ_TIMEOUT
+        self.transport = transport
+
+        self._limiters: dict[str, HostLimiter] = {}
+        self._client: httpx.AsyncClient | None = None
+
+        self.requests = 0
+        self.connections_opened = 0
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # httpx negotiates gzip/deflate itself and brotli when the `brotli` package is installed
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=settings.SCRAPER_KEEPALIVE_EXPIRY,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(self.rate_per_host, self.burst_per_host, self.concurrency_per_host)
+        return self._limiters[host]
+
+    async def _trace(self, event_name: str, info: dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    async def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None
+    ) -> httpx.Response:
+        limiter = self._limiter(url)
+        async with limiter.semaphore:
+            await limiter.bucket.acquire()
+            self.requests += 1
+            return await self._get_client().get(
+                url, headers=headers, params=params, extensions={"trace": self._trace}
+            )
+
+    def stats(self) -> dict[str, int]:
+        return {"requests": self.requests, "connections_opened": self.connections_opened}
+
+
+class ScraperRuntime:
+    """
+    Background event loop shared by the synchronous scraper shims. It owns one
+    long-lived Fetcher per scraper, so connections and politeness limits
+    survive across scrape runs instead of being rebuilt for every call.
+    """
+    _loop: asyncio.AbstractEventLoop | None = None
+    _thread: threading.Thread | None = None
+    _lock = threading.Lock()
+    _fetchers: dict[str, Fetcher] = {}
+    _fetcher_options: dict[str, Any] = {}
+
+    @classmethod
+    def configure(cls, **fetcher_options: Any):
+        """Set Fetcher options (limits, timeouts, transport) for fetchers created from now on."""
+        cls.shutdown()
+        cls._fetcher_options = fetcher_options
+
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                cls._thread = threading.Thread(target=cls._loop.run_forever, name="scraper-runtime", daemon=True)
+                cls._thread.start()
+            return cls._loop
+
+    @classmethod
+    def get_fetcher(cls, name: str) -> Fetcher:
+        with cls._lock:
+            if name not in cls._fetchers:
+                cls._fetchers[name] = Fetcher(**cls._fetcher_options)
+            return cls._fetchers[name]
+
+    @classmethod
+    def run(cls, coro: Awaitable[T]) -> T:
+        loop = cls._get_loop()
+        if threading.current_thread() is cls._thread:
+            raise RuntimeError("ScraperRuntime.run can't be called from the scraper event loop itself")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            loop, thread, fetchers = cls._loop, cls._thread, list(cls._fetchers.values())
+            cls._loop, cls._thread, cls._fetchers = None, None, {}
+        if loop is None:
+            return
+
+        async def close_all():
+            for fetcher in fetchers:
+                await fetcher.aclose()
+
+        asyncio.run_coroutine_threadsafe(close_all(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def run_sync(fetcher_name: str, scrape: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """
+    Run `scrape(fetcher, *args)` on the shared scraper loop with the long-lived
+    fetcher `fetcher_name`, for synchronous callers. Connection reuse of the run is logged.
+    """
+    fetcher = ScraperRuntime.get_fetcher(fetcher_name)
+
+    async def runner() -> T:
+        before = fetcher.stats()
+        try:
+            return await scrape(fetcher, *args)
+        finally:
+            after = fetcher.stats()
+            requests = after["requests"] - before["requests"]
+            opened = after["connections_opened"] - before["connections_opened"]
+            if requests:
+                reused = max(requests - opened, 0)
+                logging.info(
+                    f"{fetcher_name}: {requests} requests, {opened} new connections, "
+                    f"{reused} reused ({reused / requests:.0%})"
+                )
+
+    return ScraperRuntime.run(runner())
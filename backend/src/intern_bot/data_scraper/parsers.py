@@ -0,0 +1,96 @@
+import asyncio
+import importlib.util
+import logging
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from bs4 import BeautifulSoup
+
+from intern_bot.settings import Settings
+
+settings = Settings()
+
+T = TypeVar("T")
+
+# BeautifulSoup tree builders and the module each one needs
+PARSER_BACKENDS = {
+    "html.parser": None,
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+}
+
+
+def resolve_parser(name: str | None) -> str:
+    """Return `name` if its backend is importable, falling back to the pure-Python html.parser."""
+    name = name or "html.parser"
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser: {name}")
+    module = PARSER_BACKENDS[name]
+    if module is not None and importlib.util.find_spec(module) is None:
+        logging.warning(f"HTML parser '{name}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return name
+
+
+def make_soup(markup: str, parser: str = "html.parser") -> BeautifulSoup:
+    return BeautifulSoup(markup, parser)
+
+
+class ParsePool:
+    """
+    Optional process pool for CPU-heavy parsing. With SCRAPER_PARSE_PROCESSES = 0
+    parsing runs inline on the event loop; otherwise parse functions are sent to
+    worker processes so extraction scales across cores and doesn't hold the GIL
+    of the scraping loop.
+    """
+    _executor: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor | None:
+        if settings.SCRAPER_PARSE_PROCESSES <= 0:
+            return None
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(max_workers=settings.SCRAPER_PARSE_PROCESSES)
+        return cls._executor
+
+    @classmethod
+    async def run(cls, parse: Callable[..., T], *args: Any) -> T:
+        executor = cls._get_executor()
+        if executor is None:
+            return parse(*args)
+        return await asyncio.get_running_loop().run_in_executor(executor, parse, *args)
+
+    @classmethod
+    def shutdown(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(cancel_futures=True)
+            cls._executor = None
+
+
+def compare_parsers(
+    parse: Callable[..., Any],
+    *args: Any,
+    parsers: tuple[str, ...] = ("html.parser", "lxml")
+) -> dict[str, Any]:
+    """
+    Run `parse(*args, parser)` with every given backend and report which
+    extracted fields differ from the html.parser reference output.
+    """
+    outputs = {parser: parse(*args, parser) for parser in parsers}
+    reference = outputs[parsers[0]]
+
+    def as_fields(output: Any) -> dict[str, Any]:
+        return output if isinstance(output, dict) else {"result": output}
+
+    differences = {}
+    for parser, output in outputs.items():
+        fields = as_fields(output)
+        reference_fields = as_fields(reference)
+        differing = sorted(
+            key for key in reference_fields.keys() | fields.keys()
+            if reference_fields.get(key) != fields.get(key)
+        )
+        if differing:
+            differences[parser] = differing
+    return differences
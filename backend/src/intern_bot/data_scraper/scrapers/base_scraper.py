@@ -1,13 +1,33 @@
 from abc import ABC, abstractmethod
 
+from intern_bot.data_scraper.fetcher import Fetcher, run_sync
+from intern_bot.data_scraper.parsers import resolve_parser, settings
+
+
 class BaseScraper(ABC):
+    SOURCE: str
+
+    @classmethod
+    def html_parser(cls) -> str:
+        """HTML parser backend configured for this source in SCRAPER_HTML_PARSERS."""
+        return resolve_parser(settings.SCRAPER_HTML_PARSERS.get(cls.SOURCE))
 
-    @staticmethod
+    @classmethod
     @abstractmethod
-    def scrape_offers() -> list[str]:
+    async def ascrape_offers(cls, fetcher: Fetcher) -> list[str]:
         pass
 
-    @staticmethod
+    @classmethod
     @abstractmethod
-    def scrape_offer_details(offer: str) -> list[dict[str,str]]:
-        pass
\ No newline at end of file
+    async def ascrape_offer_details(cls, fetcher: Fetcher, offer: str) -> dict[str, str]:
+        pass
+
+    @classmethod
+    def scrape_offers(cls) -> list[str]:
+        """Synchronous shim around `ascrape_offers`."""
+        return run_sync(cls.__name__, cls.ascrape_offers)
+
+    @classmethod
+    def scrape_offer_details(cls, offer: str) -> dict[str, str]:
+        """Synchronous shim around `ascrape_offer_details`."""
+        return run_sync(cls.__name__, cls.ascrape_offer_details, offer)
@@ -1,12 +1,15 @@
-import requests
+import asyncio
+import json
 from datetime import datetime
 import re
-from bs4 import BeautifulSoup
 
 from intern_bot.data_scraper.scrapers.base_scraper import BaseScraper
+from intern_bot.data_scraper.fetcher import Fetcher
+from intern_bot.data_scraper.parsers import ParsePool, make_soup, settings
 
 
 class NokiaScraper(BaseScraper):
+    SOURCE = "Nokia"
     BASE_URL = "https://fa-evmr-saasfaprod1.fa.ocs.oraclecloud.com/hcmRestApi/resources/latest/recruitingCEJobRequisitions"
     JOB_DETAIL_BASE_URL = "https://fa-evmr-saasfaprod1.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/job/{id}"
     HEADERS = {
@@ -21,12 +24,7 @@ class NokiaScraper(BaseScraper):
     )
     
     @staticmethod
-    def scrape_offers() -> list[str]:
-        """Fetch basic info: job ID and link."""
-        limit = 200
-        offset = 0
-        results = []
-
+    def _listing_params(limit: int, offset: int) -> dict[str, str]:
         finder_value = (
             f"findReqs;siteNumber=CX_1,"
             f"facetsList=LOCATIONS;WORK_LOCATIONS;WORKPLACE_TYPES;TITLES;CATEGORIES;ORGANIZATIONS;POSTING_DATES;FLEX_FIELDS,"
@@ -34,38 +32,70 @@ class NokiaScraper(BaseScraper):
             f"locationId=300000000471967,selectedTitlesFacet=TRA,sortBy=POSTING_DATES_DESC"
         )
 
-        params = {
+        return {
             "onlyData": "true",
             "expand": "requisitionList.workLocation,requisitionList.otherWorkLocations,requisitionList.secondaryLocations,flexFieldsFacet.values,requisitionList.requisitionFlexFields",
             "finder": finder_value
         }
 
-        resp = requests.get(NokiaScraper.BASE_URL, headers=NokiaScraper.HEADERS, params=params)
+    @classmethod
+    async def _fetch_listing_page(cls, fetcher: Fetcher, limit: int, offset: int) -> dict:
+        resp = await fetcher.get(cls.BASE_URL, headers=cls.HEADERS, params=cls._listing_params(limit, offset))
         resp.raise_for_status()
-        data = resp.json()
-        items = data.get("items", [])
-        if not items or not items[0].get("requisitionList"):
-            return results
-
-
-        for job in items[0]["requisitionList"]:
-            title = job['Title'].lower()
-            if (('working student' in title or 'summer trainee' in title) and job['PrimaryLocation'] == 'Poland'):
-                job_id = str(job["Id"])
-                results.append(NokiaScraper.JOB_DETAIL_BASE_URL.format(id=job_id))
+        items = resp.json().get("items", [])
+        return items[0] if items else {}
+
+    @classmethod
+    async def ascrape_offers(cls, fetcher: Fetcher) -> list[str]:
+        """
+        Fetch basic info: job ID and link. Pages through the requisitions search,
+        prefetching the next page while the current one is parsed.
+        """
+        limit = settings.NOKIA_PAGE_SIZE
+        offset = 0
+        results = []
 
-            offset += limit
+        next_page = asyncio.create_task(cls._fetch_listing_page(fetcher, limit, offset))
+        try:
+            for _ in range(settings.NOKIA_MAX_PAGES):
+                page = await next_page
+                next_page = None
+
+                requisitions = page.get("requisitionList") or []
+                total = page.get("TotalJobsCount")
+                offset += limit
+
+                has_more = len(requisitions) == limit and (total is None or offset < total)
+                if has_more:
+                    next_page = asyncio.create_task(cls._fetch_listing_page(fetcher, limit, offset))
+
+                for job in requisitions:
+                    title = job['Title'].lower()
+                    is_internship = 'working student' in title or 'summer trainee' in title
+                    if is_internship and job['PrimaryLocation'] == 'Poland':
+                        job_id = str(job["Id"])
+                        results.append(cls.JOB_DETAIL_BASE_URL.format(id=job_id))
+
+                if next_page is None:
+                    break
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
         return results
 
-    @staticmethod
-    def scrape_offer_details(offer: str) -> list[dict[str, str]]:
+    @classmethod
+    async def ascrape_offer_details(cls, fetcher: Fetcher, offer: str) -> dict[str, str]:
         job_id = NokiaScraper._extract_job_id(offer)
         url = NokiaScraper.DETAILS_API.format(id=job_id)
 
-        resp = requests.get(url, headers=NokiaScraper.HEADERS)
+        resp = await fetcher.get(url, headers=NokiaScraper.HEADERS)
         resp.raise_for_status()
-        data = resp.json()
+        return await ParsePool.run(cls.parse_offer_details, resp.text, offer, cls.html_parser())
+
+    @staticmethod
+    def parse_offer_details(payload: str, offer: str, parser: str = "html.parser") -> dict[str, str]:
+        data = json.loads(payload)
 
         items = data.get("items", [])
         if not items:
@@ -86,16 +116,18 @@ class NokiaScraper(BaseScraper):
         if job.get("StudyLevel"):
             extras.append(f"Study level: {job['StudyLevel']}")
         if job.get("ExternalQualificationsStr"):
-            extras.append("Qualifications:\n" + NokiaScraper._html_to_text(job["ExternalQualificationsStr"]))
+            extras.append("Qualifications:\n" + NokiaScraper._html_to_text(job["ExternalQualificationsStr"], parser))
         if job.get("ExternalResponsibilitiesStr"):
-            extras.append("Responsibilities:\n" + NokiaScraper._html_to_text(job["ExternalResponsibilitiesStr"]))
+            responsibilities = NokiaScraper._html_to_text(job["ExternalResponsibilitiesStr"], parser)
+            extras.append("Responsibilities:\n" + responsibilities)
         if job.get("OrganizationDescriptionStr"):
-            extras.append(NokiaScraper._html_to_text(job["OrganizationDescriptionStr"]))
+            extras.append(NokiaScraper._html_to_text(job["OrganizationDescriptionStr"], parser))
         if job.get("requisitionFlexFields"):
             for field in job["requisitionFlexFields"]:
                 extras.append(f"{field.get('Prompt')}: {field.get('Value')}")
 
-        description = NokiaScraper._html_to_text(job.get("ExternalDescriptionStr", "")) + "\n\n" + "\n\n".join(extras)
+        description = NokiaScraper._html_to_text(job.get("ExternalDescriptionStr", ""), parser)
+        description += "\n\n" + "\n\n".join(extras)
 
         return {
             "title": title,
@@ -117,10 +149,10 @@ class NokiaScraper(BaseScraper):
         raise ValueError(f"Job ID not found in {url}")
     
     @staticmethod
-    def _html_to_text(html: str) -> str:
+    def _html_to_text(html: str, parser: str = "html.parser") -> str:
         if not html:
             return ""
-        return BeautifulSoup(html, "html.parser").get_text(separator="\n").strip()
+        return make_soup(html, parser).get_text(separator="\n").strip()
 
     @staticmethod
     def _parse_date(date_str: str) -> datetime | None:
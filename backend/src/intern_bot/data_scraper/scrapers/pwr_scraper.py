@@ -1,12 +1,13 @@
-import requests
-import time
-from bs4 import BeautifulSoup
+import asyncio
 
 from intern_bot.data_scraper.utils.pwr_data_processing import parse_polish_date, LocationEnum, ContractTypeEnum
 from intern_bot.data_scraper.scrapers.base_scraper import BaseScraper
+from intern_bot.data_scraper.fetcher import Fetcher
+from intern_bot.data_scraper.parsers import ParsePool, make_soup
 
 
 class PWRScraper(BaseScraper):
+    SOURCE = "PWR"
     BASE_URL = "https://biurokarier.pwr.edu.pl/oferty-pracy"
     HEADERS = {
         "User-Agent": "Mozilla/5.0",
@@ -14,38 +15,50 @@ class PWRScraper(BaseScraper):
         "Connection": "keep-alive"
     }
 
-    @staticmethod
-    def scrape_offers() -> list[str]:
-        """Scrape list of links and ids from job listing pages."""
-        results = []
-        for page in range(1, 15):
-            url = f"{PWRScraper.BASE_URL}/page/{page}/"
-            try:
-                resp = requests.get(url, headers=PWRScraper.HEADERS)
+    LISTING_PAGES = range(1, 15)
 
-                resp.raise_for_status()
+    @classmethod
+    async def _scrape_listing_page(cls, fetcher: Fetcher, page: int) -> list[str]:
+        url = f"{cls.BASE_URL}/page/{page}/"
+        try:
+            resp = await fetcher.get(url, headers=cls.HEADERS)
 
-                soup = BeautifulSoup(resp.text, "html.parser")
-                articles = soup.find_all("article", class_="noo_job")
+            resp.raise_for_status()
 
-                for art in articles:
-                    link_tag = art.select_one("h3.loop-item-title a")
-                    if link_tag and "href" in link_tag.attrs:
-                        link = link_tag["href"]
-                        results.append(link)
+            return await ParsePool.run(cls.parse_listing_page, resp.text, cls.html_parser())
 
-            except Exception as e:
-                raise Exception(f"Failed to fetch PWR links from page {page}: {e}")
-            time.sleep(0.5)
+        except Exception as e:
+            raise Exception(f"Failed to fetch PWR links from page {page}: {e}")
 
+    @staticmethod
+    def parse_listing_page(markup: str, parser: str = "html.parser") -> list[str]:
+        soup = make_soup(markup, parser)
+        articles = soup.find_all("article", class_="noo_job")
+
+        results = []
+        for art in articles:
+            link_tag = art.select_one("h3.loop-item-title a")
+            if link_tag and "href" in link_tag.attrs:
+                link = link_tag["href"]
+                results.append(link)
         return results
 
-    @staticmethod
-    def scrape_offer_details(offer: dict[str, str]) -> list[dict[str,str]]:
+    @classmethod
+    async def ascrape_offers(cls, fetcher: Fetcher) -> list[str]:
+        """Scrape list of links and ids from job listing pages."""
+        pages = await asyncio.gather(*(cls._scrape_listing_page(fetcher, page) for page in cls.LISTING_PAGES))
+        return [link for page_links in pages for link in page_links]
+
+    @classmethod
+    async def ascrape_offer_details(cls, fetcher: Fetcher, offer: str) -> dict[str, str]:
         """Scrape detailed info for each offer given link list."""
-        resp = requests.get(offer, headers=PWRScraper.HEADERS)
+        resp = await fetcher.get(offer, headers=cls.HEADERS)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        return await ParsePool.run(cls.parse_offer_details, resp.text, offer, cls.html_parser())
+
+    @staticmethod
+    def parse_offer_details(markup: str, offer: str, parser: str = "html.parser") -> dict[str, str]:
+        soup = make_soup(markup, parser)
 
         title_el = soup.select_one("h1.entry-title")
         company_el = soup.select_one("span.job-company")
@@ -1,13 +1,13 @@
-import requests
-import time
 import re
 import json
 
-from bs4 import BeautifulSoup
 from intern_bot.data_scraper.scrapers.base_scraper import BaseScraper
+from intern_bot.data_scraper.fetcher import Fetcher
+from intern_bot.data_scraper.parsers import ParsePool, make_soup
 
 
 class SiiScraper(BaseScraper):
+    SOURCE = "Sii"
     BASE_URL = "https://web-job-api.sii.pl/offers/pl/all/JUNIOR_1,INTERN_3/all/all/all/all/all/all/score/desc/{offset}/{limit}/pl"
     JOB_DETAIL_BASE_URL = "https://sii.pl/oferty-pracy/id/{id}/{title}"
 
@@ -23,8 +23,8 @@ class SiiScraper(BaseScraper):
         "Origin": "https://sii.pl"
     }
 
-    @staticmethod
-    def scrape_offers() -> list[str]:
+    @classmethod
+    async def ascrape_offers(cls, fetcher: Fetcher) -> list[str]:
         """Scrape job offers from SII API and return minimal info: id and link."""
         limit = 50
         offset = 0
@@ -33,7 +33,7 @@ class SiiScraper(BaseScraper):
         headers = {**SiiScraper.BASE_HEADERS, **SiiScraper.SII_EXTRA_HEADERS}
 
         url = SiiScraper.BASE_URL.format(offset=offset, limit=limit)
-        response = requests.get(url, headers=headers)
+        response = await fetcher.get(url, headers=headers)
 
         if response.status_code == 403:
             raise Exception("Access denied (403 Forbidden).")
@@ -54,17 +54,19 @@ class SiiScraper(BaseScraper):
             collected.append(offer_link)
 
         offset += limit
-        time.sleep(0.3)
-
 
         return collected
 
 
-    @staticmethod
-    def scrape_offer_details(offer: str) -> list[dict[str, str]]:
-        resp = requests.get(offer, headers=SiiScraper.BASE_HEADERS)
+    @classmethod
+    async def ascrape_offer_details(cls, fetcher: Fetcher, offer: str) -> dict[str, str]:
+        resp = await fetcher.get(offer, headers=cls.BASE_HEADERS)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        return await ParsePool.run(cls.parse_offer_details, resp.text, offer, cls.html_parser())
+
+    @staticmethod
+    def parse_offer_details(markup: str, offer: str, parser: str = "html.parser") -> dict[str, str]:
+        soup = make_soup(markup, parser)
 
         title_input = soup.select_one("input#offer_name")
         title = title_input["value"].strip() if title_input else ""
@@ -12,6 +12,115 @@ class Settings(BaseSettings):
 
     OFFERS_TABLE_NAME: str = 'offers'
 
+    # Database connection pool
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_HEALTH_CHECK: bool = True
+
+    # Offer ingestion
+    EMBEDDING_BATCH_SIZE: int = 64
+    MAX_NEW_OFFERS: dict[str, int] = {'PWR': 100, 'Nokia': 50, 'Sii': 50}
+
+    # Scraper politeness budget, applied per host
+    SCRAPER_RATE_PER_HOST: float = 2.0
+    SCRAPER_BURST_PER_HOST: int = 4
+    SCRAPER_CONCURRENCY_PER_HOST: int = 4
+
+    # Scraper HTTP sessions
+    SCRAPER_POOL_SIZE: int = 10
+    SCRAPER_CONNECT_TIMEOUT: float = 10.0
+    SCRAPER_READ_TIMEOUT: float = 30.0
+    SCRAPER_KEEPALIVE_EXPIRY: float = 60.0
+
+    # HTML parser per source ('html.parser', 'lxml' or 'html5lib') and parse worker processes (0 = inline).
+    # The defaults are the faster parser per source in benchmarks/baseline.json (parse_ms_per_offer)
+    SCRAPER_HTML_PARSERS: dict[str, str] = {'PWR': 'lxml', 'Sii': 'lxml', 'Nokia': 'html.parser'}
+    SCRAPER_PARSE_PROCESSES: int = 0
+
+    # Nokia requisitions search paging
+    NOKIA_PAGE_SIZE: int = 25
+    NOKIA_MAX_PAGES: int = 100
+
+    # Adaptive per-source scraping: the next run of a source is planned after target changes /
+    # smoothed change rate (offers added, removed or updated), clamped to its (min, max) interval
+    # in seconds and spread by +/- jitter. Due sources are checked every SCRAPE_CHECK_INTERVAL seconds
+    SCRAPE_INTERVALS: dict[str, tuple[int, int]] = {
+        'PWR': (3600, 43200), 'Nokia': (21600, 259200), 'Sii': (3600, 86400)
+    }
+    SCRAPE_DEFAULT_INTERVAL: tuple[int, int] = (3600, 86400)
+    SCRAPE_TARGET_CHANGES: float = 5.0
+    SCRAPE_RATE_SMOOTHING: float = 0.5
+    SCRAPE_JITTER: float = 0.1
+    SCRAPE_CHECK_INTERVAL: int = 300
+    SCRAPE_SCHEDULE_STATE_PATH: str = 'scrape_schedule.json'
+
+    # Re-check details of this many already stored offers per source on every run
+    OFFER_REFRESH_SAMPLE_SIZE: int = 10
+
+    # Embedding provider: 'openai' or 'hashing' (local and deterministic, for offline load tests).
+    # EMBEDDING_DIMENSIONS must match the offers.embedding vector(N) column; it is retyped
+    # automatically only while no offer is embedded. OpenAI text-embedding-3-* models are shortened to it
+    EMBEDDING_PROVIDER: str = 'openai'
+    EMBEDDING_MODEL: str = 'text-embedding-ada-002'
+    EMBEDDING_DIMENSIONS: int = 1536
+
+    # Persistent embedding cache
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_TABLE_NAME: str = 'embedding_cache'
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 50000
+    # Seconds before a cache hit refreshes the row's last_used_at again
+    EMBEDDING_CACHE_TOUCH_INTERVAL: int = 86400
+
+    # In-process query embedding cache
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL: float = 3600.0
+
+    # Vector index: 'ivfflat', 'hnsw' or 'none' (exact search). Tables below VECTOR_INDEX_MIN_ROWS
+    # are searched exactly; the index is rebuilt once inserted + deleted rows exceed the drift share
+    VECTOR_INDEX_TYPE: str = 'ivfflat'
+    VECTOR_INDEX_MIN_ROWS: int = 1000
+    VECTOR_INDEX_REBUILD_DRIFT: float = 0.3
+    # Result rows the derived ivfflat.probes are sized for; deeper pages probe proportionally more lists
+    VECTOR_INDEX_PROBES_NEIGHBOURS: int = 10
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    HNSW_EF_SEARCH: int = 40
+
+    # Hybrid search: text search configuration of the search_tsv column, candidates
+    # taken from each ranking and the reciprocal rank fusion constant
+    SEARCH_TEXT_CONFIG: str = 'simple'
+    HYBRID_CANDIDATES: int = 50
+    HYBRID_RRF_K: int = 60
+
+    # Similarity search backend: 'postgres' (pgvector) or 'memory' (in-process NumPy replica of
+    # the offer embeddings, memory-mapped from a snapshot at MEMORY_INDEX_PATH.npy/.json)
+    RETRIEVAL_BACKEND: str = 'postgres'
+    MEMORY_INDEX_PATH: str = 'memory_index'
+
+    # Rows fetched per round trip when streaming /data/current_offers
+    CURRENT_OFFERS_BATCH_SIZE: int = 500
+
+    # Agent conversation checkpointer: 'memory', 'sqlite' or 'postgres'
+    CHECKPOINTER_BACKEND: str = 'memory'
+    CHECKPOINTER_SQLITE_PATH: str = 'checkpoints.sqlite'
+    CHECKPOINTER_MAX_THREADS: int = 1000
+    CHECKPOINTER_IDLE_TTL: float = 24 * 3600
+
+    # Conversation history sent to the LLM: prompt token budget and how many previous
+    # turns keep full tool outputs (older ones are compacted to offer link/title stubs)
+    HISTORY_MAX_TOKENS: int = 8000
+    HISTORY_FULL_TOOL_TURNS: int = 1
+
+    # Tool calls from one LLM response that may run at the same time
+    AGENT_MAX_PARALLEL_TOOL_CALLS: int = 4
+
+    # Opt-in cache of first-turn agent answers, matched by query embedding similarity
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_THRESHOLD: float = 0.95
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_TTL: float = 24 * 3600
+
     # Server configuration
     SERVER_IP: str
     FRONTEND_PORT: str
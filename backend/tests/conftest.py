@@ -0,0 +1,14 @@
+import os
+
+# Settings requires these; the tests never reach the database or the OpenAI API
+for name, value in {
+    "OPENAI_API_KEY": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "SERVER_IP": "127.0.0.1",
+    "FRONTEND_PORT": "3000",
+}.items():
+    os.environ.setdefault(name, value)
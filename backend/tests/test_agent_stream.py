@@ -0,0 +1,66 @@
+import importlib
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from intern_bot.api.utils.routes import router
+
+# The package exports the compiled graph under the module's name
+agent_module = importlib.import_module("intern_bot.agent.agent")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Answers with the scripted messages in order; content is streamed word by word."""
+
+    responses: list[AIMessage]
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self.responses.pop(0))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        response = self.responses.pop(0)
+        for word in response.content.split(" "):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        if response.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(response.tool_calls)
+            ]))
+
+
+def events(body: str) -> list[tuple[str, dict]]:
+    parsed = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        parsed.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return parsed
+
+
+def test_stream_sends_only_the_final_answer_on_the_last_iteration(monkeypatch):
+    tool_call = AIMessage(content="", tool_calls=[{"name": "unknown_tool", "args": {}, "id": "call"}])
+    monkeypatch.setattr(agent_module, "llm", ScriptedChatModel(responses=[AIMessage(content="draft answer")]))
+    monkeypatch.setattr(agent_module, "llm_w_tools", ScriptedChatModel(
+        responses=[tool_call, tool_call, AIMessage(content="final answer")]
+    ))
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).post("/agent/stream", json={
+        "query": "python internships", "config": {"configurable": {"thread_id": "stream-test"}}
+    })
+
+    sent = events(response.text)
+    streamed = "".join(data["content"] for event, data in sent if event == "token")
+    done = [data for event, data in sent if event == "done"]
+    assert streamed.strip() == done[0]["content"].strip() == "final answer"
@@ -0,0 +1,91 @@
+import pytest
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+from intern_bot.agent import checkpointer as checkpointer_module
+from intern_bot.agent.checkpointer import BoundedMemorySaver
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(checkpointer_module.time, "monotonic", clock)
+    return clock
+
+
+def make_graph(saver):
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", lambda state: {"messages": [AIMessage(content=f"echo {len(state['messages'])}")]})
+    builder.add_edge(START, "reply")
+    return builder.compile(checkpointer=saver)
+
+
+def chat(graph, thread_id, text="hi"):
+    config = {"configurable": {"thread_id": thread_id}}
+    return graph.invoke({"messages": [HumanMessage(content=text)]}, config)
+
+
+def messages(graph, thread_id):
+    return graph.get_state({"configurable": {"thread_id": thread_id}}).values.get("messages", [])
+
+
+def test_least_recently_used_thread_is_evicted_at_the_cap(clock):
+    saver = BoundedMemorySaver(max_threads=2, idle_ttl=0)
+    graph = make_graph(saver)
+
+    chat(graph, "a")
+    clock.now += 1
+    chat(graph, "b")
+    clock.now += 1
+    chat(graph, "a")
+    clock.now += 1
+    chat(graph, "c")
+
+    assert saver.stats()["threads"] == 2
+    assert saver.stats()["evictions"] == 1
+    assert "b" not in saver.storage
+    assert len(messages(graph, "a")) == 4
+
+
+def test_idle_threads_are_dropped(clock):
+    saver = BoundedMemorySaver(max_threads=0, idle_ttl=60)
+    graph = make_graph(saver)
+
+    chat(graph, "old")
+    clock.now += 30
+    chat(graph, "recent")
+    clock.now += 45
+
+    stats = saver.stats()
+    assert stats["threads"] == 1
+    assert "old" not in saver.storage
+    assert "recent" in saver.storage
+
+
+def test_only_the_latest_checkpoint_is_kept_without_history():
+    saver = BoundedMemorySaver(max_threads=10, idle_ttl=0)
+    graph = make_graph(saver)
+    for turn in range(3):
+        chat(graph, "a", f"turn {turn}")
+
+    config = {"configurable": {"thread_id": "a"}}
+    assert len(list(saver.list(config))) == 1
+    assert len(messages(graph, "a")) == 6
+
+
+def test_history_is_kept_on_request():
+    saver = BoundedMemorySaver(max_threads=10, idle_ttl=0, keep_history=True)
+    graph = make_graph(saver)
+    for turn in range(3):
+        chat(graph, "a", f"turn {turn}")
+
+    assert len(list(saver.list({"configurable": {"thread_id": "a"}}))) > 3
@@ -0,0 +1,66 @@
+import json
+
+from datetime import date
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from intern_bot.api.utils.routes import router
+from intern_bot.data_manager import AsyncDataManager
+
+
+def stream_offers(offers: list[dict], fail_after: int | None = None):
+    async def iter_current_offers(columns=None):
+        for i, offer in enumerate(offers):
+            if i == fail_after:
+                raise ConnectionError("connection lost")
+            yield offer
+        if fail_after == len(offers):
+            raise ConnectionError("connection lost")
+    return iter_current_offers
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_offers_are_streamed_one_per_line(client, monkeypatch):
+    offers = [{"id": 1, "date_posted": date(2024, 5, 1)}, {"id": 2, "date_posted": None}]
+    monkeypatch.setattr(AsyncDataManager, "iter_current_offers", stream_offers(offers))
+
+    response = client.get("/data/current_offers")
+
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": 1, "date_posted": "2024-05-01"}, {"id": 2, "date_posted": None}
+    ]
+
+
+def test_empty_table_streams_an_empty_body(client, monkeypatch):
+    monkeypatch.setattr(AsyncDataManager, "iter_current_offers", stream_offers([]))
+
+    response = client.get("/data/current_offers")
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_setup_failure_is_a_server_error(client, monkeypatch):
+    monkeypatch.setattr(AsyncDataManager, "iter_current_offers", stream_offers([{"id": 1}], fail_after=0))
+
+    response = client.get("/data/current_offers")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "connection lost"}
+
+
+def test_failure_after_the_first_row_aborts_the_stream(client, monkeypatch):
+    monkeypatch.setattr(AsyncDataManager, "iter_current_offers", stream_offers([{"id": 1}, {"id": 2}], fail_after=1))
+
+    # The server error surfaces instead of a completed 200 body; anyio may wrap it in a group
+    with pytest.raises(Exception) as error:
+        client.get("/data/current_offers")
+    assert isinstance(error.value, ConnectionError) or error.group_contains(ConnectionError)
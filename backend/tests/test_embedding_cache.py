@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+
+from langchain_core.embeddings import Embeddings
+
+from intern_bot.data_manager.embedding_cache import CachedEmbeddings, content_hash
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class FakeCursor:
+    """Records statements and answers them with scripted (rows, rowcount) results, in order."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+        self._rows, self.rowcount = self.results.pop(0) if self.results else ([], 0)
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+def make_cache(results, max_entries=5):
+    cursor = FakeCursor(results)
+
+    @contextmanager
+    def connection_factory():
+        yield FakeConnection(cursor)
+
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, "test-model", connection_factory, table_name="cache", max_entries=max_entries)
+    return cache, model, cursor
+
+
+def test_hit_is_served_from_the_table_and_touched_at_most_once_per_interval():
+    key = content_hash("python intern", "test-model")
+    cache, model, cursor = make_cache([([(key, [0.5, 0.5])], 1), ([], 0)])
+
+    assert cache.embed_query("python  intern") == [0.5, 0.5]
+    assert model.calls == 0
+    update, params = cursor.statements[1]
+    assert update.startswith("UPDATE cache SET last_used_at = now()")
+    assert "last_used_at < now() - make_interval(secs => %s)" in update
+    assert params == ([key], cache.touch_interval)
+    assert cache.stats()["hits"] == 1
+
+
+def test_miss_is_stored_without_evicting():
+    cache, model, cursor = make_cache([([], 0)])
+
+    cache.embed_documents(["a", "b", "a"])
+
+    assert model.calls == 1
+    assert [sql.split()[0] for sql, _ in cursor.statements] == ["SELECT", "INSERT", "INSERT"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_evict_runs_only_over_the_limit_and_deletes_the_overflow_at_once():
+    cache, _, cursor = make_cache([([(4,)], 1)])
+    assert cache.evict() == 0
+    assert len(cursor.statements) == 1
+
+    cache, _, cursor = make_cache([([(8,)], 1), ([], 3)])
+    assert cache.evict() == 3
+    delete, params = cursor.statements[1]
+    assert delete.startswith("DELETE FROM cache")
+    assert "ORDER BY last_used_at LIMIT %s" in delete
+    assert params == (3,)
+    assert cache.stats()["evicted"] == 3
+
+
+def test_storage_errors_fall_back_to_the_wrapped_model():
+    @contextmanager
+    def broken_connection():
+        raise ConnectionError("database is down")
+        yield
+
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, "test-model", broken_connection)
+
+    assert cache.embed_documents(["abc"]) == [[3.0, 1.0]]
+    assert cache.embed_query("abcd") == [4.0, 1.0]
@@ -0,0 +1,79 @@
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from intern_bot.agent.history import approximate_tokens, build_prompt, compact_tool_message, split_turns
+
+OFFER = {"link": "https://example.com/1", "title": "Python intern", "company": "Nokia", "description": "x" * 2000}
+
+
+def turn(index, tool_content=None):
+    messages = [HumanMessage(content=f"question {index}")]
+    if tool_content is not None:
+        messages += [
+            AIMessage(content="", tool_calls=[{"name": "retrieve_offers", "args": {}, "id": f"call-{index}"}]),
+            ToolMessage(content=tool_content, tool_call_id=f"call-{index}"),
+        ]
+    return messages + [AIMessage(content=f"answer {index}")]
+
+
+def conversation(turns, tool_content=None):
+    messages = [SystemMessage(content="system prompt")]
+    for index in range(turns):
+        messages += turn(index, tool_content)
+    return messages + [HumanMessage(content="current question")]
+
+
+def test_split_turns_starts_a_turn_at_each_human_message():
+    turns = split_turns(turn(0, "[]") + turn(1))
+    assert [len(t) for t in turns] == [4, 2]
+
+
+def test_compact_tool_message_keeps_stubs_and_the_cursor():
+    page = ToolMessage(content=json.dumps({"offers": [OFFER], "next_cursor": "abc"}), tool_call_id="1")
+    assert json.loads(compact_tool_message(page).content) == {
+        "offers": [{"link": OFFER["link"], "title": OFFER["title"], "company": OFFER["company"]}],
+        "next_cursor": "abc",
+    }
+
+    details = ToolMessage(content=json.dumps(OFFER), tool_call_id="2")
+    assert "description" not in json.loads(compact_tool_message(details).content)
+
+    text = ToolMessage(content="y" * 1000, tool_call_id="3")
+    assert len(compact_tool_message(text).content) == 301
+
+
+def test_old_tool_results_are_compacted_and_recent_ones_kept():
+    content = json.dumps({"offers": [OFFER], "next_cursor": None})
+    prompt = build_prompt(conversation(3, content), approximate_tokens, max_tokens=100_000, full_tool_turns=1)
+
+    tool_messages = [m for m in prompt if isinstance(m, ToolMessage)]
+    assert len(tool_messages) == 3
+    assert all("description" not in m.content for m in tool_messages[:2])
+    assert tool_messages[2].content == content
+    assert isinstance(prompt[0], SystemMessage) and prompt[0].content == "system prompt"
+    assert prompt[-1].content == "current question"
+
+
+def test_oldest_turns_are_dropped_to_fit_the_budget():
+    messages = conversation(10)
+    full = approximate_tokens(messages)
+    prompt = build_prompt(messages, approximate_tokens, max_tokens=full - 1, full_tool_turns=10)
+
+    assert prompt[0].content == "system prompt"
+    assert prompt[1].content == "1 earlier conversation turn(s) were omitted."
+    assert prompt[2].content == "question 1"
+    assert prompt[-1].content == "current question"
+
+
+def test_system_prompt_and_current_turn_are_kept_over_budget():
+    prompt = build_prompt(conversation(5), approximate_tokens, max_tokens=1, full_tool_turns=0)
+
+    assert [m.content for m in prompt] == [
+        "system prompt", "5 earlier conversation turn(s) were omitted.", "current question"
+    ]
+
+
+def test_prompt_without_a_system_message():
+    messages = turn(0) + [HumanMessage(content="current question")]
+    assert build_prompt(messages, approximate_tokens, max_tokens=100_000, full_tool_turns=0) == messages
@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from intern_bot.data_manager import DataManager
+from intern_bot.data_manager.vector_index import VectorIndex
+
+TABLE = "test_hybrid_paging_offers"
+WORDS = ["python", "java", "data", "cloud", "embedded", "frontend", "testing", "devops"]
+ROWS = 3000
+DIMENSIONS = 8
+
+
+def vector_literal(vector) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+@pytest.fixture
+def offers_table(monkeypatch):
+    """A throwaway offers table with a 6-list IVFFlat index; skipped without a pgvector database."""
+    try:
+        with DataManager._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    except Exception as e:
+        pytest.skip(f"No pgvector database: {e}")
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(6, DIMENSIONS))
+    embeddings = centers[rng.integers(0, 6, ROWS)] + rng.normal(scale=0.6, size=(ROWS, DIMENSIONS))
+    rows = [
+        (f"https://example.com/{i}", " ".join(rng.choice(WORDS, 2)), "Nokia", vector_literal(embeddings[i]))
+        for i in range(ROWS)
+    ]
+    with DataManager._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            cur.execute(f"""
+                CREATE TABLE {TABLE} (
+                    id SERIAL PRIMARY KEY, link TEXT NOT NULL, title TEXT NOT NULL, company TEXT, location TEXT,
+                    contract_type TEXT, date_posted DATE, date_closing DATE, source TEXT, description TEXT,
+                    embedding vector({DIMENSIONS}),
+                    search_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, title)) STORED
+                )
+            """)
+            cur.executemany(
+                f"INSERT INTO {TABLE} (link, title, company, embedding) VALUES (%s, %s, %s, %s::vector)", rows
+            )
+            cur.execute(f"CREATE INDEX ON {TABLE} USING ivfflat (embedding vector_cosine_ops) WITH (lists = 6)")
+            cur.execute(f"ANALYZE {TABLE}")
+
+    # One probed list per 50 rows requested, every list from 100 rows on. Sequential
+    # scans are disabled so the small table uses the index wherever a plan can
+    vector_index = VectorIndex(TABLE, DataManager._get_connection, probes_neighbours=50)
+    vector_index._state = {"index_type": "ivfflat", "params": {"lists": 6, "probes": 1}}
+    search_settings = vector_index.search_settings
+    monkeypatch.setattr(vector_index, "search_settings", lambda neighbours: (
+        search_settings(neighbours)[0] + ", set_config('enable_seqscan', 'off', true)",
+        search_settings(neighbours)[1],
+    ))
+    monkeypatch.setattr(DataManager, "vector_index", vector_index)
+    monkeypatch.setattr(DataManager.settings, "OFFERS_TABLE_NAME", TABLE)
+    query = rng.normal(size=DIMENSIONS).tolist()
+    monkeypatch.setattr(DataManager.query_embeddings_cache, "get", lambda text, embed: query)
+
+    yield
+    with DataManager._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def test_hybrid_pages_show_every_offer_once_with_an_approximate_index(offers_table):
+    seen, cursor = [], None
+    while True:
+        page = DataManager.search_offers("python developer", k=10, cursor=cursor, mode="hybrid", keywords=["python"])
+        seen += [offer["id"] for offer in page["offers"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == list(range(1, ROWS + 1))
+
+
+class RecordingCursor:
+    description = [("id",)]
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_fused_pool_settings_do_not_depend_on_the_page_depth(monkeypatch):
+    vector_index = VectorIndex(TABLE, connection_factory=None)
+    vector_index._state = {"index_type": "ivfflat", "params": {"lists": 400, "probes": 2}}
+    monkeypatch.setattr(DataManager, "vector_index", vector_index)
+    monkeypatch.setattr(DataManager.query_embeddings_cache, "get", lambda text, embed: [1.0, 0.0])
+    statements = []
+
+    class RecordingConnection:
+        def cursor(self):
+            return RecordingCursor(statements)
+
+    @contextmanager
+    def connection():
+        yield RecordingConnection()
+
+    monkeypatch.setattr(DataManager, "_get_connection", connection)
+
+    def settings_per_statement(after):
+        statements.clear()
+        DataManager.hybrid_search("python", k=10, after=after)
+        probes, settings = None, []
+        for sql, params in statements:
+            if "set_config" in sql:
+                probes = params[0]
+            else:
+                settings.append(("fused" if "fused AS" in sql else "tail", probes))
+        return settings
+
+    first = settings_per_statement(None)
+    deep = settings_per_statement({"value": "0.01", "id": 7, "shown": 2000, "phase": None})
+    fused = [probes for phase, probes in first + deep if phase == "fused"]
+    assert set(fused) == {"10"}
+    assert [probes for phase, probes in deep if phase == "tail"] == ["400"]
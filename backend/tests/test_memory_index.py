@@ -0,0 +1,93 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from intern_bot.data_manager.memory_index import RESULT_COLUMNS, MemoryIndex
+
+COMPANIES = ["Nokia", "Sii Polska", None]
+LOCATIONS = ["Kraków", "Wrocław"]
+
+
+def offer(offer_id: int) -> dict:
+    row = dict.fromkeys(RESULT_COLUMNS)
+    row.update(
+        id=offer_id,
+        link=f"https://example.com/{offer_id}",
+        company=COMPANIES[offer_id % 3],
+        location=LOCATIONS[offer_id % 2],
+        date_posted=date(2024, 1, 1 + offer_id % 28),
+    )
+    return row
+
+
+@pytest.fixture
+def index(tmp_path):
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(30, 8)).astype(np.float32)
+    # Rows 20 and 21 share an embedding, so their distance ties and the id decides
+    matrix[21] = matrix[20]
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    rows = [offer(offer_id) for offer_id in range(100, 130)]
+
+    index = MemoryIndex("offers", connection_factory=None, snapshot_path=str(tmp_path / "index"))
+    index._save(matrix, rows, ["fp"] * len(rows), "2024-01-01")
+    assert index.load()
+    return index
+
+
+def exact_order(index, query, mask=None):
+    matrix = np.asarray(index._snapshot.matrix)
+    distances = 1.0 - matrix @ (query / np.linalg.norm(query))
+    ids = index._snapshot.ids
+    positions = [p for p in range(len(ids)) if mask is None or mask(index._snapshot.rows[p])]
+    return [int(ids[p]) for p in sorted(positions, key=lambda p: (distances[p], ids[p]))]
+
+
+def test_search_matches_exact_cosine_order(index):
+    query = np.asarray(index._snapshot.matrix[20], dtype=np.float32) + 0.01
+    results = index.search(query.tolist(), k=5)
+
+    assert [row["id"] for row in results] == exact_order(index, query)[:5]
+    assert results[0]["distance"] <= results[-1]["distance"]
+    assert isinstance(results[0]["date_posted"], date)
+
+
+def test_include_and_exclude_filters_follow_sql_null_semantics(index):
+    query = np.ones(8, dtype=np.float32)
+
+    included = index.search(query.tolist(), k=30, include_filters={"company": ["Nokia", "Unknown"]})
+    assert {row["company"] for row in included} == {"Nokia"}
+
+    excluded = index.search(query.tolist(), k=30, exclude_filters={"company": ["Nokia"]})
+    assert [row["id"] for row in excluded] == exact_order(index, query, lambda row: row["company"] == "Sii Polska")
+
+    both = index.search(
+        query.tolist(), k=30, include_filters={"location": ["Kraków"]}, exclude_filters={"company": ["Sii Polska"]}
+    )
+    assert all(row["location"] == "Kraków" and row["company"] == "Nokia" for row in both)
+
+
+def test_keyset_pages_cover_the_ranking_once(index):
+    query = np.asarray(index._snapshot.matrix[20], dtype=np.float32)
+    expected = exact_order(index, query)
+
+    seen, after = [], None
+    while True:
+        page = index.search(query.tolist(), k=4, after=after)
+        seen += [row["id"] for row in page]
+        if len(page) < 4:
+            break
+        after = {"value": repr(page[-1]["distance"]), "id": page[-1]["id"], "shown": len(seen)}
+
+    assert seen == expected
+    assert seen.index(120) + 1 == seen.index(121)
+    assert [row["id"] for row in index.search(query.tolist(), k=4, offset=8)] == expected[8:12]
+
+
+def test_search_requires_a_loaded_index_of_the_same_dimension(index, tmp_path):
+    with pytest.raises(ValueError):
+        index.search([1.0, 0.0], k=3)
+    with pytest.raises(RuntimeError):
+        MemoryIndex("offers", None, str(tmp_path / "missing")).search([1.0] * 8, k=3)
+    assert not MemoryIndex("offers", None, str(tmp_path / "missing")).load()
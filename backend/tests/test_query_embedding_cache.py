@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from intern_bot.data_manager import embedding_cache
+from intern_bot.data_manager.embedding_cache import QueryEmbeddingCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_hit_skips_the_embedding_call_and_normalizes_whitespace(clock):
+    cache = QueryEmbeddingCache("model")
+    calls = []
+
+    def embed(query):
+        calls.append(query)
+        return [1.0]
+
+    assert cache.get("python intern", embed) == [1.0]
+    assert cache.get("  python   intern ", embed) == [1.0]
+    assert calls == ["python intern"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = QueryEmbeddingCache("model", ttl=60)
+    cache.get("query", lambda q: [1.0])
+
+    clock.now += 59
+    assert cache.get("query", lambda q: [2.0]) == [1.0]
+    clock.now += 2
+    assert cache.get("query", lambda q: [2.0]) == [2.0]
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = QueryEmbeddingCache("model", max_size=2)
+    cache.get("a", lambda q: [1.0])
+    cache.get("b", lambda q: [2.0])
+    cache.get("a", lambda q: [0.0])
+    cache.get("c", lambda q: [3.0])
+
+    assert cache.stats()["size"] == 2
+    assert cache.get("a", lambda q: [0.0]) == [1.0]
+    assert cache.get("b", lambda q: [0.0]) == [0.0]
+
+
+def test_concurrent_misses_are_coalesced_into_one_call():
+    cache = QueryEmbeddingCache("model")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_embed(query):
+        calls.append(query)
+        started.set()
+        release.wait(5)
+        return [1.0]
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get("query", slow_embed)))
+    owner.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(cache.get("query", slow_embed))) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    while cache.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [owner, *waiters]:
+        thread.join(5)
+
+    assert calls == ["query"]
+    assert results == [[1.0]] * 4
+    assert cache.stats()["saved_remote_calls"] == 3
+
+
+def test_async_misses_are_coalesced_and_failures_are_not_cached():
+    cache = QueryEmbeddingCache("model")
+    calls = []
+
+    async def aembed(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return [2.0]
+
+    async def failing(query):
+        raise RuntimeError("API down")
+
+    async def run():
+        results = await asyncio.gather(*(cache.aget("query", aembed) for _ in range(5)))
+        with pytest.raises(RuntimeError):
+            await cache.aget("other", failing)
+        return results, await cache.aget("other", aembed)
+
+    results, retried = asyncio.run(run())
+    assert results == [[2.0]] * 5
+    assert retried == [2.0]
+    assert calls == ["query", "other"]
+    assert cache.stats()["coalesced"] == 4
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from intern_bot.agent.response_cache import ResponseCache
+
+ANSWER = [HumanMessage(content="python internships"), AIMessage(content="Here are some offers")]
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(threshold=0.95, max_size=2, ttl=60)
+
+
+def test_similar_query_above_the_threshold_is_a_hit(cache):
+    _, generation = cache.lookup([1.0, 0.0])
+    cache.store("python internships", [1.0, 0.0], ANSWER, generation)
+
+    messages, _ = cache.lookup([0.99, 0.05])
+    assert [m.content for m in messages] == [m.content for m in ANSWER]
+    assert messages[0] is not ANSWER[0]
+
+    messages, _ = cache.lookup([0.7, 0.7])
+    assert messages is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_invalidation_clears_entries_and_rejects_answers_of_the_old_generation(cache):
+    _, generation = cache.lookup([1.0, 0.0])
+    cache.invalidate()
+    cache.store("python internships", [1.0, 0.0], ANSWER, generation)
+    assert cache.lookup([1.0, 0.0])[0] is None
+
+    _, generation = cache.lookup([1.0, 0.0])
+    cache.store("python internships", [1.0, 0.0], ANSWER, generation)
+    cache.invalidate()
+    assert cache.lookup([1.0, 0.0])[0] is None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_least_used_entry_is_evicted_at_max_size(cache):
+    generation = cache.generation
+    cache.store("a", [1.0, 0.0, 0.0], ANSWER, generation)
+    cache.store("b", [0.0, 1.0, 0.0], ANSWER, generation)
+    cache.lookup([1.0, 0.0, 0.0])
+    cache.store("c", [0.0, 0.0, 1.0], ANSWER, generation)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup([1.0, 0.0, 0.0])[0] is not None
+    assert cache.lookup([0.0, 1.0, 0.0])[0] is None
+
+
+def test_entries_expire_after_the_ttl(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache.store("a", [1.0, 0.0], ANSWER, cache.generation)
+
+    now[0] += 59
+    assert cache.lookup([1.0, 0.0])[0] is not None
+    now[0] += 2
+    assert cache.lookup([1.0, 0.0])[0] is None
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import pytest
+
+from intern_bot.data_manager import DataManager
+from intern_bot.data_manager.search_cursor import cursor_key, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_keeps_the_exact_value():
+    key = cursor_key("semantic", "python intern", None, {"company": ["Nokia"]}, None)
+    cursor = encode_cursor(key, 0.12345678901234567, 42, 10)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, key) == {"value": "0.12345678901234566", "id": 42, "shown": 10, "phase": None}
+
+
+def test_cursor_key_ignores_filter_key_order():
+    first = cursor_key("hybrid", "q", ["Python"], {"company": ["Nokia"], "location": ["Kraków"]}, None)
+    second = cursor_key("hybrid", "q", ["Python"], {"location": ["Kraków"], "company": ["Nokia"]}, None)
+    assert first == second
+    assert first != cursor_key("semantic", "q", ["Python"], {"company": ["Nokia"], "location": ["Kraków"]}, None)
+
+
+def test_cursor_of_another_search_is_rejected():
+    cursor = encode_cursor(cursor_key("semantic", "python"), 0.5, 1, 5)
+    with pytest.raises(ValueError, match="different search"):
+        decode_cursor(cursor, cursor_key("semantic", "java"))
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor("key", 0.5, 1, 5)[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "key")
+
+
+def test_search_page_points_after_the_last_offer():
+    rows = [{"id": 3, "distance": 0.1}, {"id": 7, "distance": 0.2}]
+    page = DataManager._search_page(rows, "key", "semantic", 2, {"value": "0.05", "id": 1, "shown": 4})
+
+    assert page["offers"] == rows
+    assert decode_cursor(page["next_cursor"], "key") == {"value": "0.2", "id": 7, "shown": 6, "phase": None}
+    assert DataManager._search_page(rows[:1], "key", "semantic", 2, None)["next_cursor"] is None
+
+
+def test_hybrid_page_switches_to_the_vector_ordered_tail():
+    fused = [{"id": 3, "distance": 0.1, "score": Decimal("0.0163")}]
+    page = DataManager._search_page(fused, "key", "hybrid", 1, None)
+    assert decode_cursor(page["next_cursor"], "key")["value"] == "0.0163"
+    assert decode_cursor(page["next_cursor"], "key")["phase"] is None
+
+    tail = [{"id": 9, "distance": 0.4, "score": Decimal("0")}]
+    page = DataManager._search_page(tail, "key", "hybrid", 1, None)
+    assert decode_cursor(page["next_cursor"], "key") == {"value": "0.4", "id": 9, "shown": 1, "phase": "tail"}
+
+
+def test_hybrid_tail_query_skips_the_fused_candidates():
+    sql, params = DataManager._hybrid_tail_sql(
+        [0.0, 1.0], [3, 5], 5, 0, None, None, {"value": "0.4", "id": 9, "shown": 60, "phase": "tail"}
+    )
+    assert "id <> ALL(%s::int[])" in sql
+    assert "(embedding <=> %s::vector, id) > (%s::float8, %s)" in sql
+    assert params[1] == [3, 5]
+    assert params[-5:] == [[0.0, 1.0], "0.4", 9, 5, 0]
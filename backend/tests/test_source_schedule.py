@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from intern_bot.api.utils.source_schedule import AdaptiveSchedule
+
+HOUR = 3600.0
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def make_schedule(tmp_path):
+    def make(**overrides):
+        options = {
+            "sources": ["PWR", "Nokia"],
+            "intervals": {"PWR": (HOUR, 24 * HOUR)},
+            "default_interval": (2 * HOUR, 48 * HOUR),
+            "target_changes": 5.0,
+            "smoothing": 0.5,
+            "jitter": 0.0,
+            "state_path": str(tmp_path / "schedule.json"),
+        }
+        options.update(overrides)
+        return AdaptiveSchedule(**options)
+    return make
+
+
+def test_new_sources_are_due_immediately_without_jitter(make_schedule):
+    schedule = make_schedule()
+    assert sorted(schedule.due()) == ["Nokia", "PWR"]
+    assert schedule.bounds("Nokia") == (2 * HOUR, 48 * HOUR)
+
+
+def test_interval_follows_the_smoothed_change_rate(make_schedule):
+    schedule = make_schedule()
+    schedule.record("PWR", 3, finished_at=T0)
+
+    # 10 changes in 2 hours: 5 changes / (5 per hour) = 1 hour
+    state = schedule.record("PWR", 10, finished_at=T0 + 2 * HOUR)
+    assert state["change_rate"] == pytest.approx(10 / (2 * HOUR))
+    assert state["interval"] == pytest.approx(HOUR)
+    assert state["next_run_at"] == pytest.approx(T0 + 3 * HOUR)
+
+    # 2 changes in 1 hour, averaged with the previous rate: (2 + 5) / 2 = 3.5 per hour
+    state = schedule.record("PWR", 2, finished_at=T0 + 3 * HOUR)
+    assert state["change_rate"] == pytest.approx(3.5 / HOUR)
+    assert state["interval"] == pytest.approx(5 / 3.5 * HOUR)
+
+
+def test_interval_is_clamped_to_the_source_bounds(make_schedule):
+    schedule = make_schedule()
+    schedule.record("PWR", 1, finished_at=T0)
+    assert schedule.record("PWR", 500, finished_at=T0 + HOUR)["interval"] == HOUR
+
+    schedule = make_schedule(state_path=schedule.state_path.with_name("other.json"))
+    schedule.record("PWR", 1, finished_at=T0)
+    assert schedule.record("PWR", 1, finished_at=T0 + 20 * HOUR)["interval"] == 24 * HOUR
+
+
+def test_runs_without_changes_back_off_and_failures_retry_soon(make_schedule):
+    schedule = make_schedule()
+    first = schedule.record("Nokia", 0, finished_at=T0)["interval"]
+    assert schedule.record("Nokia", 0, finished_at=T0 + first)["interval"] == pytest.approx(min(2 * first, 48 * HOUR))
+
+    state = schedule.record("Nokia", None, finished_at=T0 + 10 * HOUR)
+    assert state["failures"] == 1
+    assert state["next_run_at"] == pytest.approx(T0 + 12 * HOUR)
+
+
+def test_state_survives_a_restart(make_schedule):
+    schedule = make_schedule()
+    schedule.record("PWR", 3, finished_at=T0)
+    schedule.record("PWR", 10, finished_at=T0 + 2 * HOUR)
+
+    restarted = make_schedule(sources=["PWR"])
+    assert restarted.status()["PWR"]["interval_seconds"] == round(HOUR)
+    assert restarted.status()["PWR"]["runs"] == 2
+    assert restarted.due(now=T0 + 2.5 * HOUR) == []
+    assert restarted.due(now=T0 + 3 * HOUR) == ["PWR"]
+    assert json.loads(schedule.state_path.read_text())["PWR"]["runs"] == 2
+
+
+def test_unknown_source_is_ignored(make_schedule):
+    assert make_schedule().record("Unknown", 3) == {}
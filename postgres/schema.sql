@@ -11,5 +11,33 @@ CREATE TABLE offers (
   date_closing DATE,
   source TEXT,
   description TEXT,
-  embedding vector(1536)
+  fingerprint TEXT,
+  last_seen_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  embedding vector(1536), -- EMBEDDING_DIMENSIONS; retyped by ensure_schema while no offer is embedded
+  search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+  ) STORED
+);
+
+CREATE INDEX offers_search_tsv_idx ON offers USING GIN (search_tsv);
+CREATE INDEX offers_date_closing_idx ON offers (date_closing);
+CREATE INDEX offers_source_idx ON offers (source);
+
+CREATE TABLE embedding_cache (
+  content_hash TEXT PRIMARY KEY,
+  model TEXT NOT NULL,
+  embedding REAL[] NOT NULL,
+  last_used_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX embedding_cache_last_used_idx ON embedding_cache (last_used_at);
+
+CREATE TABLE vector_index_state (
+  table_name TEXT PRIMARY KEY,
+  index_type TEXT NOT NULL,
+  params JSONB NOT NULL,
+  rows_at_build BIGINT NOT NULL,
+  changes_at_build BIGINT NOT NULL,
+  built_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );